@@ -0,0 +1,40 @@
+"""Benchmark: moyennes et taux de réussite (notes brutes vs table notes_agg)"""
+
+import time
+
+from benchmarks.donnees import creer_base
+from services.statistiques import taux_reussite
+
+
+def via_objets(db):
+    etudiants = db.obtenir_tous_etudiants()
+    return {e.id: e.moyenne_generale() for e in etudiants}, taux_reussite(etudiants)
+
+
+def via_agregats(db):
+    return db.obtenir_moyennes(), db.obtenir_taux_reussite()
+
+
+def chronometrer(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return time.perf_counter() - debut, resultat
+
+
+def main():
+    print(f"{'Étudiants':>10} | {'Notes brutes (s)':>16} | {'notes_agg (s)':>13} | {'Gain':>6}")
+    print("-" * 56)
+    
+    for nb in (1_000, 5_000, 20_000):
+        db = creer_base(nb, notes_par_matiere=10)
+        
+        t_objets, attendu = chronometrer(via_objets, db)
+        t_agregats, obtenu = chronometrer(via_agregats, db)
+        
+        assert attendu == obtenu
+        print(f"{nb:>10} | {t_objets:>16.3f} | {t_agregats:>13.3f} | x{t_objets / t_agregats:>4.1f}")
+        db.fermer()
+
+
+if __name__ == "__main__":
+    main()
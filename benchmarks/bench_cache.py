@@ -0,0 +1,57 @@
+"""Mesure des relectures d'un même étudiant, avec et sans cache
+
+Reproduit le parcours de l'interface: l'étudiant courant est relu après
+chaque consultation, et après chaque note ajoutée.
+"""
+
+import random
+import time
+
+from benchmarks.donnees import creer_base
+
+NB_ETUDIANTS = 5_000
+NB_LECTURES = 20_000
+
+
+def parcours(db, ids):
+    """Relectures répétées de quelques étudiants, avec une écriture sur 20"""
+    rng = random.Random(1)
+    courants = rng.sample(ids, 50)
+    debut = time.perf_counter()
+    for i in range(NB_LECTURES):
+        etudiant_id = rng.choice(courants)
+        if i % 20 == 0:
+            db.ajouter_note(etudiant_id, "Physique", rng.randint(0, 20))
+        db.obtenir_etudiant(etudiant_id)
+    return time.perf_counter() - debut
+
+
+def main():
+    db = creer_base(NB_ETUDIANTS)
+    ids = [e.id for e in db.obtenir_tous_etudiants()]
+    
+    sans_cache = db.taille_cache
+    db.taille_cache = 0
+    duree_sans = parcours(db, ids)
+    db.taille_cache = sans_cache
+    
+    db.cache_succes = db.cache_echecs = 0
+    duree_avec = parcours(db, ids)
+    stats = db.statistiques_cache()
+    
+    print(f"{NB_LECTURES} lectures ({NB_LECTURES // 20} écritures intercalées)")
+    print(f"Sans cache: {duree_sans:.3f} s")
+    print(f"Avec cache: {duree_avec:.3f} s ({duree_sans / duree_avec:.1f}x)")
+    print(f"Succès: {stats['succes']}, échecs: {stats['echecs']}, taille: {stats['taille']}")
+    
+    # Le cache ne doit jamais renvoyer un étudiant périmé
+    for etudiant_id in ids[:200]:
+        en_cache = db.obtenir_etudiant(etudiant_id)
+        db.vider_cache()
+        assert en_cache.to_dict() == db.obtenir_etudiant(etudiant_id).to_dict()
+    print("Cache cohérent ✓")
+    db.fermer()
+
+
+if __name__ == "__main__":
+    main()
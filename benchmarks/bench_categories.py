@@ -0,0 +1,53 @@
+"""Benchmark: normalisation des matières et promotions par les registres
+
+Compare strip().capitalize() / strip().upper() à chaque appel avec
+MATIERES.normaliser / PROMOTIONS.normaliser (une recherche dans un
+dictionnaire), sur des saisies comme celles des boucles de l'application.
+Mesure aussi la mémoire des clés de coefficients d'étudiants chargés depuis
+la base: chaînes neuves par ligne avant, instances partagées maintenant.
+"""
+
+import time
+import tracemalloc
+
+from benchmarks.donnees import MATIERES as NOMS_MATIERES, PROMOTIONS as NOMS_PROMOTIONS, creer_base
+from models.categories import MATIERES, PROMOTIONS
+
+NB_APPELS = 1_000_000
+
+
+def chronometrer(fonction, valeurs):
+    debut = time.perf_counter()
+    for valeur in valeurs:
+        fonction(valeur)
+    return time.perf_counter() - debut
+
+
+def main():
+    matieres = [NOMS_MATIERES[i % len(NOMS_MATIERES)].lower() for i in range(NB_APPELS)]
+    promotions = [NOMS_PROMOTIONS[i % len(NOMS_PROMOTIONS)].lower() for i in range(NB_APPELS)]
+    
+    print(f"{NB_APPELS} normalisations | {'str (s)':>8} | {'registre (s)':>12}")
+    print("-" * 50)
+    for nom, valeurs, directe, registre in (
+        ("Matières", matieres, lambda m: m.strip().capitalize(), MATIERES.normaliser),
+        ("Promotions", promotions, lambda p: p.strip().upper(), PROMOTIONS.normaliser),
+    ):
+        t_directe = chronometrer(directe, valeurs)
+        t_registre = chronometrer(registre, valeurs)
+        print(f"{nom:>22} | {t_directe:>8.3f} | {t_registre:>12.3f} (x{t_directe / t_registre:.1f})")
+    
+    db = creer_base(20_000)
+    tracemalloc.start()
+    etudiants = db.obtenir_tous_etudiants()
+    taille = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    cles = {id(m) for e in etudiants for m in (*e.notes, *e.coefficients)}
+    print(f"\n20000 étudiants chargés: {taille / 2**20:.1f} Mo, "
+          f"{len(cles)} chaînes distinctes pour les matières (une par matière)")
+    db.fermer()
+
+
+if __name__ == "__main__":
+    main()
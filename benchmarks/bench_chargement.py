@@ -0,0 +1,63 @@
+"""Benchmark: chargement de tous les étudiants (N+1 requêtes vs chargement groupé)
+
+La dernière colonne mesure une liste sans prefetch (une requête), avec la
+mention de chaque étudiant comme sur les cartes de l'interface.
+"""
+
+import time
+
+from benchmarks.donnees import creer_base
+from models.etudiant import Etudiant
+
+
+def chargement_ligne_par_ligne(db):
+    """Ancien chemin: 2 requêtes supplémentaires par étudiant"""
+    cursor = db.conn.cursor()
+    cursor.execute("SELECT * FROM etudiants ORDER BY nom, prenom")
+    
+    etudiants = []
+    for row in cursor.fetchall():
+        etudiant = Etudiant(
+            row['id'], row['nom'], row['prenom'], row['promotion'],
+            row['email'] or "", row['photo_path'] or ""
+        )
+        for note in db.obtenir_notes_detaillees(row['id']):
+            etudiant.charger_note(note['matiere'], note['note'], note['id'])
+        etudiant.coefficients = db.obtenir_coefficients(row['id'])
+        etudiants.append(etudiant)
+    
+    return etudiants
+
+
+def mesurer(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return time.perf_counter() - debut, resultat
+
+
+def liste_sans_prefetch(db):
+    """Ce dont une carte a besoin: identité et mention"""
+    etudiants = db.obtenir_tous_etudiants(prefetch=False)
+    return [(e.id, e.nom, e.get_mention()) for e in etudiants]
+
+
+def main():
+    print(f"{'Étudiants':>10} | {'N+1 (s)':>10} | {'Groupé (s)':>10} | {'Gain':>6} | {'Différé (s)':>11}")
+    print("-" * 60)
+    
+    for nb in (1_000, 5_000, 20_000):
+        db = creer_base(nb)
+        
+        t_ancien, anciens = mesurer(chargement_ligne_par_ligne, db)
+        t_nouveau, nouveaux = mesurer(db.obtenir_tous_etudiants)
+        
+        t_differe, cartes = mesurer(liste_sans_prefetch, db)
+        
+        assert [(e.to_dict(), e.notes_ids) for e in anciens] == [(e.to_dict(), e.notes_ids) for e in nouveaux]
+        assert cartes == [(e.id, e.nom, e.get_mention()) for e in nouveaux]
+        print(f"{nb:>10} | {t_ancien:>10.3f} | {t_nouveau:>10.3f} | x{t_ancien / t_nouveau:>4.1f} | {t_differe:>11.3f}")
+        db.fermer()
+
+
+if __name__ == "__main__":
+    main()
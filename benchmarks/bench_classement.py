@@ -0,0 +1,93 @@
+"""Benchmark: classement complet et top 10 (tri complet vs tas)
+
+L'ancien classement triait toute la cohorte et relisait la moyenne de
+chaque étudiant trois fois (tri, champ "moyenne", mention); le top 10 en
+prenait les 10 premiers. Les moyennes des étudiants sont remises à zéro
+avant chaque mesure, comme pour des objets neufs. Vérifie que les
+résultats sont identiques.
+"""
+
+import random
+import time
+
+from models.etudiant import Etudiant
+from services.statistiques import classement_etudiants, meilleurs_etudiants
+from services.tableau_etudiants import TableauEtudiants
+
+MATIERES = ["Mathématiques", "Physique", "Informatique", "Anglais", "Histoire", "Philosophie"]
+
+
+def classement_reference(etudiants):
+    """Classement tel que calculé avant le moteur de classement"""
+    etudiants_tries = sorted(etudiants, key=lambda e: e.moyenne_generale(), reverse=True)
+    return [
+        {
+            "rang": rang,
+            "id": e.id,
+            "nom": e.nom,
+            "prenom": e.prenom,
+            "promotion": e.promotion,
+            "moyenne": e.moyenne_generale(),
+            "mention": e.get_mention(),
+            "nombre_matieres": e.nombre_matieres()
+        }
+        for rang, e in enumerate(etudiants_tries, 1)
+    ]
+
+
+def generer_etudiants(nb, graine=0):
+    rng = random.Random(graine)
+    etudiants = []
+    for i in range(nb):
+        e = Etudiant(i, f"NOM{i:06d}", "Prenom", rng.choice(["L1", "L2", "L3"]))
+        for matiere in sorted(rng.sample(MATIERES, 4)):
+            for _ in range(3):
+                e.charger_note(matiere, round(rng.uniform(0, 20) * 4) / 4)
+        etudiants.append(e)
+    return etudiants
+
+
+def chronometrer(etudiants, fonction, *args, repetitions=3):
+    """Meilleur temps sur quelques répétitions, moyennes remises à zéro avant chacune"""
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        for e in etudiants:
+            e._invalider_moyennes()
+        debut = time.perf_counter()
+        resultat = fonction(*args)
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur, resultat
+
+
+def main():
+    for nb in (10_000, 100_000):
+        etudiants = generer_etudiants(nb)
+        tableau = TableauEtudiants.depuis_etudiants(etudiants)
+        
+        print(f"\n{nb} étudiants")
+        print(f"{'Calcul':>32} | {'Avant (s)':>9} | {'Après (s)':>9} | {'Gain':>6}")
+        print("-" * 66)
+        
+        t_avant, attendu = chronometrer(etudiants, classement_reference, etudiants)
+        t_apres, obtenu = chronometrer(etudiants, classement_etudiants, etudiants)
+        assert attendu == obtenu, "classement: les résultats diffèrent"
+        print(f"{'Classement complet':>32} | {t_avant:>9.3f} | {t_apres:>9.3f} | x{t_avant / t_apres:>5.1f}")
+        
+        t_avant, attendu = chronometrer(etudiants, lambda: classement_reference(etudiants)[:10])
+        t_apres, obtenu = chronometrer(etudiants, meilleurs_etudiants, etudiants, 10)
+        assert attendu == obtenu, "top 10: les résultats diffèrent"
+        print(f"{'Top 10 (objets)':>32} | {t_avant:>9.3f} | {t_apres:>9.3f} | x{t_avant / t_apres:>5.1f}")
+        
+        tableau.moyennes_generales()
+        debut = time.perf_counter()
+        complet = tableau.ordre_classement()[:10]
+        t_avant = time.perf_counter() - debut
+        debut = time.perf_counter()
+        partiel = tableau.ordre_classement(10)
+        t_apres = time.perf_counter() - debut
+        assert complet.tolist() == partiel.tolist(), "top 10 NumPy: les résultats diffèrent"
+        print(f"{'Top 10 (NumPy, moyennes prêtes)':>32} | {t_avant:>9.4f} | {t_apres:>9.4f} | x{t_avant / t_apres:>5.1f}")
+
+
+if __name__ == "__main__":
+    main()
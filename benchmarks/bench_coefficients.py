@@ -0,0 +1,58 @@
+"""Benchmark: coefficients par étudiant vs coefficients par promotion
+
+Les jeux de données donnent le même coefficient à tous les étudiants: la
+factorisation les remplace par une ligne par promotion.
+"""
+
+import time
+
+from benchmarks.donnees import MATIERES, PROMOTIONS, creer_base
+
+NB_ETUDIANTS = 20_000
+
+
+def mesurer(db):
+    """(lignes de coefficients, durée du chargement, moyennes pondérées)"""
+    lignes = db.conn.execute(
+        "SELECT (SELECT COUNT(*) FROM coefficients) + (SELECT COUNT(*) FROM coefficients_promotion)"
+    ).fetchone()[0]
+    debut = time.perf_counter()
+    etudiants = db.obtenir_tous_etudiants()
+    duree = time.perf_counter() - debut
+    return lignes, duree, [e.moyenne_generale_ponderee() for e in etudiants]
+
+
+def main():
+    db = creer_base(NB_ETUDIANTS)
+    
+    # Un second coefficient commun, posé étudiant par étudiant
+    with db.transaction():
+        for etudiant_id, in db.conn.execute("SELECT id FROM etudiants").fetchall():
+            db.set_coefficient(etudiant_id, MATIERES[2], 3)
+    
+    lignes_avant, duree_avant, moyennes_avant = mesurer(db)
+    
+    debut = time.perf_counter()
+    db.factoriser_coefficients()
+    duree_factorisation = time.perf_counter() - debut
+    lignes_apres, duree_apres, moyennes_apres = mesurer(db)
+    
+    assert moyennes_avant == moyennes_apres
+    
+    print(f"{NB_ETUDIANTS} étudiants, {len(PROMOTIONS)} promotions")
+    print(f"{'':>14} | {'Lignes':>8} | {'Chargement (s)':>14}")
+    print("-" * 42)
+    print(f"{'Par étudiant':>14} | {lignes_avant:>8} | {duree_avant:>14.3f}")
+    print(f"{'Par promotion':>14} | {lignes_apres:>8} | {duree_apres:>14.3f}")
+    print(f"Factorisation: {duree_factorisation:.3f} s, moyennes pondérées identiques ✓")
+    
+    # Changer un coefficient pour toute une promotion: une seule ligne écrite
+    debut = time.perf_counter()
+    db.set_coefficient_promotion(PROMOTIONS[0], MATIERES[0], 4)
+    print(f"Coefficient changé pour toute la promotion {PROMOTIONS[0]}: "
+          f"{(time.perf_counter() - debut) * 1000:.2f} ms")
+    db.fermer()
+
+
+if __name__ == "__main__":
+    main()
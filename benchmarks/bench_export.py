@@ -0,0 +1,48 @@
+"""Benchmark: pic mémoire de l'export JSON (ancien chemin vs export en flux)"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.donnees import creer_base
+
+
+def export_en_memoire(db, fichier):
+    """Ancien chemin: tous les étudiants hydratés puis json.dump"""
+    data = [e.to_dict() for e in db.obtenir_tous_etudiants()]
+    with open(fichier, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+def mesurer(fonction, *args):
+    tracemalloc.start()
+    debut = time.perf_counter()
+    fonction(*args)
+    duree = time.perf_counter() - debut
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duree, pic / 1024 / 1024
+
+
+def main():
+    dossier = tempfile.mkdtemp(prefix="bench_export_")
+    fichier = os.path.join(dossier, "backup.json")
+    
+    print(f"{'Étudiants':>10} | {'Ancien (Mo)':>11} | {'Flux (Mo)':>9} | {'Compact (Mo)':>12}")
+    print("-" * 52)
+    
+    for nb in (1_000, 5_000, 20_000):
+        db = creer_base(nb)
+        
+        _, pic_ancien = mesurer(export_en_memoire, db, fichier)
+        _, pic_flux = mesurer(db.exporter_vers_json, fichier)
+        _, pic_compact = mesurer(db.exporter_vers_json, fichier, True)
+        
+        print(f"{nb:>10} | {pic_ancien:>11.1f} | {pic_flux:>9.2f} | {pic_compact:>12.2f}")
+        db.fermer()
+
+
+if __name__ == "__main__":
+    main()
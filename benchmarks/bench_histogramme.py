@@ -0,0 +1,67 @@
+"""Benchmark: médiane et quantiles par histogramme de comptage vs par tri
+
+Sur un million de notes au quart de point: tri complet (np.sort) puis
+lecture, sélection (np.quantile), et histogramme (comptage puis lecture en
+O(cases)). Mesure aussi le coût d'une requête sur un histogramme déjà
+construit et la fusion des histogrammes de plusieurs promotions. Vérifie
+que les résultats sont identiques.
+"""
+
+import random
+import time
+
+import numpy as np
+
+from services.histogramme import Histogramme
+
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def chronometrer(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return time.perf_counter() - debut, resultat
+
+
+def par_tri(notes):
+    triees = np.sort(notes)
+    n = len(triees)
+    return [(triees[(n - 1) // 2] + triees[n // 2]) / 2, *np.quantile(triees, QUANTILES).tolist()]
+
+
+def par_selection(notes):
+    return [float(np.median(notes)), *np.quantile(notes, QUANTILES).tolist()]
+
+
+def par_histogramme(histogramme):
+    return [histogramme.mediane(), *(histogramme.quantile(q) for q in QUANTILES)]
+
+
+def main():
+    rng = random.Random(0)
+    notes = np.array([round(rng.uniform(0, 20) * 4) / 4 for _ in range(1_000_000)])
+    promotions = np.array([rng.randrange(5) for _ in range(len(notes))])
+    
+    t_tri, attendu = chronometrer(par_tri, notes)
+    t_selection, selection = chronometrer(par_selection, notes)
+    t_comptage, histogramme = chronometrer(Histogramme.depuis_valeurs, notes)
+    t_requete, obtenu = chronometrer(par_histogramme, histogramme)
+    
+    assert attendu == selection == obtenu, "les médianes ou quantiles diffèrent"
+    print(f"{'1M notes':>28} | {'Temps (s)':>10}")
+    print("-" * 41)
+    print(f"{'Tri + lecture':>28} | {t_tri:>10.4f}")
+    print(f"{'Sélection (np.quantile)':>28} | {t_selection:>10.4f}")
+    print(f"{'Histogramme: comptage':>28} | {t_comptage:>10.4f}")
+    print(f"{'Histogramme: requêtes':>28} | {t_requete:>10.6f}")
+    
+    # Fusion: les histogrammes des promotions donnent celui de l'école
+    t_groupes, groupes = chronometrer(Histogramme.par_groupes, notes, promotions, 5)
+    t_fusion, ecole = chronometrer(sum, groupes, Histogramme())
+    assert (ecole.comptes == histogramme.comptes).all() and par_histogramme(ecole) == attendu
+    print(f"{'Comptage par promotion (5)':>28} | {t_groupes:>10.4f}")
+    print(f"{'Fusion + requêtes':>28} | {t_fusion + chronometrer(par_histogramme, ecole)[0]:>10.6f}")
+
+
+if __name__ == "__main__":
+    main()
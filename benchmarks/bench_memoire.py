@@ -0,0 +1,84 @@
+"""Benchmark: mémoire occupée par les étudiants en mémoire
+
+Compare l'Etudiant compact (__slots__, array('d'), matières internées) à
+l'ancienne représentation (__dict__, listes de floats), pour 10 000 et
+100 000 étudiants construits sans base (4 matières, 3 notes chacune).
+La mémoire est mesurée avec tracemalloc.
+"""
+
+import gc
+import time
+import tracemalloc
+
+from benchmarks.donnees import generer_lignes
+from models.etudiant import Etudiant
+
+
+class AncienEtudiant:
+    """Disposition mémoire d'avant: attributs dans __dict__, listes de floats"""
+    
+    def __init__(self, id_, nom, prenom, promotion, email=""):
+        self.id = id_
+        self.nom = nom.strip().upper()
+        self.prenom = prenom.strip().capitalize()
+        self.promotion = promotion.strip().upper()
+        self.email = email.strip().lower()
+        self.photo_path = ""
+        self.notes = {}
+        self.notes_ids = {}
+        self.coefficients = {}
+        self.coefficients_promotion = {}
+        self.chargeur = None
+        self._moyenne = None
+    
+    def ajouter_note(self, matiere, note, note_id=None):
+        matiere = matiere.strip().capitalize()
+        self.notes.setdefault(matiere, []).append(float(note))
+        self.notes_ids.setdefault(matiere, []).append(note_id)
+
+
+def construire(classe, lignes):
+    """Construit les étudiants; matières, promotions et notes sont des objets
+    neufs, comme ceux lus en base"""
+    etudiants = []
+    note_id = 0
+    for i, item in enumerate(lignes, 1):
+        etudiant = classe(i, item["nom"], item["prenom"], "".join(item["promotion"]), item["email"])
+        for matiere, notes in item["notes"].items():
+            for note in notes:
+                note_id += 1
+                etudiant.ajouter_note("".join(matiere), note * 1.0, note_id)
+        etudiants.append(etudiant)
+    return etudiants
+
+
+def mesurer(classe, lignes):
+    gc.collect()
+    tracemalloc.start()
+    debut = time.perf_counter()
+    etudiants = construire(classe, lignes)
+    duree = time.perf_counter() - debut
+    taille = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return taille, duree, etudiants
+
+
+def main():
+    print(f"{'Étudiants':>10} | {'Ancien (Mo)':>11} | {'Compact (Mo)':>12} | {'Gain':>5} | Octets/étudiant")
+    print("-" * 66)
+    for nb in (10_000, 100_000):
+        lignes = list(generer_lignes(nb))
+        taille_ancien, _, anciens = mesurer(AncienEtudiant, lignes)
+        taille_compact, _, compacts = mesurer(Etudiant, lignes)
+        
+        for ancien, compact in zip(anciens[:100], compacts[:100]):
+            assert ancien.notes == {m: n.tolist() for m, n in compact.notes.items()}
+            assert ancien.notes_ids == {m: n.tolist() for m, n in compact.notes_ids.items()}
+        del anciens, compacts
+        
+        print(f"{nb:>10} | {taille_ancien / 2**20:>11.1f} | {taille_compact / 2**20:>12.1f} | "
+              f"{taille_ancien / taille_compact:>4.1f}x | {taille_ancien // nb} -> {taille_compact // nb}")
+
+
+if __name__ == "__main__":
+    main()
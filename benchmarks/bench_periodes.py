@@ -0,0 +1,105 @@
+"""Benchmark: statistiques par période (notes datées sur deux ans)
+
+Compare, pour un tableau de bord par trimestre, promotion et matière:
+- le chargement de tous les étudiants puis un filtrage en Python;
+- les cumuls mensuels de notes_periodes regroupés par trimestre.
+Puis des statistiques sur un semestre, filtrées par l'index sur date_ajout,
+et le coût des écritures qui mettent à jour notes_periodes par triggers.
+"""
+
+import random
+import time
+from collections import defaultdict
+
+from benchmarks.donnees import creer_base
+from services import statistiques_sql
+
+NB_ETUDIANTS = 20_000
+
+
+def tableau_python(db):
+    """Ancien chemin: toutes les notes détaillées, regroupées en Python"""
+    promotions = {e.id: e.promotion for e in db.obtenir_tous_etudiants(prefetch=False)}
+    cursor = db.conn.cursor()
+    cursor.row_factory = None
+    cursor.execute("SELECT etudiant_id, matiere, note, date_ajout FROM notes")
+    
+    groupes = defaultdict(list)
+    for etudiant_id, matiere, note, date_ajout in cursor:
+        if etudiant_id in promotions:
+            trimestre = f"{date_ajout[:4]}-T{(int(date_ajout[5:7]) + 2) // 3}"
+            groupes[(trimestre, promotions[etudiant_id], matiere)].append(note)
+    
+    return {
+        cle: (len(notes), sum(notes) / len(notes), min(notes), max(notes))
+        for cle, notes in groupes.items()
+    }
+
+
+def mesurer(fonction, *args, **kwargs):
+    debut = time.perf_counter()
+    resultat = fonction(*args, **kwargs)
+    return time.perf_counter() - debut, resultat
+
+
+def mesurer_ecritures(db, nombre=50):
+    """Durée moyenne (ms) des suppressions et modifications de notes, et des
+    changements de promotion"""
+    rng = random.Random(3)
+    notes = [i for (i,) in db.conn.execute("SELECT id FROM notes")]
+    etudiants = [i for (i,) in db.conn.execute("SELECT id FROM etudiants")]
+    promotions = ["L1", "L2", "L3", "M1", "M2"]
+    
+    operations = {
+        "supprimer_note_par_id": lambda: db.supprimer_note_par_id(notes.pop(rng.randrange(len(notes)))),
+        "modifier_note_par_id": lambda: db.modifier_note_par_id(rng.choice(notes), rng.randrange(81) / 4),
+        "modifier_etudiant(promotion)": lambda: db.modifier_etudiant(
+            rng.choice(etudiants), promotion=rng.choice(promotions)
+        ),
+    }
+    durees = {}
+    for nom, operation in operations.items():
+        debut = time.perf_counter()
+        for _ in range(nombre):
+            operation()
+        durees[nom] = (time.perf_counter() - debut) / nombre * 1000
+    return durees
+
+
+def main():
+    db = creer_base(NB_ETUDIANTS, etaler_dates=True)
+    
+    t_python, attendu = mesurer(tableau_python, db)
+    t_cumuls, cumuls = mesurer(db.obtenir_cumuls_periodes, "trimestre")
+    
+    obtenu = {
+        (c["periode"], c["promotion"], c["matiere"]): (c["nombre"], c["moyenne"], c["min"], c["max"])
+        for c in cumuls
+    }
+    assert obtenu.keys() == attendu.keys()
+    for cle, (nombre, moyenne, note_min, note_max) in attendu.items():
+        assert obtenu[cle][0] == nombre and obtenu[cle][2:] == (note_min, note_max)
+        assert abs(obtenu[cle][1] - moyenne) < 1e-9
+    
+    print(f"{NB_ETUDIANTS} étudiants, {len(cumuls)} groupes (trimestre, promotion, matière)")
+    print(f"Python (toutes les notes):  {t_python * 1000:>8.1f} ms")
+    print(f"notes_periodes:             {t_cumuls * 1000:>8.1f} ms (x{t_python / t_cumuls:.0f})")
+    
+    t_semestre, stats = mesurer(
+        statistiques_sql.stats_par_matiere, db, debut="2024-01-01", fin="2024-07-01"
+    )
+    t_tout, _ = mesurer(statistiques_sql.stats_par_matiere, db)
+    nombre = sum(s["nombre_notes"] for s in stats.values())
+    print(f"stats_par_matiere, 1er semestre 2024 ({nombre} notes): {t_semestre * 1000:.1f} ms "
+          f"(toutes les notes: {t_tout * 1000:.1f} ms)")
+    
+    for nom, duree in mesurer_ecritures(db).items():
+        print(f"{nom:<30} {duree:>7.2f} ms")
+    
+    assert db.verifier_cumuls_periodes() == []
+    print("Cumuls cohérents ✓")
+    db.fermer()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark: recherche pendant la saisie (index FTS5 vs LIKE '%...%')"""
+
+import time
+
+from benchmarks.donnees import creer_base
+
+
+def recherche_like(db, texte, limite=50):
+    cursor = db.conn.cursor()
+    cursor.execute(
+        "SELECT id FROM etudiants WHERE nom LIKE ? OR prenom LIKE ? OR promotion LIKE ? LIMIT ?",
+        (f"%{texte}%", f"%{texte}%", f"%{texte}%", limite)
+    )
+    return cursor.fetchall()
+
+
+def chronometrer(fonction, *args, repetitions=20):
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        fonction(*args)
+    return (time.perf_counter() - debut) / repetitions * 1000
+
+
+def main():
+    db = creer_base(100_000, notes_par_matiere=0)
+    saisie = "prenom123"
+    
+    print(f"{'Saisie':>10} | {'LIKE (ms)':>9} | {'FTS5 (ms)':>9}")
+    print("-" * 36)
+    
+    # Simule la frappe caractère par caractère
+    for i in range(1, len(saisie) + 1):
+        texte = saisie[:i]
+        t_like = chronometrer(recherche_like, db, texte)
+        t_fts = chronometrer(db.rechercher_ids, texte)
+        print(f"{texte:>10} | {t_like:>9.2f} | {t_fts:>9.2f}")
+    
+    db.fermer()
+
+
+if __name__ == "__main__":
+    main()
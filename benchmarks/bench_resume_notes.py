@@ -0,0 +1,54 @@
+"""Benchmark: statistiques descriptives d'un million de notes
+
+Compare l'ancien calcul (moyenne, median, max, min et stdev du module
+statistics: cinq parcours et un tri) au noyau resume_notes (un parcours par
+blocs et une sélection pour la médiane), sur des notes au quart de point
+puis sur des notes quelconques, et vérifie que les résultats concordent:
+exactement pour les quarts de point, à l'arrondi près sinon.
+"""
+
+import random
+import time
+from statistics import median, stdev
+
+from benchmarks.bench_tableau import concordent
+from services.statistiques import moyenne, resume_notes
+
+
+def resume_reference(notes):
+    """Statistiques telles que calculées avant resume_notes"""
+    return {
+        "nombre_notes": len(notes),
+        "moyenne": moyenne(notes),
+        "mediane": median(notes),
+        "max": max(notes),
+        "min": min(notes),
+        "ecart_type": stdev(notes) if len(notes) > 1 else 0
+    }
+
+
+def chronometrer(fonction, notes):
+    debut = time.perf_counter()
+    resultat = fonction(notes)
+    return time.perf_counter() - debut, resultat
+
+
+def main():
+    rng = random.Random(0)
+    jeux = [
+        ("Quarts de point", [round(rng.uniform(0, 20) * 4) / 4 for _ in range(1_000_000)], True),
+        ("Quelconques", [rng.uniform(0, 20) for _ in range(1_000_000)], False),
+    ]
+    
+    print(f"{'Notes (1M)':>16} | {'Ancien (s)':>10} | {'Noyau (s)':>10} | {'Gain':>7}")
+    print("-" * 53)
+    for nom, notes, exact in jeux:
+        t_ancien, attendu = chronometrer(resume_reference, notes)
+        t_noyau, obtenu = chronometrer(resume_notes, notes)
+        
+        assert attendu == obtenu if exact else concordent(attendu, obtenu), f"{nom}: les résultats diffèrent"
+        print(f"{nom:>16} | {t_ancien:>10.3f} | {t_noyau:>10.3f} | x{t_ancien / t_noyau:>6.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark: backup JSON vs sauvegarde SQLite native (brute, gzip, lzma)
+
+Mesure aussi le temps pendant lequel une écriture concurrente attend:
+la sauvegarde native copie par étapes et ne bloque pas les écritures.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.donnees import creer_base
+
+NB_ETUDIANTS = 20_000
+
+
+def attente_max_ecriture(db, operation):
+    """Exécute `operation` et retourne (durée, plus longue attente d'une écriture)"""
+    fini = threading.Event()
+    attentes = []
+    
+    def ecrivain():
+        while not fini.is_set():
+            debut = time.perf_counter()
+            db.ajouter_note(1, "Physique", 10)
+            attentes.append(time.perf_counter() - debut)
+            time.sleep(0.005)
+    
+    thread = threading.Thread(target=ecrivain)
+    thread.start()
+    debut = time.perf_counter()
+    operation()
+    duree = time.perf_counter() - debut
+    fini.set()
+    thread.join()
+    return duree, max(attentes, default=0)
+
+
+def main():
+    db = creer_base(NB_ETUDIANTS)
+    dossier = tempfile.mkdtemp(prefix="bench_sauvegarde_")
+    
+    print(f"{NB_ETUDIANTS} étudiants")
+    print(f"{'Format':>12} | {'Durée (s)':>9} | {'Taille (Mo)':>11} | {'Attente écriture max (ms)':>25}")
+    print("-" * 68)
+    
+    cas = [
+        ("JSON", "backup.json", lambda f: db.exporter_vers_json(f)),
+        ("SQLite", "backup.db", lambda f: db.sauvegarder(f)),
+        ("SQLite gzip", "backup.db.gz", lambda f: db.sauvegarder(f)),
+        ("SQLite lzma", "backup.db.xz", lambda f: db.sauvegarder(f)),
+    ]
+    for nom, fichier, fonction in cas:
+        chemin = os.path.join(dossier, fichier)
+        duree, attente = attente_max_ecriture(db, lambda: fonction(chemin))
+        taille = os.path.getsize(chemin) / 1024 / 1024
+        print(f"{nom:>12} | {duree:>9.3f} | {taille:>11.1f} | {attente * 1000:>25.1f}")
+    
+    # Aller-retour: la base restaurée contient les mêmes étudiants
+    attendu = [e.to_dict() for e in db.obtenir_tous_etudiants()]
+    debut = time.perf_counter()
+    db.restaurer(os.path.join(dossier, "backup.db.gz"))
+    print(f"Restauration gzip: {time.perf_counter() - debut:.3f} s")
+    restaures = [e.to_dict() for e in db.obtenir_tous_etudiants()]
+    assert len(restaures) == len(attendu)
+    assert db.verifier_agregats() == []
+    print("Restauration cohérente ✓")
+    db.fermer()
+
+
+if __name__ == "__main__":
+    main()
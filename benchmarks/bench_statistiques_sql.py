@@ -0,0 +1,45 @@
+"""Benchmark: statistiques en Python (objets Etudiant) vs calculées en SQL
+
+Vérifie aussi que les deux versions donnent exactement les mêmes résultats.
+"""
+
+import time
+
+from benchmarks.donnees import creer_base
+from services import statistiques, statistiques_sql
+
+FONCTIONS = [
+    ("stats_par_matiere", ()),
+    ("taux_reussite", ()),
+    ("repartition_mentions", ()),
+    ("analyse_matiere", ("Physique",)),
+]
+
+
+def chronometrer(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return time.perf_counter() - debut, resultat
+
+
+def main():
+    for nb in (1_000, 5_000, 20_000):
+        db = creer_base(nb, notes_par_matiere=5)
+        t_chargement, etudiants = chronometrer(db.obtenir_tous_etudiants)
+        
+        print(f"\n{nb} étudiants (chargement des objets: {t_chargement:.3f} s)")
+        print(f"{'Fonction':>22} | {'Python (s)':>10} | {'SQL (s)':>8}")
+        print("-" * 46)
+        
+        for nom, args in FONCTIONS:
+            t_python, attendu = chronometrer(getattr(statistiques, nom), etudiants, *args)
+            t_sql, obtenu = chronometrer(getattr(statistiques_sql, nom), db, *args)
+            
+            assert attendu == obtenu, f"{nom}: les résultats SQL diffèrent de la version Python"
+            print(f"{nom:>22} | {t_python:>10.3f} | {t_sql:>8.3f}")
+        
+        db.fermer()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: statistiques sur des objets Etudiant vs sur un TableauEtudiants
+
+Même fonctions de services.statistiques, appelées avec la liste d'étudiants
+puis avec le tableau NumPy construit directement depuis la base. Vérifie
+que les résultats concordent (à l'arrondi près: les moyennes NumPy ne sont
+pas sommées dans le même ordre), y compris pour des notes au dixième de
+point, qui ne sont pas exactes en binaire.
+"""
+
+import math
+import time
+
+from benchmarks.donnees import creer_base
+from services import statistiques
+from services.tableau_etudiants import TableauEtudiants
+
+FONCTIONS = [
+    ("stats_par_matiere", ()),
+    ("stats_promotion", ("L1",)),
+    ("classement_etudiants", ()),
+    ("repartition_mentions", ()),
+    ("taux_reussite", ()),
+    ("meilleurs_etudiants", (10,)),
+    ("analyse_matiere", ("Physique",)),
+]
+
+
+def chronometrer(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return time.perf_counter() - debut, resultat
+
+
+def concordent(a, b):
+    """Compare deux résultats, les flottants à 1e-9 près"""
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(concordent(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(concordent(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    return a == b
+
+
+def main():
+    for nb, divisions in ((10_000, 4), (100_000, 4), (10_000, 10)):
+        db = creer_base(nb, divisions=divisions)
+        t_objets, etudiants = chronometrer(db.obtenir_tous_etudiants)
+        t_tableau, tableau = chronometrer(TableauEtudiants.depuis_base, db)
+        
+        print(f"\n{nb} étudiants, {len(tableau.notes)} notes au 1/{divisions} de point")
+        print(f"{'Chargement':>22} | {t_objets:>10.3f} | {t_tableau:>10.3f} | x{t_objets / t_tableau:.1f}")
+        print(f"{'Fonction':>22} | {'Objets (s)':>10} | {'NumPy (s)':>10} |")
+        print("-" * 56)
+        
+        total_objets = total_tableau = 0
+        for nom, args in FONCTIONS:
+            # Les moyennes des objets sont en cache après le premier appel: on
+            # mesure des objets neufs, comme le tableau (dont le cache est vidé)
+            for e in etudiants:
+                e._invalider_moyennes()
+            tableau._sommes = tableau._moyennes = None
+            
+            t_python, attendu = chronometrer(getattr(statistiques, nom), etudiants, *args)
+            t_numpy, obtenu = chronometrer(getattr(statistiques, nom), tableau, *args)
+            
+            assert concordent(attendu, obtenu), f"{nom}: les résultats NumPy diffèrent"
+            total_objets += t_python
+            total_tableau += t_numpy
+            print(f"{nom:>22} | {t_python:>10.3f} | {t_numpy:>10.3f} | x{t_python / t_numpy:.0f}")
+        
+        print(f"{'Total (avec chargement)':>22} | {total_objets + t_objets:>10.3f} | "
+              f"{total_tableau + t_tableau:>10.3f} | x{(total_objets + t_objets) / (total_tableau + t_tableau):.1f}")
+        db.fermer()
+
+
+if __name__ == "__main__":
+    main()
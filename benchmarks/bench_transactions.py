@@ -0,0 +1,55 @@
+"""Benchmark: débit d'écriture des notes avec et sans db.transaction(), et
+par lot avec db.ajouter_notes_lot()"""
+
+import os
+import random
+import tempfile
+import time
+
+from services.database import Database
+
+
+def saisir_notes(db, etudiants, nb_notes):
+    rng = random.Random(0)
+    for i in range(nb_notes):
+        db.ajouter_note(etudiants[i % len(etudiants)], "Mathématiques", rng.uniform(0, 20))
+
+
+def saisir_lot(db, etudiants, nb_notes):
+    rng = random.Random(0)
+    nombre, refus = db.ajouter_notes_lot(
+        (etudiants[i % len(etudiants)], "Mathématiques", rng.uniform(0, 20)) for i in range(nb_notes)
+    )
+    assert nombre == nb_notes and not refus
+
+
+def main():
+    dossier = tempfile.mkdtemp(prefix="bench_transactions_")
+    db = Database(os.path.join(dossier, "etudiants.db"))
+    with db.transaction():
+        etudiants = [db.ajouter_etudiant(f"Nom{i}", "Prenom", "L1") for i in range(100)]
+    
+    print(f"{'Notes':>7} | {'Sans (notes/s)':>14} | {'Avec (notes/s)':>14} | {'Lot (notes/s)':>14} | {'Gain':>7}")
+    print("-" * 69)
+    
+    for nb in (200, 1_000, 5_000):
+        debut = time.perf_counter()
+        saisir_notes(db, etudiants, nb)
+        sans = nb / (time.perf_counter() - debut)
+        
+        debut = time.perf_counter()
+        with db.transaction():
+            saisir_notes(db, etudiants, nb)
+        avec = nb / (time.perf_counter() - debut)
+        
+        debut = time.perf_counter()
+        saisir_lot(db, etudiants, nb)
+        lot = nb / (time.perf_counter() - debut)
+        
+        print(f"{nb:>7} | {sans:>14.0f} | {avec:>14.0f} | {lot:>14.0f} | x{avec / sans:>6.1f}")
+    
+    db.fermer()
+
+
+if __name__ == "__main__":
+    main()
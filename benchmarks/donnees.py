@@ -0,0 +1,82 @@
+"""Génération de jeux de données pour les benchmarks
+
+Les benchmarks se lancent depuis la racine du projet, par exemple:
+    python -m benchmarks.bench_chargement
+"""
+
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+from services.database import Database
+
+MATIERES = ["Mathématiques", "Physique", "Informatique", "Anglais", "Histoire", "Philosophie"]
+PROMOTIONS = ["L1", "L2", "L3", "M1", "M2"]
+
+
+def generer_lignes(nb_etudiants, notes_par_matiere=3, graine=42, divisions=4):
+    """Génère des étudiants aléatoires sous forme de dictionnaires (notes
+    arrondies au 1/divisions de point: quart de point par défaut)"""
+    rng = random.Random(graine)
+    
+    for i in range(nb_etudiants):
+        yield {
+            "nom": f"NOM{i:06d}",
+            "prenom": f"Prenom{rng.randint(0, 999)}",
+            "promotion": rng.choice(PROMOTIONS),
+            "email": f"etudiant{i}@ecole.fr",
+            "notes": {
+                matiere: [round(rng.uniform(0, 20) * divisions) / divisions for _ in range(notes_par_matiere)]
+                for matiere in rng.sample(MATIERES, 4)
+            },
+            "coefficients": {MATIERES[0]: 2.0}
+        }
+
+
+def date_aleatoire(rng):
+    """Date de note au hasard en 2023-2024, au format de notes.date_ajout"""
+    debut = datetime(2023, 1, 1)
+    return (debut + timedelta(seconds=rng.randrange(731 * 86400))).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def creer_base(nb_etudiants, notes_par_matiere=3, dossier=None, etaler_dates=False, divisions=4):
+    """Crée une base temporaire remplie d'étudiants aléatoires
+    
+    Avec etaler_dates, les notes sont datées au hasard sur deux années
+    (2023-2024) au lieu de la date du jour. divisions: voir generer_lignes.
+    
+    Returns:
+        Instance de Database ouverte sur la base générée
+    """
+    dossier = dossier or tempfile.mkdtemp(prefix="bench_etudiants_")
+    db = Database(os.path.join(dossier, "etudiants.db"))
+    cursor = db.conn.cursor()
+    rng_dates = random.Random(7)
+    
+    for item in generer_lignes(nb_etudiants, notes_par_matiere, divisions=divisions):
+        cursor.execute(
+            "INSERT INTO etudiants (nom, prenom, promotion, email) VALUES (?, ?, ?, ?)",
+            (item["nom"], item["prenom"], item["promotion"], item["email"])
+        )
+        etudiant_id = cursor.lastrowid
+        if etaler_dates:
+            cursor.executemany(
+                "INSERT INTO notes (etudiant_id, matiere, note, date_ajout) VALUES (?, ?, ?, ?)",
+                [
+                    (etudiant_id, m, n, date_aleatoire(rng_dates))
+                    for m, notes in item["notes"].items() for n in notes
+                ]
+            )
+        else:
+            cursor.executemany(
+                "INSERT INTO notes (etudiant_id, matiere, note) VALUES (?, ?, ?)",
+                [(etudiant_id, m, n) for m, notes in item["notes"].items() for n in notes]
+            )
+        cursor.executemany(
+            "INSERT INTO coefficients (etudiant_id, matiere, coefficient) VALUES (?, ?, ?)",
+            [(etudiant_id, m, c) for m, c in item["coefficients"].items()]
+        )
+    
+    db.conn.commit()
+    return db
@@ -0,0 +1,82 @@
+"""Test de charge: lectures et écritures concurrentes sur une même Database
+
+Plusieurs threads lisent (listes, recherches, statistiques SQL) pendant que
+d'autres ajoutent des notes, puis on vérifie qu'aucune erreur n'est survenue
+et que la base est cohérente.
+"""
+
+import random
+import threading
+import time
+
+from benchmarks.donnees import creer_base
+from services import statistiques_sql
+
+DUREE = 5  # secondes
+NB_LECTEURS = 4
+NB_ECRIVAINS = 2
+
+
+def main():
+    db = creer_base(2_000)
+    ids = [e.id for e in db.obtenir_tous_etudiants()]
+    notes_avant = db.conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+    
+    fin = time.perf_counter() + DUREE
+    erreurs = []
+    compteurs = {"lectures": 0, "ecritures": 0}
+    verrou = threading.Lock()
+    
+    def lecteur(graine):
+        rng = random.Random(graine)
+        while time.perf_counter() < fin:
+            try:
+                match rng.randrange(4):
+                    case 0:
+                        db.obtenir_page_etudiants(100)
+                    case 1:
+                        db.recherche_rapide(f"prenom{rng.randint(0, 999)}")
+                    case 2:
+                        statistiques_sql.taux_reussite(db)
+                    case 3:
+                        db.obtenir_etudiant(rng.choice(ids))
+            except Exception as e:
+                erreurs.append(e)
+            with verrou:
+                compteurs["lectures"] += 1
+    
+    def ecrivain(graine):
+        rng = random.Random(graine)
+        while time.perf_counter() < fin:
+            try:
+                with db.transaction():
+                    for _ in range(10):
+                        db.ajouter_note(rng.choice(ids), "Physique", rng.randint(0, 20))
+            except Exception as e:
+                erreurs.append(e)
+                continue
+            with verrou:
+                compteurs["ecritures"] += 10
+    
+    threads = [threading.Thread(target=lecteur, args=(i,)) for i in range(NB_LECTEURS)]
+    threads += [threading.Thread(target=ecrivain, args=(100 + i,)) for i in range(NB_ECRIVAINS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    notes_apres = db.conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+    
+    print(f"Lectures:  {compteurs['lectures'] / DUREE:.0f}/s sur {NB_LECTEURS} threads")
+    print(f"Écritures: {compteurs['ecritures'] / DUREE:.0f} notes/s sur {NB_ECRIVAINS} threads")
+    print(f"Erreurs:   {len(erreurs)}")
+    
+    assert not erreurs, erreurs[:3]
+    assert notes_apres - notes_avant == compteurs["ecritures"]
+    assert db.verifier_agregats() == []
+    print("Base cohérente ✓")
+    db.fermer()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,20 @@ from tkinter import messagebox, filedialog
 import tkinter as tk
 from PIL import Image, ImageTk
 import json
+import threading
 
-from services.database import Database
+from models.etudiant import mention_pour
+from services.database import Database, texte_date
 from services.statistiques import (
     stats_par_matiere, stats_promotion, classement_etudiants,
-    repartition_mentions, taux_reussite, etudiants_en_difficulte
+    etudiants_en_difficulte
 )
 from services.rapports import (
     generer_rapport_etudiant, generer_rapport_promotion,
     generer_rapport_global, generer_bulletin
 )
 from services.graphiques import Graphiques
+from services.tableau_etudiants import TableauEtudiants
 
 # Configuration de CustomTkinter
 ctk.set_appearance_mode("dark")  # "light" ou "dark"
@@ -23,9 +26,13 @@ ctk.set_default_color_theme("blue")  # "blue", "green", "dark-blue"
 class ApplicationModerne:
     """Application de gestion des étudiants avec interface moderne"""
     
+    TAILLE_PAGE = 100  # Nombre d'étudiants affichés par page dans la liste
+    TAILLE_SAISIE_CLASSE = 300  # Nombre maximal de lignes de la grille de saisie par classe
+    
     def __init__(self):
         self.db = Database()
         self.etudiant_courant = None
+        self.cache_statistiques = (None, None)  # (jeton de version, résultats)
         
         # Créer la fenêtre principale
         self.root = ctk.CTk()
@@ -74,6 +81,7 @@ class ApplicationModerne:
         nav_items = [
             ("👥 Étudiants", self.afficher_page_etudiants, "primary"),
             ("📝 Notes", self.afficher_page_notes, "success"),
+            ("🗂️ Saisie classe", self.afficher_page_saisie_classe, "success"),
             ("📊 Statistiques", self.afficher_page_statistiques, "warning"),
             ("📈 Graphiques", self.afficher_page_graphiques, "info"),
             ("📄 Rapports", self.afficher_page_rapports, "purple"),
@@ -100,7 +108,7 @@ class ApplicationModerne:
         separateur2.pack(fill="x", padx=20, pady=20)
         
         # Boutons d'action
-        btn_backup = ctk.CTkButton(
+        self.btn_backup = ctk.CTkButton(
             self.sidebar,
             text="💾 Backup",
             command=self.faire_backup,
@@ -109,7 +117,18 @@ class ApplicationModerne:
             fg_color=("#7f8c8d", "#95a5a6"),
             hover_color=("#95a5a6", "#7f8c8d")
         )
-        btn_backup.pack(pady=5, padx=20, fill="x")
+        self.btn_backup.pack(pady=5, padx=20, fill="x")
+        
+        btn_restaurer = ctk.CTkButton(
+            self.sidebar,
+            text="♻️ Restaurer",
+            command=self.restaurer_backup,
+            corner_radius=8,
+            height=40,
+            fg_color=("#7f8c8d", "#95a5a6"),
+            hover_color=("#95a5a6", "#7f8c8d")
+        )
+        btn_restaurer.pack(pady=5, padx=20, fill="x")
         
         # Switch thème
         self.theme_var = ctk.StringVar(value="dark")
@@ -270,6 +289,7 @@ class ApplicationModerne:
         self.liste_frame.pack(fill="both", expand=True)
         
         self.student_cards = []
+        self.bouton_plus = None
     
     def create_form_field(self, parent, label_text):
         """Crée un champ de formulaire stylisé"""
@@ -299,10 +319,17 @@ class ApplicationModerne:
         for card in self.student_cards:
             card.destroy()
         self.student_cards.clear()
+        self.bouton_plus = None
         
-        # Obtenir les étudiants
+        # Liste complète: chargée page par page
         if etudiants is None:
-            etudiants = self.db.obtenir_tous_etudiants()
+            self.curseur_page = None
+            if hasattr(self, 'liste_frame'):
+                self.liste_frame.configure(
+                    label_text=f"Total: {self.db.nombre_total_etudiants()} étudiants"
+                )
+            self.afficher_page_suivante()
+            return
         
         # Mettre à jour le titre
         if hasattr(self, 'liste_frame'):
@@ -313,6 +340,34 @@ class ApplicationModerne:
             card = self.create_student_card(self.liste_frame, etudiant)
             self.student_cards.append(card)
     
+    def afficher_page_suivante(self):
+        """Ajoute la page suivante d'étudiants à la liste"""
+        if self.bouton_plus:
+            self.student_cards.remove(self.bouton_plus)
+            self.bouton_plus.destroy()
+            self.bouton_plus = None
+        
+        # Les cartes n'affichent que l'identité et la mention: notes et
+        # coefficients ne seront lus que si l'étudiant est sélectionné
+        etudiants, self.curseur_page = self.db.obtenir_page_etudiants(
+            self.TAILLE_PAGE, self.curseur_page, prefetch=False
+        )
+        
+        for etudiant in etudiants:
+            card = self.create_student_card(self.liste_frame, etudiant)
+            self.student_cards.append(card)
+        
+        # Bouton pour charger la page suivante
+        if self.curseur_page is not None:
+            self.bouton_plus = ctk.CTkButton(
+                self.liste_frame,
+                text="⬇️ Afficher plus",
+                command=self.afficher_page_suivante,
+                height=35
+            )
+            self.bouton_plus.pack(pady=10)
+            self.student_cards.append(self.bouton_plus)
+    
     def create_student_card(self, parent, etudiant):
         """Crée une card moderne pour un étudiant"""
         # Couleur selon la mention
@@ -486,19 +541,28 @@ class ApplicationModerne:
     
     def rechercher_temps_reel(self, event=None):
         """Recherche en temps réel"""
-        texte = self.search_entry.get().strip().upper()
+        texte = self.search_entry.get().strip()
         
         if not texte:
             self.rafraichir_liste_etudiants()
             return
         
-        tous_etudiants = self.db.obtenir_tous_etudiants()
-        resultats = [
-            e for e in tous_etudiants
-            if texte in e.nom or texte in e.prenom.upper() or texte in e.promotion
-        ]
+        # Index plein texte: seuls les étudiants trouvés sont chargés. Un
+        # résultat de plus que la page indique que la liste est tronquée
+        resultats = self.db.recherche_rapide(
+            texte, limite=self.TAILLE_PAGE + 1, prefetch=False
+        )
+        tronque = len(resultats) > self.TAILLE_PAGE
+        if tronque:
+            resultats = resultats[:self.TAILLE_PAGE]
         
         self.rafraichir_liste_etudiants(resultats)
+        
+        if tronque and hasattr(self, 'liste_frame'):
+            self.liste_frame.configure(
+                label_text=f"{self.TAILLE_PAGE} premiers résultats (résultats tronqués, "
+                           "précisez la recherche)"
+            )
     
     def afficher_page_notes(self):
         """Page de gestion des notes"""
@@ -651,6 +715,184 @@ class ApplicationModerne:
         except ValueError as e:
             messagebox.showerror("Erreur", str(e))
     
+    def afficher_page_saisie_classe(self):
+        """Page de saisie des notes de toute une promotion dans une matière"""
+        self.clear_content()
+        
+        titre = ctk.CTkLabel(
+            self.content_frame,
+            text="🗂️ Saisie des Notes d'une Classe",
+            font=ctk.CTkFont(size=28, weight="bold")
+        )
+        titre.pack(pady=20)
+        
+        promotions = self.db.obtenir_promotions()
+        if not promotions:
+            msg = ctk.CTkLabel(
+                self.content_frame,
+                text="⚠️ Aucune promotion: ajoutez d'abord des étudiants\ndans la page 'Étudiants'",
+                font=ctk.CTkFont(size=16),
+                text_color=("#e74c3c", "#c0392b")
+            )
+            msg.pack(pady=50)
+            return
+        
+        # Choix de la promotion, de la matière et de la date
+        form_frame = ctk.CTkFrame(self.content_frame)
+        form_frame.pack(fill="x", padx=20, pady=10)
+        
+        inputs_frame = ctk.CTkFrame(form_frame, fg_color="transparent")
+        inputs_frame.pack(pady=15)
+        
+        self.saisie_promotion = ctk.CTkOptionMenu(
+            inputs_frame,
+            values=promotions,
+            command=lambda _: self.afficher_grille_saisie(),
+            width=120
+        )
+        self.saisie_promotion.pack(side="left", padx=5)
+        
+        self.saisie_matiere = ctk.CTkComboBox(
+            inputs_frame,
+            values=self.db.obtenir_matieres(),
+            width=250
+        )
+        self.saisie_matiere.set("")
+        self.saisie_matiere.pack(side="left", padx=5)
+        
+        self.saisie_date = ctk.CTkEntry(
+            inputs_frame,
+            placeholder_text="Date (AAAA-MM-JJ, optionnelle)",
+            width=220
+        )
+        self.saisie_date.pack(side="left", padx=5)
+        
+        btn_enregistrer = ctk.CTkButton(
+            inputs_frame,
+            text="💾 Enregistrer les notes",
+            command=self.enregistrer_notes_classe,
+            fg_color=("#2ecc71", "#27ae60"),
+            width=180
+        )
+        btn_enregistrer.pack(side="left", padx=5)
+        
+        self.grille_saisie = ctk.CTkScrollableFrame(self.content_frame, label_text="👥")
+        self.grille_saisie.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        self.afficher_grille_saisie()
+    
+    def afficher_grille_saisie(self):
+        """Affiche une ligne (étudiant, case de note) par étudiant de la promotion choisie"""
+        for widget in self.grille_saisie.winfo_children():
+            widget.destroy()
+        
+        promotion = self.saisie_promotion.get()
+        etudiants = self.db.obtenir_etudiants_par_promotion(promotion, prefetch=False)
+        self.grille_saisie.configure(label_text=f"👥 {promotion} - {len(etudiants)} étudiant(s)")
+        
+        if len(etudiants) > self.TAILLE_SAISIE_CLASSE:
+            avertissement = ctk.CTkLabel(
+                self.grille_saisie,
+                text=f"⚠️ Seuls les {self.TAILLE_SAISIE_CLASSE} premiers étudiants sont affichés",
+                text_color=("#e67e22", "#d35400")
+            )
+            avertissement.grid(row=0, column=0, columnspan=3, pady=5)
+            etudiants = etudiants[:self.TAILLE_SAISIE_CLASSE]
+        
+        # (étudiant, case de saisie, libellé du motif de refus)
+        self.lignes_saisie = []
+        for ligne, etudiant in enumerate(etudiants, start=1):
+            nom_label = ctk.CTkLabel(
+                self.grille_saisie,
+                text=f"{etudiant.nom} {etudiant.prenom}",
+                anchor="w",
+                width=300
+            )
+            nom_label.grid(row=ligne, column=0, padx=10, pady=3, sticky="w")
+            
+            note_entry = ctk.CTkEntry(self.grille_saisie, placeholder_text="Note", width=80)
+            note_entry.grid(row=ligne, column=1, padx=10, pady=3)
+            note_entry.bind("<Return>", lambda _: self.enregistrer_notes_classe())
+            
+            motif_label = ctk.CTkLabel(
+                self.grille_saisie,
+                text="",
+                text_color=("#e74c3c", "#c0392b"),
+                anchor="w"
+            )
+            motif_label.grid(row=ligne, column=2, padx=10, pady=3, sticky="w")
+            
+            self.lignes_saisie.append((etudiant, note_entry, motif_label))
+    
+    def enregistrer_notes_classe(self):
+        """Enregistre en un lot les notes saisies dans la grille
+        
+        Les cases vides sont ignorées. Les notes enregistrées sont effacées de
+        la grille; les refusées y restent, encadrées en rouge avec leur motif.
+        """
+        matiere = self.saisie_matiere.get().strip()
+        if not matiere:
+            messagebox.showwarning("Attention", "La matière est obligatoire!")
+            return
+        
+        date_ajout = self.saisie_date.get().strip() or None
+        if date_ajout:
+            try:
+                date_ajout = texte_date(date_ajout)
+            except ValueError:
+                messagebox.showerror("Erreur", "Date invalide (format attendu: AAAA-MM-JJ)")
+                return
+        
+        lignes = []  # (etudiant_id, matiere, note) envoyées à la base
+        saisies = []  # ligne de la grille correspondant à chacune
+        refus = []
+        for etudiant, note_entry, motif_label in self.lignes_saisie:
+            texte = note_entry.get().strip()
+            note_entry.configure(border_color=ctk.ThemeManager.theme["CTkEntry"]["border_color"])
+            motif_label.configure(text="")
+            if not texte:
+                continue
+            try:
+                note = float(texte.replace(",", "."))
+            except ValueError:
+                refus.append((note_entry, motif_label, "La note doit être un nombre"))
+                continue
+            lignes.append((etudiant.id, matiere, note))
+            saisies.append((note_entry, motif_label))
+        
+        if not lignes and not refus:
+            messagebox.showwarning("Attention", "Aucune note saisie!")
+            return
+        
+        try:
+            nombre, refus_base = self.db.ajouter_notes_lot(lignes, date_ajout=date_ajout)
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de l'enregistrement: {str(e)}")
+            return
+        
+        refusees = set()
+        for index, motif in refus_base:
+            refusees.add(index)
+            refus.append((*saisies[index], motif))
+        for index, (note_entry, _) in enumerate(saisies):
+            if index not in refusees:
+                note_entry.delete(0, "end")
+        for note_entry, motif_label, motif in refus:
+            note_entry.configure(border_color=("#e74c3c", "#c0392b"))
+            motif_label.configure(text=motif)
+        
+        if refus:
+            messagebox.showwarning(
+                "Attention",
+                f"{nombre} note(s) enregistrée(s) en {matiere}, {len(refus)} refusée(s) (en rouge)"
+            )
+        else:
+            messagebox.showinfo("Succès", f"{nombre} note(s) enregistrée(s) en {matiere}")
+        
+        # Les notes de l'étudiant sélectionné ont pu changer
+        if self.etudiant_courant:
+            self.etudiant_courant = self.db.obtenir_etudiant(self.etudiant_courant.id)
+    
     def afficher_page_statistiques(self):
         """Page des statistiques"""
         self.clear_content()
@@ -666,15 +908,13 @@ class ApplicationModerne:
         cards_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
         cards_frame.pack(fill="x", padx=20, pady=10)
         
-        etudiants = self.db.obtenir_tous_etudiants()
-        reussis, total, taux = taux_reussite(etudiants)
-        mentions = repartition_mentions(etudiants)
+        moyennes, (reussis, total, taux), mentions = self.calculer_statistiques()
         
         # Card 1: Nombre total
         self.create_stat_card(
             cards_frame,
             "👥 Total Étudiants",
-            str(len(etudiants)),
+            str(len(moyennes)),
             "#3498db"
         ).pack(side="left", fill="both", expand=True, padx=5)
         
@@ -687,8 +927,8 @@ class ApplicationModerne:
         ).pack(side="left", fill="both", expand=True, padx=5)
         
         # Card 3: Moyenne générale
-        if etudiants:
-            moy_gen = sum(e.moyenne_generale() for e in etudiants) / len(etudiants)
+        if moyennes:
+            moy_gen = sum(moyennes.values()) / len(moyennes)
             self.create_stat_card(
                 cards_frame,
                 "📈 Moyenne Générale",
@@ -703,7 +943,7 @@ class ApplicationModerne:
         # Répartition des mentions
         mentions_text = "🏆 RÉPARTITION DES MENTIONS\n" + "="*50 + "\n\n"
         for mention, count in mentions.items():
-            pct = (count / len(etudiants) * 100) if etudiants else 0
+            pct = (count / len(moyennes) * 100) if moyennes else 0
             mentions_text += f"{mention}: {count} ({pct:.1f}%)\n"
         
         mentions_label = ctk.CTkLabel(
@@ -715,6 +955,30 @@ class ApplicationModerne:
         )
         mentions_label.pack(fill="x", padx=10, pady=10)
     
+    def calculer_statistiques(self):
+        """Moyennes, taux de réussite et mentions, recalculés seulement si
+        les données ont changé depuis le dernier affichage
+        
+        Les moyennes sont lues une seule fois en SQL (aucun objet Etudiant
+        n'est chargé); taux de réussite et mentions en sont déduits.
+        """
+        jeton = self.db.version_donnees()
+        if self.cache_statistiques[0] != jeton:
+            moyennes = self.db.obtenir_moyennes()
+            
+            total = len(moyennes)
+            reussis = sum(1 for moyenne in moyennes.values() if moyenne >= 10)
+            taux = (reussis / total) * 100 if total else 0
+            
+            mentions = dict.fromkeys(
+                ("Très Bien", "Bien", "Assez Bien", "Passable", "Insuffisant"), 0
+            )
+            for moyenne in moyennes.values():
+                mentions[mention_pour(moyenne)] += 1
+            
+            self.cache_statistiques = (jeton, (moyennes, (reussis, total, taux), mentions))
+        return self.cache_statistiques[1]
+    
     def create_stat_card(self, parent, titre, valeur, couleur):
         """Crée une card de statistique"""
         card = ctk.CTkFrame(parent, fg_color=(couleur, couleur), corner_radius=15)
@@ -784,29 +1048,29 @@ class ApplicationModerne:
     def afficher_graph_mentions(self):
         """Affiche le graphique des mentions"""
         self.clear_graph_frame()
-        etudiants = self.db.obtenir_tous_etudiants()
-        if etudiants:
+        etudiants = TableauEtudiants.depuis_base(self.db)
+        if len(etudiants):
             Graphiques.graphique_mentions(etudiants, self.graph_frame)
     
     def afficher_graph_promos(self):
         """Affiche le graphique des moyennes par promotion"""
         self.clear_graph_frame()
-        etudiants = self.db.obtenir_tous_etudiants()
-        if etudiants:
+        etudiants = TableauEtudiants.depuis_base(self.db)
+        if len(etudiants):
             Graphiques.graphique_moyennes_par_promotion(etudiants, self.graph_frame)
     
     def afficher_graph_distribution(self):
         """Affiche la distribution des moyennes"""
         self.clear_graph_frame()
-        etudiants = self.db.obtenir_tous_etudiants()
-        if etudiants:
+        etudiants = TableauEtudiants.depuis_base(self.db)
+        if len(etudiants):
             Graphiques.graphique_distribution_moyennes(etudiants, self.graph_frame)
     
     def afficher_graph_top10(self):
         """Affiche le top 10"""
         self.clear_graph_frame()
-        etudiants = self.db.obtenir_tous_etudiants()
-        if etudiants:
+        etudiants = TableauEtudiants.depuis_base(self.db)
+        if len(etudiants):
             Graphiques.graphique_top_etudiants(etudiants, 10, self.graph_frame)
     
     def clear_graph_frame(self):
@@ -838,18 +1102,100 @@ class ApplicationModerne:
         ctk.set_appearance_mode(mode)
     
     def faire_backup(self):
-        """Fait un backup de la base"""
+        """Fait un backup de la base
+        
+        Sauvegarde SQLite native (éventuellement compressée), faite en
+        arrière-plan; le format JSON reste proposé pour l'échange de données.
+        """
         fichier = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON", "*.json")]
+            defaultextension=".db",
+            filetypes=[
+                ("Sauvegarde SQLite", "*.db"),
+                ("Sauvegarde compressée", "*.gz *.xz"),
+                ("JSON (échange)", "*.json")
+            ]
         )
         
-        if fichier:
+        if not fichier:
+            return
+        
+        if fichier.lower().endswith(".json"):
             try:
                 self.db.exporter_vers_json(fichier)
-                messagebox.showinfo("Succès", f"Backup sauvegardé: {fichier}")
+                messagebox.showinfo("Succès", f"Export JSON sauvegardé: {fichier}")
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Erreur lors de l'export: {str(e)}")
+            return
+        
+        self.lancer_en_arriere_plan(
+            lambda progression: self.db.sauvegarder(fichier, progression=progression),
+            f"Backup sauvegardé: {fichier}",
+            "Erreur lors du backup"
+        )
+    
+    def restaurer_backup(self):
+        """Remplace la base par un backup SQLite (.db, .gz ou .xz)"""
+        fichier = filedialog.askopenfilename(
+            filetypes=[("Sauvegarde SQLite", "*.db *.gz *.xz")]
+        )
+        
+        if not fichier:
+            return
+        
+        if not messagebox.askyesno(
+            "Confirmation",
+            "Toutes les données actuelles seront remplacées par celles du backup. Continuer?"
+        ):
+            return
+        
+        def apres_restauration():
+            self.etudiant_courant = None
+            self.afficher_page_etudiants()
+        
+        self.lancer_en_arriere_plan(
+            lambda progression: self.db.restaurer(fichier, progression=progression),
+            f"Backup restauré: {fichier}",
+            "Erreur lors de la restauration",
+            apres=apres_restauration
+        )
+    
+    def lancer_en_arriere_plan(self, tache, message_succes, message_erreur, apres=None):
+        """Exécute une sauvegarde ou une restauration sans bloquer l'interface
+        
+        `tache` reçoit une fonction progression(pages copiées, pages totales);
+        l'avancement est affiché sur le bouton Backup.
+        """
+        etat = {'copiees': 0, 'totales': 0, 'fini': False, 'erreur': None}
+        
+        def progression(copiees, totales):
+            etat['copiees'], etat['totales'] = copiees, totales
+        
+        def executer():
+            try:
+                tache(progression)
             except Exception as e:
-                messagebox.showerror("Erreur", f"Erreur lors du backup: {str(e)}")
+                etat['erreur'] = e
+            etat['fini'] = True
+        
+        def surveiller():
+            if not etat['fini']:
+                if etat['totales']:
+                    pourcentage = etat['copiees'] * 100 // etat['totales']
+                    self.btn_backup.configure(text=f"💾 Backup... {pourcentage}%")
+                self.root.after(100, surveiller)
+                return
+            
+            self.btn_backup.configure(text="💾 Backup", state="normal")
+            if etat['erreur'] is not None:
+                messagebox.showerror("Erreur", f"{message_erreur}: {str(etat['erreur'])}")
+            else:
+                messagebox.showinfo("Succès", message_succes)
+                if apres:
+                    apres()
+        
+        self.btn_backup.configure(state="disabled")
+        threading.Thread(target=executer, daemon=True).start()
+        surveiller()
     
     def run(self):
         """Lance l'application"""
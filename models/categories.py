@@ -0,0 +1,82 @@
+"""Registres des matières et des promotions
+
+Chaque libellé normalisé (matière: "Mathématiques", promotion: "L1") reçoit
+un petit code entier, attribué à sa première demande et stable pendant
+toute la durée du programme. Le registre garde aussi la forme normalisée
+de chaque saisie déjà vue: normaliser(" physique ") ne refait pas
+strip().capitalize() et renvoie toujours la même instance de chaîne,
+partagée par tous les étudiants. normaliser() seul n'attribue pas de code:
+un filtre sur une promotion inconnue ne remplit pas le registre.
+
+La base enregistre au démarrage les libellés qu'elle contient (voir
+Database.charger_categories).
+
+Exemple:
+    from models.categories import MATIERES
+    
+    MATIERES.normaliser("physique ")  # "Physique"
+    code = MATIERES.code("Physique")
+    MATIERES.nom(code)  # "Physique"
+"""
+
+import sys
+import threading
+
+
+class Categories:
+    """Registre libellé normalisé <-> code entier"""
+    
+    # Au-delà, le cache des saisies brutes est vidé (saisies libres de l'interface)
+    TAILLE_MAX_SAISIES = 10_000
+    
+    def __init__(self, normalisation):
+        self._normalisation = normalisation
+        self._noms = []  # code -> libellé normalisé
+        self._codes = {}  # libellé normalisé -> code
+        self._saisies = {}  # saisie brute -> libellé normalisé (même instance)
+        self._verrou = threading.Lock()
+    
+    def normaliser(self, valeur):
+        """Retourne le libellé normalisé, toujours la même instance"""
+        nom = self._saisies.get(valeur)
+        if nom is None:
+            nom = sys.intern(self._normalisation(valeur))
+            if len(self._saisies) >= self.TAILLE_MAX_SAISIES:
+                self._saisies.clear()
+            self._saisies[valeur] = nom
+        return nom
+    
+    def code(self, valeur):
+        """Code entier d'un libellé (normalisé et enregistré au besoin)"""
+        nom = self.normaliser(valeur)
+        code = self._codes.get(nom)
+        if code is None:
+            with self._verrou:
+                code = self._codes.get(nom)
+                if code is None:
+                    self._noms.append(nom)
+                    code = self._codes[nom] = len(self._noms) - 1
+        return code
+    
+    def nom(self, code):
+        """Libellé normalisé d'un code"""
+        return self._noms[code]
+    
+    def noms(self):
+        """Libellés enregistrés, indexés par leur code"""
+        return tuple(self._noms)
+    
+    def charger(self, noms):
+        """Enregistre des libellés (par exemple ceux lus en base)"""
+        for nom in noms:
+            self.code(nom)
+    
+    def __len__(self):
+        return len(self._noms)
+    
+    def __contains__(self, valeur):
+        return self.normaliser(valeur) in self._codes
+
+
+MATIERES = Categories(lambda matiere: matiere.strip().capitalize())
+PROMOTIONS = Categories(lambda promotion: promotion.strip().upper())
@@ -1,101 +1,313 @@
+import math
+import numbers
+from array import array
 from datetime import datetime
+from types import MappingProxyType
+
+from models.categories import MATIERES, PROMOTIONS
+
+def mention_pour(moyenne):
+    """Retourne la mention correspondant à une moyenne"""
+    match moyenne:
+        case m if m >= 16:
+            return "Très Bien"
+        case m if m >= 14:
+            return "Bien"
+        case m if m >= 12:
+            return "Assez Bien"
+        case m if m >= 10:
+            return "Passable"
+        case _:
+            return "Insuffisant"
+
+def verifier_note(note):
+    """Vérifie qu'une note est un nombre entre 0 et 20
+    
+    Raises:
+        ValueError: Avec le motif du refus
+    """
+    if not isinstance(note, numbers.Real) or isinstance(note, bool) or math.isnan(note):
+        raise ValueError("La note doit être un nombre")
+    
+    if not 0 <= note <= 20:
+        raise ValueError("La note doit être entre 0 et 20")
+
+# Coefficients de promotion par défaut, partagés tant qu'aucun n'est chargé
+_AUCUN_COEFFICIENT = MappingProxyType({})
 
 class Etudiant:
-    """Classe représentant un étudiant avec ses informations et ses notes"""
+    """Classe représentant un étudiant avec ses informations et ses notes
+    
+    Les notes et coefficients peuvent être chargés à la demande: `chargeur`
+    est alors appelé (avec l'étudiant) au premier accès à notes, notes_ids
+    ou coefficients, et doit les remplir. D'ici là, `moyenne` (si connue)
+    sert à moyenne_generale et get_mention.
+    
+    `coefficients` ne contient que les coefficients propres à l'étudiant; ceux
+    de sa promotion sont dans `coefficients_promotion` (dictionnaire partagé
+    entre les étudiants de la promotion, à ne pas modifier).
+    
+    Pour limiter la mémoire, les notes d'une matière sont un array('d') (pas un
+    float Python par note), leurs id un array('q') (0 si inconnu). Matières et
+    promotions passent par les registres de models.categories: la
+    normalisation d'une saisie déjà vue est une simple recherche, et chaque
+    libellé est une instance unique partagée par tous les étudiants. `notes`
+    et `notes_ids` acceptent des listes en affectation (affecter `notes` remet
+    les id à 0: affecter `notes_ids` ensuite); to_dict() renvoie des listes.
+    
+    La somme des notes de chaque matière est tenue à jour, et les moyennes
+    générale et pondérée sont gardées en cache jusqu'à la prochaine
+    modification: lire une moyenne ne parcourt jamais les notes. Les notes
+    se modifient donc par les méthodes (ajouter_note, modifier_note...), pas
+    en changeant directement les tableaux de `notes`.
+    """
     
-    def __init__(self, id_, nom, prenom, promotion, email="", photo_path=""):
+    __slots__ = (
+        "id", "nom", "prenom", "promotion", "email", "photo_path",
+        "_notes", "_notes_ids", "_coefficients", "_coefficients_promotion",
+        "_sommes", "chargeur", "_moyenne", "_moyenne_ponderee",
+    )
+    
+    def __init__(self, id_, nom, prenom, promotion, email="", photo_path="",
+                 chargeur=None, moyenne=None):
         self.id = id_
         self.nom = nom.strip().upper()
         self.prenom = prenom.strip().capitalize()
-        self.promotion = promotion.strip().upper()
+        self.promotion = PROMOTIONS.normaliser(promotion)
         self.email = email.strip().lower()
         self.photo_path = photo_path
-        self.notes = {}  # {matiere: [notes]}
-        self.coefficients = {}  # {matiere: coefficient}
+        self._notes = {}  # {matiere: array('d') des notes}
+        self._notes_ids = {}  # {matiere: array('q') des id en base}, parallèle à notes
+        self._coefficients = None  # {matiere: coefficient}, créé au besoin
+        self._coefficients_promotion = _AUCUN_COEFFICIENT  # {matiere: coefficient}, partagé
+        self._sommes = {}  # {matiere: somme des notes}
+        self.chargeur = chargeur  # None une fois notes et coefficients chargés
+        self._moyenne = moyenne  # Moyenne générale en cache (None: à calculer)
+        self._moyenne_ponderee = None
+    
+    def _charger(self):
+        """Appelle le chargeur différé, une seule fois"""
+        if self.chargeur is not None:
+            chargeur, self.chargeur = self.chargeur, None
+            chargeur(self)
+            self._invalider_moyennes()
+    
+    def _invalider_moyennes(self):
+        """Oublie les moyennes en cache après une modification"""
+        self._moyenne = None
+        self._moyenne_ponderee = None
+    
+    @property
+    def details_charges(self):
+        """Indique si les notes et coefficients sont chargés"""
+        return self.chargeur is None
+    
+    @property
+    def notes(self):
+        self._charger()
+        return self._notes
+    
+    @notes.setter
+    def notes(self, notes):
+        self._notes = {MATIERES.normaliser(m): array("d", n) for m, n in notes.items()}
+        # Les anciens id ne correspondent plus à ces notes: id inconnus (0),
+        # à redéfinir au besoin par notes_ids
+        self._notes_ids = {m: array("q", bytes(8 * len(n))) for m, n in self._notes.items()}
+        self._sommes = {m: sum(n) for m, n in self._notes.items()}
+        self._invalider_moyennes()
+    
+    @property
+    def notes_ids(self):
+        self._charger()
+        return self._notes_ids
+    
+    @notes_ids.setter
+    def notes_ids(self, notes_ids):
+        self._notes_ids = {
+            MATIERES.normaliser(m): array("q", (i or 0 for i in ids)) for m, ids in notes_ids.items()
+        }
     
-    def ajouter_note(self, matiere, note):
+    @property
+    def coefficients(self):
+        self._charger()
+        if self._coefficients is None:
+            self._coefficients = {}
+        return self._coefficients
+    
+    @coefficients.setter
+    def coefficients(self, coefficients):
+        self._coefficients = coefficients
+        self._moyenne_ponderee = None
+    
+    @property
+    def coefficients_promotion(self):
+        self._charger()
+        return self._coefficients_promotion
+    
+    @coefficients_promotion.setter
+    def coefficients_promotion(self, coefficients):
+        self._coefficients_promotion = coefficients
+        self._moyenne_ponderee = None
+    
+    def ajouter_note(self, matiere, note, note_id=None):
         """Ajoute une note pour une matière donnée"""
-        if not isinstance(note, (int, float)):
-            raise ValueError("La note doit être un nombre")
+        verifier_note(note)
+        self._charger()
+        self.charger_note(MATIERES.normaliser(matiere), note, note_id)
+    
+    def ajouter_notes(self, notes):
+        """Ajoute plusieurs notes d'un coup
         
-        if not 0 <= note <= 20:
-            raise ValueError("La note doit être entre 0 et 20")
+        Toutes les lignes sont vérifiées avant le premier ajout: si l'une
+        est invalide, aucune note n'est ajoutée.
         
-        matiere = matiere.strip().capitalize()
-        self.notes.setdefault(matiere, []).append(float(note))
+        Args:
+            notes: Séquence de (matiere, note) ou (matiere, note, note_id),
+                par exemple zip(matieres, tableau_de_notes)
+        
+        Raises:
+            ValueError: Liste des lignes refusées et de leur motif
+        """
+        lignes = []
+        erreurs = []
+        for index, ligne in enumerate(notes):
+            try:
+                try:
+                    matiere, note, *note_id = ligne
+                    if len(note_id) > 1:
+                        raise ValueError
+                except (TypeError, ValueError):
+                    raise ValueError("ligne attendue: (matiere, note[, note_id])") from None
+                if not isinstance(matiere, str) or not matiere.strip():
+                    raise ValueError("La matière est obligatoire")
+                verifier_note(note)
+            except (TypeError, ValueError) as e:
+                erreurs.append(f"ligne {index}: {e}")
+                continue
+            lignes.append((MATIERES.normaliser(matiere), float(note), note_id[0] if note_id else None))
+        
+        if erreurs:
+            raise ValueError("Notes invalides:\n" + "\n".join(erreurs))
+        
+        self._charger()
+        for matiere, note, note_id in lignes:
+            self.charger_note(matiere, note, note_id)
+    
+    def charger_note(self, matiere, note, note_id=None):
+        """Ajoute une note déjà validée (lue en base), sans contrôle ni
+        normalisation du nom de matière"""
+        notes = self._notes.get(matiere)
+        if notes is None:
+            matiere = MATIERES.normaliser(matiere)
+            notes = self._notes[matiere] = array("d")
+            self._notes_ids[matiere] = array("q")
+            self._sommes[matiere] = 0.0
+        notes.append(note)
+        self._notes_ids[matiere].append(note_id or 0)
+        self._sommes[matiere] += note
+        self._moyenne = self._moyenne_ponderee = None
     
     def set_coefficient(self, matiere, coefficient):
         """Définit le coefficient d'une matière"""
-        matiere = matiere.strip().capitalize()
+        matiere = MATIERES.normaliser(matiere)
         if coefficient <= 0:
             raise ValueError("Le coefficient doit être positif")
         self.coefficients[matiere] = coefficient
+        self._moyenne_ponderee = None
     
     def supprimer_note(self, matiere, index):
         """Supprime une note à l'index donné pour une matière"""
-        matiere = matiere.strip().capitalize()
-        if matiere in self.notes and 0 <= index < len(self.notes[matiere]):
-            del self.notes[matiere][index]
-            if not self.notes[matiere]:
-                del self.notes[matiere]
+        matiere = MATIERES.normaliser(matiere)
+        notes = self.notes.get(matiere)
+        if notes is not None and 0 <= index < len(notes):
+            notes.pop(index)
+            # Somme recalculée (comme sum() au chargement): soustraire la
+            # note accumulerait des erreurs d'arrondi
+            self._sommes[matiere] = sum(notes)
+            if matiere in self._notes_ids:
+                del self._notes_ids[matiere][index]
+            if not notes:
+                del self._notes[matiere], self._sommes[matiere]
+                self._notes_ids.pop(matiere, None)
+            self._invalider_moyennes()
             return True
         return False
     
+    def id_note(self, matiere, index):
+        """Retourne l'identifiant en base d'une note (None si inconnu)"""
+        matiere = MATIERES.normaliser(matiere)
+        ids = self.notes_ids.get(matiere, ())
+        return ids[index] or None if 0 <= index < len(ids) else None
+    
     def modifier_note(self, matiere, index, nouvelle_note):
         """Modifie une note existante"""
-        if not 0 <= nouvelle_note <= 20:
-            raise ValueError("La note doit être entre 0 et 20")
+        verifier_note(nouvelle_note)
         
-        matiere = matiere.strip().capitalize()
-        if matiere in self.notes and 0 <= index < len(self.notes[matiere]):
-            self.notes[matiere][index] = float(nouvelle_note)
+        matiere = MATIERES.normaliser(matiere)
+        notes = self.notes.get(matiere)
+        if notes is not None and 0 <= index < len(notes):
+            notes[index] = nouvelle_note
+            self._sommes[matiere] = sum(notes)
+            self._invalider_moyennes()
             return True
         return False
     
     def moyenne_matiere(self, matiere):
         """Calcule la moyenne d'une matière"""
-        matiere = matiere.strip().capitalize()
-        notes = self.notes.get(matiere, [])
-        return sum(notes) / len(notes) if notes else 0
+        matiere = MATIERES.normaliser(matiere)
+        notes = self.notes.get(matiere)
+        return self._sommes[matiere] / len(notes) if notes else 0
+    
+    def _moyennes_matieres(self):
+        """Moyenne de chaque matière, à partir des sommes tenues à jour"""
+        self._charger()
+        notes = self._notes
+        return {matiere: somme / len(notes[matiere]) for matiere, somme in self._sommes.items()}
     
     def moyenne_generale(self):
         """Calcule la moyenne générale de toutes les matières"""
-        if not self.notes:
-            return 0
-        
-        moyennes = [self.moyenne_matiere(mat) for mat in self.notes.keys()]
-        return sum(moyennes) / len(moyennes) if moyennes else 0
+        if self._moyenne is None:
+            moyennes = self._moyennes_matieres()
+            self._moyenne = sum(moyennes.values()) / len(moyennes) if moyennes else 0
+        return self._moyenne
+    
+    def coefficient(self, matiere):
+        """Retourne le coefficient d'une matière: celui de l'étudiant s'il est
+        défini, sinon celui de sa promotion, sinon 1"""
+        matiere = MATIERES.normaliser(matiere)
+        coef = self.coefficients.get(matiere)
+        if coef is None:
+            coef = self.coefficients_promotion.get(matiere, 1)
+        return coef
+    
+    def coefficients_effectifs(self):
+        """Retourne les coefficients de la promotion, complétés et remplacés
+        par ceux de l'étudiant"""
+        return {**self.coefficients_promotion, **self.coefficients}
     
     def moyenne_generale_ponderee(self):
         """Calcule la moyenne générale pondérée par les coefficients"""
-        if not self.notes:
-            return 0
-        
-        total = 0
-        coef_total = 0
-        
-        for matiere in self.notes.keys():
-            coef = self.coefficients.get(matiere, 1)
-            total += self.moyenne_matiere(matiere) * coef
-            coef_total += coef
-        
-        return total / coef_total if coef_total > 0 else 0
+        if self._moyenne_ponderee is None:
+            # Coefficients lus après le chargement différé
+            self._charger()
+            propres = self._coefficients or {}
+            promotion = self._coefficients_promotion
+            total = 0
+            coef_total = 0
+            
+            for matiere, moyenne in self._moyennes_matieres().items():
+                coef = propres.get(matiere)
+                if coef is None:
+                    coef = promotion.get(matiere, 1)
+                total += moyenne * coef
+                coef_total += coef
+            
+            self._moyenne_ponderee = total / coef_total if coef_total > 0 else 0
+        return self._moyenne_ponderee
     
     def get_mention(self):
         """Retourne la mention en fonction de la moyenne générale"""
-        moy = self.moyenne_generale()
-        
-        match moy:
-            case m if m >= 16:
-                return "Très Bien"
-            case m if m >= 14:
-                return "Bien"
-            case m if m >= 12:
-                return "Assez Bien"
-            case m if m >= 10:
-                return "Passable"
-            case _:
-                return "Insuffisant"
+        return mention_pour(self.moyenne_generale())
     
     def nombre_matieres(self):
         """Retourne le nombre de matières"""
@@ -114,8 +326,9 @@ class Etudiant:
             "promotion": self.promotion,
             "email": self.email,
             "photo_path": self.photo_path,
-            "notes": self.notes,
-            "coefficients": self.coefficients
+            "notes": {matiere: notes.tolist() for matiere, notes in self.notes.items()},
+            "coefficients": self.coefficients_effectifs(),
+            "coefficients_promotion": dict(self.coefficients_promotion)
         }
     
     def __str__(self):
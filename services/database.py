@@ -1,27 +1,207 @@
 import sqlite3
+import gzip
 import json
+import lzma
+import numbers
 import os
-from datetime import datetime
-from models.etudiant import Etudiant
+import queue
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from functools import partial, wraps
+from models.categories import MATIERES, PROMOTIONS
+from models.etudiant import Etudiant, mention_pour, verifier_note
+
+
+def _lecture(methode):
+    """Décorateur: exécute la méthode dans un bloc Database.lecture()"""
+    @wraps(methode)
+    def enveloppe(self, *args, **kwargs):
+        with self.lecture():
+            return methode(self, *args, **kwargs)
+    return enveloppe
+
+
+def _ecriture(methode):
+    """Décorateur: exécute la méthode sur la connexion d'écriture, verrou pris"""
+    @wraps(methode)
+    def enveloppe(self, *args, **kwargs):
+        with self._acces_ecriture():
+            return methode(self, *args, **kwargs)
+    return enveloppe
+
 
 class Database:
-    """Gestionnaire de base de données SQLite pour les étudiants"""
+    """Gestionnaire de base de données SQLite pour les étudiants
+    
+    Utilisable depuis plusieurs threads: une connexion d'écriture partagée
+    (protégée par un verrou) et un pool de connexions de lecture, en journal
+    WAL pour que les lectures ne soient pas bloquées par les écritures.
+    """
+    
+    # Regroupement des mois ('AAAA-MM') de notes_periodes, voir obtenir_cumuls_periodes
+    PERIODES = {
+        "mois": "mois",
+        "trimestre": "substr(mois, 1, 4) || '-T' || ((CAST(substr(mois, 6, 2) AS INTEGER) + 2) / 3)",
+        "semestre": "substr(mois, 1, 4) || '-S' || ((CAST(substr(mois, 6, 2) AS INTEGER) + 5) / 6)",
+        "annee": "substr(mois, 1, 4)"
+    }
     
-    def __init__(self, db_path="data/etudiants.db"):
-        """Initialise la connexion à la base de données"""
+    # Tables dont les modifications sont comptées (voir version_donnees)
+    TABLES_SUIVIES = ("etudiants", "notes", "coefficients", "coefficients_promotion")
+    
+    # Version du schéma (PRAGMA user_version), voir _migrer
+    VERSION_SCHEMA = 3
+    
+    def __init__(self, db_path="data/etudiants.db", lecteurs=4, timeout=5.0, wal=True,
+                 taille_cache=256):
+        """Initialise la connexion à la base de données
+        
+        Args:
+            db_path: Chemin du fichier SQLite
+            lecteurs: Nombre de connexions de lecture, donc de lectures
+                simultanées
+            timeout: Délai d'attente (en secondes) quand la base est verrouillée
+            wal: Active le journal WAL
+            taille_cache: Nombre maximal d'étudiants gardés en cache par
+                obtenir_etudiant (0 pour désactiver le cache)
+        """
         self.db_path = db_path
+        self.timeout = timeout
         
         # Créer le dossier data s'il n'existe pas
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row  # Pour accéder aux colonnes par nom
+        # Connexion d'écriture, partagée entre les threads
+        self._connexion_ecriture = self._ouvrir_connexion()
+        if wal:
+            self._connexion_ecriture.execute("PRAGMA journal_mode=WAL")
+        self._verrou = threading.RLock()
+        
+        # Pool de connexions de lecture: au plus `lecteurs`, ouvertes au
+        # besoin, empruntées par lecture() et rendues à la fin du bloc
+        self._lecteurs = lecteurs
+        self._connexions_lecture = []
+        self._connexions_libres = queue.LifoQueue()
+        self._verrou_pool = threading.Lock()
+        self._local = threading.local()
+        
+        # Cache des étudiants (identity map), du moins au plus récemment lu
+        self.taille_cache = taille_cache
+        self._cache = OrderedDict()
+        self._verrou_cache = threading.Lock()
+        self._generation_cache = 0
+        self.cache_succes = 0
+        self.cache_echecs = 0
+        
+        self._niveau_transaction = 0
+        self._ids_transaction = set()
+        self._vider_cache_transaction = False
         self.creer_tables()
+        self._data_version = self._lire_data_version()
+        self.charger_categories()
     
+    def _ouvrir_connexion(self):
+        """Ouvre une connexion SQLite configurée"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Pour accéder aux colonnes par nom
+        return conn
+    
+    @property
+    def conn(self):
+        """Connexion à utiliser dans le thread courant
+        
+        La connexion de lecture empruntée par le bloc lecture() en cours,
+        sauf si ce thread est en train d'écrire (il doit voir ses propres
+        modifications); la connexion d'écriture sinon.
+        """
+        local = self._local
+        if getattr(local, 'lectures', 0) and not getattr(local, 'ecritures', 0):
+            return local.connexion
+        return self._connexion_ecriture
+    
+    def _emprunter_lecture(self):
+        """Connexion de lecture libre, ouverte si le pool n'est pas plein;
+        attend qu'une connexion soit rendue sinon"""
+        try:
+            return self._connexions_libres.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._verrou_pool:
+            if len(self._connexions_lecture) < self._lecteurs:
+                connexion = self._ouvrir_connexion()
+                connexion.execute("PRAGMA query_only = ON")
+                self._connexions_lecture.append(connexion)
+                return connexion
+        return self._connexions_libres.get()
+    
+    @contextmanager
+    def lecture(self):
+        """Bloc de lecture sur une connexion empruntée au pool de lecture
+        
+        Toutes les requêtes du bloc voient le même instantané de la base et,
+        en mode WAL, ne sont pas bloquées par les écritures en cours.
+        
+        Exemple:
+            with db.lecture():
+                cursor = db.conn.cursor()
+                ...
+        """
+        local = self._local
+        
+        # Bloc imbriqué, ou écriture en cours dans ce thread
+        if getattr(local, 'lectures', 0) or getattr(local, 'ecritures', 0):
+            local.lectures = getattr(local, 'lectures', 0) + 1
+            try:
+                yield self
+            finally:
+                local.lectures -= 1
+            return
+        
+        connexion = self._emprunter_lecture()
+        try:
+            local.connexion = connexion
+            local.lectures = 1
+            try:
+                connexion.execute("BEGIN")
+                yield self
+            finally:
+                local.lectures = 0
+                local.connexion = None
+                connexion.rollback()
+        finally:
+            self._connexions_libres.put(connexion)
+    
+    @contextmanager
+    def _acces_ecriture(self):
+        """Réserve la connexion d'écriture pour le thread courant"""
+        local = self._local
+        with self._verrou:
+            local.ecritures = getattr(local, 'ecritures', 0) + 1
+            try:
+                yield
+            finally:
+                local.ecritures -= 1
+    
+    @_ecriture
     def creer_tables(self):
-        """Crée les tables si elles n'existent pas"""
+        """Crée les tables si elles n'existent pas
+        
+        Sur une base à jour, rien n'est écrit: ouvrir la base ne modifie pas
+        le schéma (et fonctionne sur un fichier en lecture seule).
+        """
         cursor = self.conn.cursor()
         
+        cursor.execute("PRAGMA user_version")
+        version = cursor.fetchone()[0]
+        if version < self.VERSION_SCHEMA:
+            self._migrer(cursor, version)
+        
         # Table des étudiants
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS etudiants (
@@ -59,30 +239,805 @@ class Database:
             )
         ''')
         
-        # Index pour améliorer les performances
+        # Coefficients par promotion: ceux de la table coefficients, propres
+        # à un étudiant, sont prioritaires
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_notes_etudiant 
-            ON notes(etudiant_id)
+            CREATE TABLE IF NOT EXISTS coefficients_promotion (
+                promotion TEXT NOT NULL,
+                matiere TEXT NOT NULL,
+                coefficient REAL NOT NULL CHECK(coefficient > 0),
+                PRIMARY KEY (promotion, matiere)
+            )
         ''')
         
+        # Index pour améliorer les performances. idx_notes_etudiant, sur
+        # etudiant_id seul, est couvert par idx_notes_etudiant_matiere_date:
+        # il est supprimé des bases existantes
+        cursor.execute("DROP INDEX IF EXISTS idx_notes_etudiant")
+        
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_etudiants_promotion 
             ON etudiants(promotion)
         ''')
         
+        # Notes d'un étudiant dans une matière, dans l'ordre d'ajout. Couvrant
+        # (note incluse): sinon les index par matière lui sont préférés pour
+        # recalculer un couple (étudiant, matière) de notes_agg
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_notes_etudiant_matiere_date
+            ON notes(etudiant_id, matiere, date_ajout, note)
+        ''')
+        
+        # Tri et pagination de la liste des étudiants
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_etudiants_nom_prenom
+            ON etudiants(nom, prenom, id)
+        ''')
+        
+        # Index couvrant pour les statistiques par matière (médianes, tris)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_notes_matiere_note
+            ON notes(matiere, note, etudiant_id)
+        ''')
+        
+        # Index couvrant pour les filtres par période
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_notes_date
+            ON notes(date_ajout, matiere, note, etudiant_id)
+        ''')
+        
+        # Minimum et maximum d'une matière sur un mois (voir _creer_cumuls_periodes)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_notes_matiere_date
+            ON notes(matiere, date_ajout, note, etudiant_id)
+        ''')
+        
+        self._creer_index_recherche(cursor)
+        self._creer_agregats(cursor)
+        self._creer_cumuls_periodes(cursor)
+        self._creer_compteurs_modifications(cursor)
+        
+        if version < self.VERSION_SCHEMA:
+            if version < 1 and self._table_existe(cursor, "notes_agg"):
+                self._remplir_agregats(cursor)
+            cursor.execute(f"PRAGMA user_version = {self.VERSION_SCHEMA}")
+        
         self.conn.commit()
     
+    def _migrer(self, cursor, version):
+        """Supprime les triggers et index définis différemment dans les
+        versions antérieures du schéma, pour qu'ils soient recréés
+        
+        Appelée une seule fois par base, avant les CREATE ... IF NOT EXISTS
+        de creer_tables.
+        """
+        if version < 1:
+            # Triggers de notes_agg qui agrégeaient les notes orphelines
+            for nom in ("notes_agg_ai", "notes_agg_delete", "notes_agg_update"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {nom}")
+        
+        if version < 2:
+            # Triggers de notes_periodes qui recalculaient des groupes entiers
+            for nom in ("notes_periodes_delete", "notes_periodes_update",
+                        "notes_periodes_etudiant_au", "notes_periodes_etudiant_ad"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {nom}")
+            # Index devenu couvrant
+            cursor.execute("DROP INDEX IF EXISTS idx_notes_etudiant_matiere_date")
+        
+        if version < 3:
+            # Index plein texte sans les préfixes de 4 à 6 caractères: recréé
+            # et reconstruit par _creer_index_recherche
+            cursor.execute("DROP TABLE IF EXISTS etudiants_fts")
+    
+    @staticmethod
+    def _table_existe(cursor, nom):
+        """Indique si une table existe"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (nom,))
+        return cursor.fetchone() is not None
+    
+    def _creer_index_recherche(self, cursor):
+        """Crée l'index plein texte (FTS5) sur nom, prénom, promotion et email
+        
+        L'index ne stocke pas de copie des données (content='etudiants') et
+        est tenu à jour par des triggers. Les accents sont ignorés. Les
+        préfixes de 1 à 6 caractères ont leur propre index: pendant la
+        saisie, un préfixe commun à toute la base reste une lecture directe.
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'etudiants_fts'"
+        )
+        existait = cursor.fetchone() is not None
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS etudiants_fts USING fts5(
+                    nom, prenom, promotion, email,
+                    content='etudiants',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='1 2 3 4 5 6'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            # SQLite compilé sans FTS5: on garde la recherche LIKE
+            self.fts_disponible = False
+            return
+        
+        self.fts_disponible = True
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS etudiants_fts_ai AFTER INSERT ON etudiants BEGIN
+                INSERT INTO etudiants_fts (rowid, nom, prenom, promotion, email)
+                VALUES (new.id, new.nom, new.prenom, new.promotion, new.email);
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS etudiants_fts_ad AFTER DELETE ON etudiants BEGIN
+                INSERT INTO etudiants_fts (etudiants_fts, rowid, nom, prenom, promotion, email)
+                VALUES ('delete', old.id, old.nom, old.prenom, old.promotion, old.email);
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS etudiants_fts_au AFTER UPDATE ON etudiants BEGIN
+                INSERT INTO etudiants_fts (etudiants_fts, rowid, nom, prenom, promotion, email)
+                VALUES ('delete', old.id, old.nom, old.prenom, old.promotion, old.email);
+                INSERT INTO etudiants_fts (rowid, nom, prenom, promotion, email)
+                VALUES (new.id, new.nom, new.prenom, new.promotion, new.email);
+            END
+        ''')
+        
+        # Base existante: indexer les étudiants déjà présents
+        if not existait:
+            cursor.execute("INSERT INTO etudiants_fts (etudiants_fts) VALUES ('rebuild')")
+    
+    @contextmanager
+    def transaction(self):
+        """Regroupe plusieurs écritures dans une seule transaction
+        
+        Les méthodes d'écriture ne valident plus individuellement à
+        l'intérieur du bloc: tout est validé à la sortie, ou annulé si une
+        exception est levée. Les blocs imbriqués utilisent des SAVEPOINT,
+        un échec interne n'annule donc que sa propre portion. Les écritures
+        des autres threads attendent la fin du bloc.
+        
+        Exemple:
+            with db.transaction():
+                for etudiant_id, note in resultats:
+                    db.ajouter_note(etudiant_id, "Mathématiques", note)
+        """
+        with self._acces_ecriture():
+            niveau = self._niveau_transaction
+            savepoint = f"sp_{niveau}"
+            
+            if niveau == 0:
+                if not self.conn.in_transaction:
+                    self.conn.execute("BEGIN")
+            else:
+                self.conn.execute(f"SAVEPOINT {savepoint}")
+            
+            self._niveau_transaction += 1
+            try:
+                yield self
+            except BaseException:
+                self._niveau_transaction -= 1
+                if niveau == 0:
+                    self.conn.rollback()
+                    self._fin_transaction()
+                else:
+                    self.conn.execute(f"ROLLBACK TO {savepoint}")
+                    self.conn.execute(f"RELEASE {savepoint}")
+                raise
+            
+            self._niveau_transaction -= 1
+            if niveau == 0:
+                self.conn.commit()
+                self._fin_transaction()
+            else:
+                self.conn.execute(f"RELEASE {savepoint}")
+    
+    def _fin_transaction(self):
+        """Retire à nouveau du cache les étudiants modifiés dans la transaction
+        
+        D'autres threads ont pu les y remettre, lus avant la validation.
+        """
+        for etudiant_id in self._ids_transaction:
+            self._invalider(etudiant_id)
+        self._ids_transaction.clear()
+        
+        if self._vider_cache_transaction:
+            self._vider_cache_transaction = False
+            self.vider_cache()
+    
+    def _valider(self):
+        """Valide immédiatement, sauf à l'intérieur d'un bloc transaction()"""
+        if not self._niveau_transaction:
+            self.conn.commit()
+    
+    def _invalider(self, etudiant_id):
+        """Retire un étudiant du cache après une écriture le concernant
+        
+        À appeler après _valider, pour qu'une lecture concurrente ne remette
+        pas en cache l'état d'avant la modification.
+        """
+        with self._verrou_cache:
+            self._cache.pop(etudiant_id, None)
+            self._generation_cache += 1
+        if self._niveau_transaction:
+            self._ids_transaction.add(etudiant_id)
+    
+    def _lire_data_version(self):
+        """PRAGMA data_version de la connexion d'écriture
+        
+        Cette valeur ne change que quand une autre connexion valide des
+        écritures: les connexions de lecture étant en lecture seule, cela
+        signale un autre processus.
+        """
+        return self._connexion_ecriture.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _verifier_modifications_externes(self):
+        """Vide le cache si un autre processus a écrit dans la base"""
+        # Écriture en cours dans un autre thread: vérification au prochain appel
+        if not self._verrou.acquire(blocking=False):
+            return
+        try:
+            version = self._lire_data_version()
+        finally:
+            self._verrou.release()
+        
+        if version != self._data_version:
+            self._data_version = version
+            self.vider_cache()
+    
+    @_lecture
+    def charger_categories(self):
+        """Enregistre dans les registres de models.categories les matières et
+        promotions présentes en base, dans l'ordre alphabétique"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute('''
+            SELECT matiere FROM notes_periodes
+            UNION SELECT matiere FROM coefficients
+            UNION SELECT matiere FROM coefficients_promotion
+        ''')
+        MATIERES.charger(m for (m,) in cursor.fetchall())
+        cursor.execute('''
+            SELECT DISTINCT promotion FROM etudiants
+            UNION SELECT promotion FROM coefficients_promotion
+        ''')
+        PROMOTIONS.charger(p for (p,) in cursor.fetchall())
+    
+    @_lecture
+    def version_donnees(self, *tables):
+        """Retourne un jeton qui change à chaque modification des tables données
+        
+        Peu coûteux (une requête sur une table de trois lignes), il permet de
+        ne recalculer des statistiques, un rapport ou un graphique que si les
+        données ont changé depuis, y compris du fait d'un autre processus.
+        
+        Exemple:
+            jeton = db.version_donnees("etudiants", "notes")
+            ...
+            if db.version_donnees("etudiants", "notes") != jeton:
+                ...  # recalculer
+        
+        Args:
+            tables: Tables à surveiller parmi TABLES_SUIVIES (toutes par défaut)
+        
+        Returns:
+            Tuple des compteurs de modifications, dans l'ordre des tables
+        
+        Raises:
+            ValueError: Si une table n'est pas suivie
+        """
+        tables = tables or self.TABLES_SUIVIES
+        for table in tables:
+            if table not in self.TABLES_SUIVIES:
+                raise ValueError(f"Table non suivie: {table}")
+        
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT nom_table, compteur FROM modifications")
+        compteurs = dict(cursor.fetchall())
+        return tuple(compteurs[table] for table in tables)
+    
+    def vider_cache(self):
+        """Vide le cache des étudiants
+        
+        Nécessaire après des écritures faites directement en SQL sur db.conn;
+        celles des autres processus sont détectées automatiquement.
+        """
+        with self._verrou_cache:
+            self._cache.clear()
+            self._generation_cache += 1
+        if self._niveau_transaction:
+            self._vider_cache_transaction = True
+    
+    def statistiques_cache(self):
+        """Retourne l'état du cache des étudiants
+        
+        Returns:
+            Dictionnaire {succes, echecs, taille, capacite}
+        """
+        with self._verrou_cache:
+            return {
+                'succes': self.cache_succes,
+                'echecs': self.cache_echecs,
+                'taille': len(self._cache),
+                'capacite': self.taille_cache
+            }
+    
+    def _creer_compteurs_modifications(self, cursor):
+        """Crée la table modifications (un compteur par table suivie) et les
+        triggers qui l'incrémentent à chaque ligne ajoutée, modifiée ou supprimée
+        
+        Les compteurs sont dans la base: ils voient aussi les écritures des
+        autres processus. Voir version_donnees.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS modifications (
+                nom_table TEXT PRIMARY KEY,
+                compteur INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        for table in self.TABLES_SUIVIES:
+            cursor.execute(
+                "INSERT OR IGNORE INTO modifications (nom_table) VALUES (?)", (table,)
+            )
+            for suffixe, evenement in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {table}_modif_{suffixe}
+                    AFTER {evenement} ON {table} BEGIN
+                        UPDATE modifications SET compteur = compteur + 1
+                        WHERE nom_table = '{table}';
+                    END
+                ''')
+    
+    def _creer_agregats(self, cursor):
+        """Crée la table notes_agg (nombre, somme, somme des carrés, min, max
+        par étudiant et par matière) et les triggers qui la tiennent à jour
+        
+        Un ajout de note met à jour l'agrégat en O(1). Une suppression ou une
+        modification recalcule le seul couple (étudiant, matière) concerné.
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notes_agg'"
+        )
+        existait = cursor.fetchone() is not None
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notes_agg (
+                etudiant_id INTEGER NOT NULL,
+                matiere TEXT NOT NULL,
+                nombre INTEGER NOT NULL,
+                somme REAL NOT NULL,
+                somme_carres REAL NOT NULL,
+                note_min REAL NOT NULL,
+                note_max REAL NOT NULL,
+                PRIMARY KEY (etudiant_id, matiere)
+            )
+        ''')
+        
+        # Les notes orphelines (étudiant inexistant) ne sont pas agrégées,
+        # comme dans _remplir_agregats et verifier_agregats
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS notes_agg_ai AFTER INSERT ON notes
+            WHEN EXISTS (SELECT 1 FROM etudiants WHERE id = new.etudiant_id) BEGIN
+                INSERT INTO notes_agg (etudiant_id, matiere, nombre, somme, somme_carres, note_min, note_max)
+                VALUES (new.etudiant_id, new.matiere, 1, new.note, new.note * new.note, new.note, new.note)
+                ON CONFLICT (etudiant_id, matiere) DO UPDATE SET
+                    nombre = nombre + 1,
+                    somme = somme + excluded.somme,
+                    somme_carres = somme_carres + excluded.somme_carres,
+                    note_min = MIN(note_min, excluded.note_min),
+                    note_max = MAX(note_max, excluded.note_max);
+            END
+        ''')
+        
+        for evenement, lignes in (("DELETE", ("old",)), ("UPDATE", ("old", "new"))):
+            recalculs = "".join(f'''
+                DELETE FROM notes_agg
+                WHERE etudiant_id = {ligne}.etudiant_id AND matiere = {ligne}.matiere;
+                INSERT INTO notes_agg (etudiant_id, matiere, nombre, somme, somme_carres, note_min, note_max)
+                SELECT etudiant_id, matiere, COUNT(*), SUM(note), SUM(note * note), MIN(note), MAX(note)
+                FROM notes
+                WHERE etudiant_id = {ligne}.etudiant_id AND matiere = {ligne}.matiere
+                    AND EXISTS (SELECT 1 FROM etudiants WHERE id = {ligne}.etudiant_id)
+                GROUP BY etudiant_id, matiere;''' for ligne in lignes)
+            
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS notes_agg_{evenement.lower()} AFTER {evenement} ON notes
+                BEGIN{recalculs}
+                END
+            ''')
+        
+        # Les notes d'un étudiant supprimé ne comptent plus
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS notes_agg_etudiant_ad AFTER DELETE ON etudiants BEGIN
+                DELETE FROM notes_agg WHERE etudiant_id = old.id;
+            END
+        ''')
+        
+        if not existait:
+            self._remplir_agregats(cursor)
+    
+    def _creer_cumuls_periodes(self, cursor):
+        """Crée la table notes_periodes (nombre, somme, min, max par mois,
+        promotion et matière) et les triggers qui la tiennent à jour
+        
+        Comme pour notes_agg, un ajout de note met à jour son mois en O(1).
+        Une suppression, une modification ou un changement de promotion
+        retranche (et ajoute) les seules notes concernées: les notes d'un
+        groupe ne sont relues, par l'index sur (matiere, date_ajout), que si
+        une note retirée en était le minimum ou le maximum.
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notes_periodes'"
+        )
+        existait = cursor.fetchone() is not None
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notes_periodes (
+                mois TEXT NOT NULL,
+                promotion TEXT NOT NULL,
+                matiere TEXT NOT NULL,
+                nombre INTEGER NOT NULL,
+                somme REAL NOT NULL,
+                note_min REAL NOT NULL,
+                note_max REAL NOT NULL,
+                PRIMARY KEY (mois, promotion, matiere)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS notes_periodes_ai AFTER INSERT ON notes
+            WHEN new.date_ajout IS NOT NULL BEGIN
+                INSERT INTO notes_periodes (mois, promotion, matiere, nombre, somme, note_min, note_max)
+                SELECT strftime('%Y-%m', new.date_ajout), promotion, new.matiere, 1, new.note, new.note, new.note
+                FROM etudiants WHERE id = new.etudiant_id
+                ON CONFLICT (mois, promotion, matiere) DO UPDATE SET
+                    nombre = nombre + 1,
+                    somme = somme + excluded.somme,
+                    note_min = MIN(note_min, excluded.note_min),
+                    note_max = MAX(note_max, excluded.note_max);
+            END
+        ''')
+        
+        def extreme(fonction):
+            """MIN ou MAX des notes du groupe de la ligne de notes_periodes
+            (par l'index sur matiere, date_ajout)"""
+            return f'''(
+                    SELECT {fonction}(n.note)
+                    FROM notes n JOIN etudiants e ON e.id = n.etudiant_id
+                    WHERE n.matiere = notes_periodes.matiere
+                        AND n.date_ajout >= notes_periodes.mois || '-01'
+                        AND n.date_ajout < date(notes_periodes.mois || '-01', '+1 month')
+                        AND e.promotion = notes_periodes.promotion
+                )'''
+        
+        def retrait(groupe, promotion):
+            """Retire des groupes de `promotion` les notes résumées par la
+            requête `groupe` (mois, matiere, nombre, somme, note_min, note_max)
+            
+            Le minimum (maximum) n'est relu dans les notes que si une note
+            retirée l'atteint. Les groupes vidés sont supprimés.
+            """
+            return f'''
+                UPDATE notes_periodes SET
+                    nombre = notes_periodes.nombre - g.nombre,
+                    somme = notes_periodes.somme - g.somme,
+                    note_min = CASE WHEN g.note_min > notes_periodes.note_min THEN notes_periodes.note_min
+                        ELSE COALESCE({extreme("MIN")}, notes_periodes.note_min) END,
+                    note_max = CASE WHEN g.note_max < notes_periodes.note_max THEN notes_periodes.note_max
+                        ELSE COALESCE({extreme("MAX")}, notes_periodes.note_max) END
+                FROM ({groupe}) g
+                WHERE notes_periodes.mois = g.mois AND notes_periodes.matiere = g.matiere
+                    AND notes_periodes.promotion = ({promotion});
+                DELETE FROM notes_periodes
+                WHERE nombre = 0 AND promotion = ({promotion}) AND (mois, matiere) IN (
+                    SELECT mois, matiere FROM ({groupe})
+                );'''
+        
+        def ajout(groupe, promotion):
+            """Ajoute aux groupes de `promotion` les notes résumées par `groupe`"""
+            return f'''
+                INSERT INTO notes_periodes (mois, promotion, matiere, nombre, somme, note_min, note_max)
+                SELECT g.mois, p.promotion, g.matiere, g.nombre, g.somme, g.note_min, g.note_max
+                FROM ({groupe}) g, (SELECT ({promotion}) AS promotion) p
+                WHERE p.promotion IS NOT NULL
+                ON CONFLICT (mois, promotion, matiere) DO UPDATE SET
+                    nombre = nombre + excluded.nombre,
+                    somme = somme + excluded.somme,
+                    note_min = MIN(note_min, excluded.note_min),
+                    note_max = MAX(note_max, excluded.note_max);'''
+        
+        # Une note, ou toutes les notes datées d'un étudiant, par (mois, matiere)
+        note = (
+            "SELECT strftime('%Y-%m', {0}.date_ajout) AS mois, {0}.matiere AS matiere, 1 AS nombre, "
+            "{0}.note AS somme, {0}.note AS note_min, {0}.note AS note_max "
+            "WHERE {0}.date_ajout IS NOT NULL"
+        )
+        notes_etudiant = (
+            "SELECT strftime('%Y-%m', date_ajout) AS mois, matiere, COUNT(*) AS nombre, "
+            "SUM(note) AS somme, MIN(note) AS note_min, MAX(note) AS note_max "
+            "FROM notes WHERE etudiant_id = {0}.id AND date_ajout IS NOT NULL GROUP BY 1, 2"
+        )
+        promotion_note = "SELECT promotion FROM etudiants WHERE id = {0}.etudiant_id"
+        
+        triggers = [
+            ("notes_periodes_delete", "AFTER DELETE ON notes",
+                retrait(note.format("old"), promotion_note.format("old"))),
+            ("notes_periodes_update", "AFTER UPDATE OF etudiant_id, matiere, note, date_ajout ON notes",
+                retrait(note.format("old"), promotion_note.format("old"))
+                + ajout(note.format("new"), promotion_note.format("new"))),
+            # Les notes d'un étudiant suivent sa promotion
+            ("notes_periodes_etudiant_au",
+                "AFTER UPDATE OF promotion ON etudiants WHEN old.promotion IS NOT new.promotion",
+                retrait(notes_etudiant.format("new"), "old.promotion")
+                + ajout(notes_etudiant.format("new"), "new.promotion")),
+            # Les notes d'un étudiant supprimé ne comptent plus
+            ("notes_periodes_etudiant_ad", "AFTER DELETE ON etudiants",
+                retrait(notes_etudiant.format("old"), "old.promotion")),
+        ]
+        for nom, evenement, corps in triggers:
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {nom} {evenement}
+                BEGIN{corps}
+                END
+            ''')
+        
+        if not existait:
+            self._remplir_cumuls_periodes(cursor)
+    
+    def _remplir_cumuls_periodes(self, cursor):
+        """Recalcule entièrement notes_periodes à partir de la table notes"""
+        cursor.execute("DELETE FROM notes_periodes")
+        cursor.execute('''
+            INSERT INTO notes_periodes (mois, promotion, matiere, nombre, somme, note_min, note_max)
+            SELECT strftime('%Y-%m', n.date_ajout), e.promotion, n.matiere,
+                   COUNT(*), SUM(n.note), MIN(n.note), MAX(n.note)
+            FROM notes n JOIN etudiants e ON e.id = n.etudiant_id
+            WHERE n.date_ajout IS NOT NULL
+            GROUP BY 1, 2, 3
+        ''')
+    
+    def _remplir_agregats(self, cursor):
+        """Recalcule entièrement notes_agg à partir de la table notes"""
+        cursor.execute("DELETE FROM notes_agg")
+        cursor.execute('''
+            INSERT INTO notes_agg (etudiant_id, matiere, nombre, somme, somme_carres, note_min, note_max)
+            SELECT etudiant_id, matiere, COUNT(*), SUM(note), SUM(note * note), MIN(note), MAX(note)
+            FROM notes
+            WHERE etudiant_id IN (SELECT id FROM etudiants)
+            GROUP BY etudiant_id, matiere
+        ''')
+    
+    @_lecture
+    def verifier_agregats(self, tolerance=1e-9):
+        """Compare notes_agg aux notes réelles
+        
+        Returns:
+            Liste des couples (etudiant_id, matiere) incohérents (vide si tout va bien)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            WITH reel AS (
+                SELECT etudiant_id, matiere, COUNT(*) AS nombre, SUM(note) AS somme,
+                       SUM(note * note) AS somme_carres, MIN(note) AS note_min, MAX(note) AS note_max
+                FROM notes
+                WHERE etudiant_id IN (SELECT id FROM etudiants)
+                GROUP BY etudiant_id, matiere
+            )
+            SELECT r.etudiant_id, r.matiere FROM reel r
+            LEFT JOIN notes_agg a USING (etudiant_id, matiere)
+            WHERE a.nombre IS NULL
+               OR a.nombre != r.nombre
+               OR ABS(a.somme - r.somme) > :tolerance
+               OR ABS(a.somme_carres - r.somme_carres) > :tolerance
+               OR a.note_min != r.note_min
+               OR a.note_max != r.note_max
+            UNION
+            SELECT a.etudiant_id, a.matiere FROM notes_agg a
+            LEFT JOIN reel r USING (etudiant_id, matiere)
+            WHERE r.nombre IS NULL
+            ORDER BY 1, 2
+        ''', {"tolerance": tolerance})
+        
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+    
+    @_lecture
+    def verifier_cumuls_periodes(self, tolerance=1e-9):
+        """Compare notes_periodes aux notes réelles
+        
+        Returns:
+            Liste des groupes (mois, promotion, matiere) incohérents (vide si tout va bien)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            WITH reel AS (
+                SELECT strftime('%Y-%m', n.date_ajout) AS mois, e.promotion, n.matiere,
+                       COUNT(*) AS nombre, SUM(n.note) AS somme,
+                       MIN(n.note) AS note_min, MAX(n.note) AS note_max
+                FROM notes n JOIN etudiants e ON e.id = n.etudiant_id
+                WHERE n.date_ajout IS NOT NULL
+                GROUP BY 1, 2, 3
+            )
+            SELECT r.mois, r.promotion, r.matiere FROM reel r
+            LEFT JOIN notes_periodes p USING (mois, promotion, matiere)
+            WHERE p.nombre IS NULL
+               OR p.nombre != r.nombre
+               OR ABS(p.somme - r.somme) > :tolerance
+               OR p.note_min != r.note_min
+               OR p.note_max != r.note_max
+            UNION
+            SELECT p.mois, p.promotion, p.matiere FROM notes_periodes p
+            LEFT JOIN reel r USING (mois, promotion, matiere)
+            WHERE r.nombre IS NULL
+            ORDER BY 1, 2, 3
+        ''', {"tolerance": tolerance})
+        
+        return [(row[0], row[1], row[2]) for row in cursor.fetchall()]
+    
+    def reconstruire_agregats(self):
+        """Reconstruit notes_agg et notes_periodes (après une incohérence
+        détectée par verifier_agregats ou verifier_cumuls_periodes)"""
+        with self.transaction():
+            cursor = self.conn.cursor()
+            self._remplir_agregats(cursor)
+            self._remplir_cumuls_periodes(cursor)
+    
+    @_lecture
+    def obtenir_moyennes(self, promotion=None, debut=None, fin=None):
+        """Moyennes générales calculées depuis notes_agg, sans charger les notes
+        
+        Même calcul que Etudiant.moyenne_generale (moyenne des moyennes par
+        matière, 0 pour un étudiant sans note). Avec debut et/ou fin, seules
+        les notes ajoutées dans cet intervalle (debut inclus, fin exclue)
+        comptent:
+        elles sont alors agrégées depuis la table notes.
+        
+        Returns:
+            Dictionnaire {etudiant_id: moyenne_generale}
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        filtre = "WHERE promotion = ?" if promotion else ""
+        params = (PROMOTIONS.normaliser(promotion),) if promotion else ()
+        
+        cursor.execute(f"SELECT id FROM etudiants {filtre}", params)
+        moyennes_matieres = {id_: [] for (id_,) in cursor}
+        
+        if debut is None and fin is None:
+            cursor.execute(f'''
+                SELECT etudiant_id, somme / nombre FROM notes_agg
+                WHERE etudiant_id IN (SELECT id FROM etudiants {filtre})
+                ORDER BY etudiant_id, matiere
+            ''', params)
+        else:
+            conditions, params_dates = _filtre_dates("date_ajout", debut, fin)
+            cursor.execute(f'''
+                SELECT etudiant_id, SUM(note) / COUNT(*) FROM notes
+                WHERE etudiant_id IN (SELECT id FROM etudiants {filtre})
+                  AND {" AND ".join(conditions)}
+                GROUP BY etudiant_id, matiere
+                ORDER BY etudiant_id, matiere
+            ''', (*params, *params_dates))
+        for etudiant_id, moyenne in cursor:
+            moyennes_matieres[etudiant_id].append(moyenne)
+        
+        return {
+            id_: sum(moyennes) / len(moyennes) if moyennes else 0
+            for id_, moyennes in moyennes_matieres.items()
+        }
+    
+    @_lecture
+    def obtenir_moyennes_matieres(self, etudiant_id):
+        """Moyennes par matière d'un étudiant, depuis notes_agg
+        
+        Returns:
+            Dictionnaire {matiere: moyenne}
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT matiere, somme / nombre AS moyenne FROM notes_agg WHERE etudiant_id = ? ORDER BY matiere",
+            (etudiant_id,)
+        )
+        return {row['matiere']: row['moyenne'] for row in cursor.fetchall()}
+    
+    @_lecture
+    def obtenir_mentions(self, promotion=None, debut=None, fin=None):
+        """Mention de chaque étudiant, depuis notes_agg (voir obtenir_moyennes)
+        
+        Returns:
+            Dictionnaire {etudiant_id: mention}
+        """
+        return {
+            id_: mention_pour(moyenne)
+            for id_, moyenne in self.obtenir_moyennes(promotion, debut, fin).items()
+        }
+    
+    @_lecture
+    def obtenir_taux_reussite(self, seuil=10, promotion=None, debut=None, fin=None):
+        """Taux de réussite calculé depuis notes_agg (voir obtenir_moyennes)
+        
+        Returns:
+            Tuple (nombre_reussis, nombre_total, taux_pourcentage)
+        """
+        moyennes = self.obtenir_moyennes(promotion, debut, fin)
+        if not moyennes:
+            return (0, 0, 0)
+        
+        reussis = sum(1 for moyenne in moyennes.values() if moyenne >= seuil)
+        total = len(moyennes)
+        return (reussis, total, (reussis / total) * 100)
+    
+    @_lecture
+    def obtenir_cumuls_periodes(self, periode="mois", promotion=None, matiere=None,
+                                debut=None, fin=None):
+        """Nombre, moyenne, minimum et maximum des notes par période,
+        promotion et matière
+        
+        Lus dans notes_periodes, tenue à jour par triggers: le coût dépend du
+        nombre de mois couverts, pas du nombre de notes. Les mois sont ceux
+        de date_ajout (UTC).
+        
+        Args:
+            periode: "mois", "trimestre", "semestre" ou "annee" (voir PERIODES)
+            promotion: Limite à une promotion
+            matiere: Limite à une matière
+            debut: Premier mois inclus ('AAAA-MM'; une date est ramenée à son mois)
+            fin: Premier mois exclu
+        
+        Returns:
+            Liste de dictionnaires {periode, promotion, matiere, nombre,
+            moyenne, min, max} triés par période, promotion et matière
+        
+        Raises:
+            ValueError: Si la période est inconnue, ou une borne invalide
+        """
+        if periode not in self.PERIODES:
+            raise ValueError(f"Période inconnue: {periode}")
+        
+        conditions, params = [], []
+        if promotion:
+            conditions.append("promotion = ?")
+            params.append(PROMOTIONS.normaliser(promotion))
+        if matiere:
+            conditions.append("matiere = ?")
+            params.append(MATIERES.normaliser(matiere))
+        if debut is not None:
+            conditions.append("mois >= ?")
+            params.append(_texte_mois(debut))
+        if fin is not None:
+            conditions.append("mois < ?")
+            params.append(_texte_mois(fin))
+        filtre = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT {self.PERIODES[periode]} AS periode, promotion, matiere,
+                   SUM(nombre) AS nombre, SUM(somme) / SUM(nombre) AS moyenne,
+                   MIN(note_min) AS min, MAX(note_max) AS max
+            FROM notes_periodes {filtre}
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+        ''', params)
+        return [dict(row) for row in cursor.fetchall()]
+    
+    @_ecriture
     def ajouter_etudiant(self, nom, prenom, promotion, email="", photo_path=""):
         """Ajoute un nouvel étudiant dans la base"""
         cursor = self.conn.cursor()
         cursor.execute('''
             INSERT INTO etudiants (nom, prenom, promotion, email, photo_path)
             VALUES (?, ?, ?, ?, ?)
-        ''', (nom.upper(), prenom.capitalize(), promotion.upper(), email.lower(), photo_path))
+        ''', (nom.upper(), prenom.capitalize(), PROMOTIONS.normaliser(promotion), email.lower(), photo_path))
         
-        self.conn.commit()
+        self._valider()
         return cursor.lastrowid
     
+    @_ecriture
     def modifier_etudiant(self, id_, nom=None, prenom=None, promotion=None, email=None, photo_path=None):
         """Modifie les informations d'un étudiant"""
         cursor = self.conn.cursor()
@@ -98,7 +1053,7 @@ class Database:
             params.append(prenom.capitalize())
         if promotion is not None:
             updates.append("promotion = ?")
-            params.append(promotion.upper())
+            params.append(PROMOTIONS.normaliser(promotion))
         if email is not None:
             updates.append("email = ?")
             params.append(email.lower())
@@ -110,92 +1065,262 @@ class Database:
             params.append(id_)
             query = f"UPDATE etudiants SET {', '.join(updates)} WHERE id = ?"
             cursor.execute(query, params)
-            self.conn.commit()
+            self._valider()
+            self._invalider(id_)
             return cursor.rowcount > 0
         
         return False
     
+    @_ecriture
     def supprimer_etudiant(self, id_):
         """Supprime un étudiant et toutes ses notes"""
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM etudiants WHERE id = ?", (id_,))
-        self.conn.commit()
+        self._valider()
+        self._invalider(id_)
         return cursor.rowcount > 0
     
     def obtenir_etudiant(self, id_):
-        """Récupère un étudiant par son ID"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM etudiants WHERE id = ?", (id_,))
-        row = cursor.fetchone()
+        """Récupère un étudiant par son ID
         
-        if row:
-            return self._row_to_etudiant(row)
-        return None
+        Les étudiants lus sont gardés en cache: relire un étudiant qui n'a
+        pas été modifié entre-temps ne coûte aucune requête. L'objet retourné
+        est partagé et ne doit pas être modifié directement. Le cache est vidé
+        si un autre processus écrit dans la base.
+        """
+        # Dans une transaction, ce thread doit voir ses modifications pas
+        # encore validées: le cache est ignoré
+        if self._niveau_transaction and getattr(self._local, 'ecritures', 0):
+            etudiants = self._charger_etudiants("id = ?", (id_,))
+            return etudiants[0] if etudiants else None
+        
+        self._verifier_modifications_externes()
+        with self._verrou_cache:
+            etudiant = self._cache.get(id_)
+            if etudiant is not None:
+                self._cache.move_to_end(id_)
+                self.cache_succes += 1
+                return etudiant
+            self.cache_echecs += 1
+            generation = self._generation_cache
+        
+        with self.lecture():
+            etudiants = self._charger_etudiants("id = ?", (id_,))
+        if not etudiants:
+            return None
+        etudiant = etudiants[0]
+        
+        with self._verrou_cache:
+            # Une écriture a eu lieu pendant la lecture: l'objet est peut-être périmé
+            if self.taille_cache and generation == self._generation_cache:
+                self._cache[etudiant.id] = etudiant
+                if len(self._cache) > self.taille_cache:
+                    self._cache.popitem(last=False)
+        return etudiant
     
-    def obtenir_tous_etudiants(self):
-        """Récupère tous les étudiants"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM etudiants ORDER BY nom, prenom")
-        rows = cursor.fetchall()
+    @_lecture
+    def obtenir_tous_etudiants(self, prefetch=True):
+        """Récupère tous les étudiants
         
-        return [self._row_to_etudiant(row) for row in rows]
+        Avec prefetch=False, une seule requête: notes et coefficients sont
+        chargés au premier accès (voir precharger).
+        """
+        return self._charger_etudiants(order_by="nom, prenom", prefetch=prefetch)
     
-    def obtenir_etudiants_par_promotion(self, promotion):
-        """Récupère les étudiants d'une promotion"""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT * FROM etudiants WHERE promotion = ? ORDER BY nom, prenom",
-            (promotion.upper(),)
+    @_lecture
+    def obtenir_etudiants_par_promotion(self, promotion, prefetch=True):
+        """Récupère les étudiants d'une promotion (prefetch: voir obtenir_tous_etudiants)"""
+        return self._charger_etudiants(
+            "promotion = ?", (PROMOTIONS.normaliser(promotion),), order_by="nom, prenom", prefetch=prefetch
         )
-        rows = cursor.fetchall()
-        
-        return [self._row_to_etudiant(row) for row in rows]
     
+    @_lecture
     def rechercher_etudiants(self, critere, valeur):
         """Recherche des étudiants selon un critère"""
-        cursor = self.conn.cursor()
-        
         match critere.lower():
             case "nom":
-                cursor.execute(
-                    "SELECT * FROM etudiants WHERE nom LIKE ? ORDER BY nom",
-                    (f"%{valeur.upper()}%",)
+                return self._charger_etudiants(
+                    "nom LIKE ?", (f"%{valeur.upper()}%",), order_by="nom"
                 )
             case "prenom":
-                cursor.execute(
-                    "SELECT * FROM etudiants WHERE prenom LIKE ? ORDER BY prenom",
-                    (f"%{valeur.capitalize()}%",)
+                return self._charger_etudiants(
+                    "prenom LIKE ?", (f"%{valeur.capitalize()}%",), order_by="prenom"
                 )
             case "promotion":
-                cursor.execute(
-                    "SELECT * FROM etudiants WHERE promotion = ? ORDER BY nom",
-                    (valeur.upper(),)
+                return self._charger_etudiants(
+                    "promotion = ?", (PROMOTIONS.normaliser(valeur),), order_by="nom"
                 )
             case "id":
-                cursor.execute("SELECT * FROM etudiants WHERE id = ?", (int(valeur),))
+                return self._charger_etudiants("id = ?", (int(valeur),))
             case _:
                 return []
+    
+    @_lecture
+    def rechercher_ids(self, texte, limite=50):
+        """Recherche les étudiants dont un mot commence par chaque mot saisi
         
-        rows = cursor.fetchall()
-        return [self._row_to_etudiant(row) for row in rows]
+        Insensible à la casse et aux accents, sur nom, prénom, promotion et
+        email. Pensée pour la recherche pendant la saisie.
+        
+        Les résultats ne sont pas classés par pertinence: classer (bm25)
+        toutes les correspondances d'un préfixe commun à toute la base
+        prendrait une centaine de millisecondes à 100 000 étudiants.
+        
+        Returns:
+            Liste d'au plus `limite` IDs: les premiers trouvés, par ID croissant
+        """
+        mots = re.findall(r"\w+", texte)
+        if not mots:
+            return []
+        
+        cursor = self.conn.cursor()
+        
+        if not self.fts_disponible:
+            conditions = " AND ".join(
+                "(nom LIKE ? OR prenom LIKE ? OR promotion LIKE ? OR email LIKE ?)"
+                for _ in mots
+            )
+            params = [f"%{mot}%" for mot in mots for _ in range(4)]
+            cursor.execute(
+                f"SELECT id FROM etudiants WHERE {conditions} ORDER BY id LIMIT ?",
+                (*params, limite)
+            )
+            return [row['id'] for row in cursor.fetchall()]
+        
+        requete = " ".join(f'"{mot}"*' for mot in mots)
+        cursor.execute(
+            "SELECT rowid FROM etudiants_fts WHERE etudiants_fts MATCH ? ORDER BY rowid LIMIT ?",
+            (requete, limite)
+        )
+        return [row['rowid'] for row in cursor.fetchall()]
+    
+    @_lecture
+    def recherche_rapide(self, texte, limite=50, prefetch=True):
+        """Recherche plein texte retournant des objets Etudiant triés par nom
+        
+        Voir rechercher_ids pour la syntaxe de recherche et le choix des
+        `limite` étudiants retournés, obtenir_tous_etudiants pour prefetch.
+        """
+        ids = self.rechercher_ids(texte, limite)
+        if not ids:
+            return []
+        
+        marqueurs = ", ".join("?" * len(ids))
+        return self._charger_etudiants(
+            f"id IN ({marqueurs})", ids, order_by="nom, prenom", prefetch=prefetch
+        )
     
+    @_ecriture
     def ajouter_note(self, etudiant_id, matiere, note):
         """Ajoute une note pour un étudiant"""
         cursor = self.conn.cursor()
         cursor.execute('''
             INSERT INTO notes (etudiant_id, matiere, note)
             VALUES (?, ?, ?)
-        ''', (etudiant_id, matiere.capitalize(), float(note)))
+        ''', (etudiant_id, MATIERES.normaliser(matiere), float(note)))
         
-        self.conn.commit()
+        self._valider()
+        self._invalider(etudiant_id)
         return cursor.lastrowid
     
-    def obtenir_notes_etudiant(self, etudiant_id):
-        """Récupère toutes les notes d'un étudiant"""
+    def ajouter_notes_lot(self, lignes, date_ajout=None, tout_ou_rien=False):
+        """Ajoute un lot de notes (toute une classe, un import de résultats...)
+        
+        Chaque ligne est vérifiée (étudiant existant, matière non vide, note
+        entre 0 et 20), puis toutes les lignes valides sont insérées par
+        executemany dans une seule transaction. Une ligne refusée n'empêche
+        pas l'insertion des autres, sauf avec tout_ou_rien.
+        
+        Args:
+            lignes: Séquence de (etudiant_id, matiere, note); des tableaux
+                parallèles se passent par zip(ids, matieres, notes)
+            date_ajout: Date commune des notes (date, datetime ou texte ISO),
+                l'instant présent par défaut
+            tout_ou_rien: Si une ligne est refusée, n'insérer aucune note
+        
+        Returns:
+            Tuple (nombre de notes insérées, liste des refus (index de la
+            ligne, motif) dans l'ordre des lignes)
+        
+        Raises:
+            ValueError: Si date_ajout n'est pas une date valide (rien n'est inséré)
+        
+        Exemple:
+            nombre, refus = db.ajouter_notes_lot(
+                zip(ids, repeat("Physique"), notes), date_ajout=date(2024, 6, 12)
+            )
+        """
+        # Une date invalide donnerait un mois NULL dans notes_periodes
+        jour = texte_date(date_ajout) if date_ajout is not None else None
+        
+        valides = []
+        refus = []
+        for index, ligne in enumerate(lignes):
+            try:
+                try:
+                    etudiant_id, matiere, note = ligne
+                except (TypeError, ValueError):
+                    raise ValueError("ligne attendue: (etudiant_id, matiere, note)") from None
+                if not isinstance(etudiant_id, numbers.Integral) or isinstance(etudiant_id, bool):
+                    raise ValueError(f"identifiant d'étudiant invalide: {etudiant_id!r}")
+                if not isinstance(matiere, str) or not matiere.strip():
+                    raise ValueError("La matière est obligatoire")
+                verifier_note(note)
+            except (TypeError, ValueError) as e:
+                refus.append((index, str(e)))
+                continue
+            valides.append((index, int(etudiant_id), MATIERES.normaliser(matiere), float(note)))
+        
+        with self.transaction():
+            cursor = self.conn.cursor()
+            
+            # Étudiants inconnus, cherchés par paquets (limite de paramètres SQLite)
+            ids = list({ligne[1] for ligne in valides})
+            connus = set()
+            for debut in range(0, len(ids), 900):
+                paquet = ids[debut:debut + 900]
+                cursor.execute(
+                    f"SELECT id FROM etudiants WHERE id IN ({', '.join('?' * len(paquet))})",
+                    paquet
+                )
+                connus.update(etudiant_id for (etudiant_id,) in cursor)
+            if len(connus) < len(ids):
+                refus.extend(
+                    (index, f"étudiant inconnu: {etudiant_id}")
+                    for index, etudiant_id, _, _ in valides if etudiant_id not in connus
+                )
+                refus.sort()
+                valides = [ligne for ligne in valides if ligne[1] in connus]
+            
+            if tout_ou_rien and refus:
+                return 0, refus
+            
+            if jour is None:
+                cursor.executemany(
+                    "INSERT INTO notes (etudiant_id, matiere, note) VALUES (?, ?, ?)",
+                    (ligne[1:] for ligne in valides)
+                )
+            else:
+                cursor.executemany(
+                    "INSERT INTO notes (etudiant_id, matiere, note, date_ajout) VALUES (?, ?, ?, ?)",
+                    ((*ligne[1:], jour) for ligne in valides)
+                )
+            
+            for etudiant_id in connus:
+                self._invalider(etudiant_id)
+        
+        return len(valides), refus
+    
+    @_lecture
+    def obtenir_notes_etudiant(self, etudiant_id, debut=None, fin=None):
+        """Récupère toutes les notes d'un étudiant (ajoutées entre debut et
+        fin si donnés: debut inclus, fin exclue)"""
+        conditions, params = _filtre_dates("date_ajout", debut, fin)
         cursor = self.conn.cursor()
         cursor.execute(
-            "SELECT matiere, note FROM notes WHERE etudiant_id = ? ORDER BY matiere, date_ajout",
-            (etudiant_id,)
+            f"SELECT matiere, note FROM notes WHERE {' AND '.join(['etudiant_id = ?', *conditions])} "
+            "ORDER BY matiere, date_ajout, id",
+            (etudiant_id, *params)
         )
         rows = cursor.fetchall()
         
@@ -208,39 +1333,173 @@ class Database:
         
         return notes
     
+    @_lecture
+    def obtenir_notes_detaillees(self, etudiant_id, matiere=None, debut=None, fin=None):
+        """Récupère les notes d'un étudiant avec leur identifiant
+        
+        Args:
+            etudiant_id: ID de l'étudiant
+            matiere: Limite aux notes d'une matière
+            debut, fin: Limite aux notes ajoutées dans cet intervalle (debut
+                inclus, fin exclue; date, datetime ou texte ISO)
+        
+        Returns:
+            Liste de dictionnaires {id, matiere, note, date_ajout} triés par
+            matière puis par date d'ajout
+        """
+        conditions, params = _filtre_dates("date_ajout", debut, fin)
+        cursor = self.conn.cursor()
+        if matiere is None:
+            cursor.execute(f'''
+                SELECT id, matiere, note, date_ajout FROM notes
+                WHERE {" AND ".join(["etudiant_id = ?", *conditions])}
+                ORDER BY matiere, date_ajout, id
+            ''', (etudiant_id, *params))
+        else:
+            cursor.execute(f'''
+                SELECT id, matiere, note, date_ajout FROM notes
+                WHERE {" AND ".join(["etudiant_id = ? AND matiere = ?", *conditions])}
+                ORDER BY date_ajout, id
+            ''', (etudiant_id, MATIERES.normaliser(matiere), *params))
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    @_ecriture
     def supprimer_note(self, etudiant_id, matiere, index):
-        """Supprime une note spécifique"""
+        """Supprime une note spécifique (par sa position dans la matière)
+        
+        Préférer supprimer_note_par_id, qui n'a pas à relire les notes.
+        """
         cursor = self.conn.cursor()
         
-        # Récupérer toutes les notes de cette matière
+        # Lire directement la note à cette position via l'index
         cursor.execute('''
             SELECT id FROM notes 
             WHERE etudiant_id = ? AND matiere = ?
-            ORDER BY date_ajout
-        ''', (etudiant_id, matiere.capitalize()))
+            ORDER BY date_ajout, id
+            LIMIT 1 OFFSET ?
+        ''', (etudiant_id, MATIERES.normaliser(matiere), index))
         
-        rows = cursor.fetchall()
+        row = cursor.fetchone()
         
-        if 0 <= index < len(rows):
-            note_id = rows[index]['id']
-            cursor.execute("DELETE FROM notes WHERE id = ?", (note_id,))
-            self.conn.commit()
-            return True
+        if index >= 0 and row:
+            return self.supprimer_note_par_id(row['id'])
         
         return False
     
+    @_ecriture
+    def supprimer_note_par_id(self, note_id):
+        """Supprime une note par son identifiant"""
+        cursor = self.conn.cursor()
+        etudiant_id = self._etudiant_de_note(cursor, note_id)
+        cursor.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        self._valider()
+        self._invalider(etudiant_id)
+        return cursor.rowcount > 0
+    
+    @_ecriture
+    def modifier_note_par_id(self, note_id, nouvelle_note):
+        """Modifie une note par son identifiant
+        
+        Raises:
+            ValueError: Si la nouvelle note n'est pas un nombre entre 0 et 20
+        """
+        verifier_note(nouvelle_note)
+        
+        cursor = self.conn.cursor()
+        etudiant_id = self._etudiant_de_note(cursor, note_id)
+        cursor.execute(
+            "UPDATE notes SET note = ? WHERE id = ?",
+            (float(nouvelle_note), note_id)
+        )
+        self._valider()
+        self._invalider(etudiant_id)
+        return cursor.rowcount > 0
+    
+    def _etudiant_de_note(self, cursor, note_id):
+        """ID de l'étudiant auquel appartient une note (None si inconnue)"""
+        cursor.execute("SELECT etudiant_id FROM notes WHERE id = ?", (note_id,))
+        row = cursor.fetchone()
+        return row['etudiant_id'] if row else None
+    
+    @_ecriture
     def set_coefficient(self, etudiant_id, matiere, coefficient):
         """Définit le coefficient d'une matière pour un étudiant"""
         cursor = self.conn.cursor()
         cursor.execute('''
             INSERT OR REPLACE INTO coefficients (etudiant_id, matiere, coefficient)
             VALUES (?, ?, ?)
-        ''', (etudiant_id, matiere.capitalize(), float(coefficient)))
+        ''', (etudiant_id, MATIERES.normaliser(matiere), float(coefficient)))
         
-        self.conn.commit()
+        self._valider()
+        self._invalider(etudiant_id)
     
+    @_ecriture
+    def set_coefficient_promotion(self, promotion, matiere, coefficient):
+        """Définit le coefficient d'une matière pour toute une promotion
+        
+        Une seule ligne écrite quel que soit le nombre d'étudiants; les
+        coefficients définis par set_coefficient restent prioritaires.
+        """
+        if coefficient <= 0:
+            raise ValueError("Le coefficient doit être positif")
+        
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO coefficients_promotion (promotion, matiere, coefficient)
+            VALUES (?, ?, ?)
+        ''', (PROMOTIONS.normaliser(promotion), MATIERES.normaliser(matiere), float(coefficient)))
+        
+        self._valider()
+        self.vider_cache()
+    
+    @_lecture
+    def obtenir_coefficients_promotion(self, promotion):
+        """Récupère les coefficients d'une promotion"""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT matiere, coefficient FROM coefficients_promotion WHERE promotion = ? ORDER BY matiere",
+            (PROMOTIONS.normaliser(promotion),)
+        )
+        return {row['matiere']: row['coefficient'] for row in cursor.fetchall()}
+    
+    @_ecriture
+    def factoriser_coefficients(self):
+        """Remplace les coefficients identiques pour tous les étudiants d'une
+        promotion par un coefficient de promotion
+        
+        Les coefficients d'étudiant égaux à celui de leur promotion sont
+        ensuite supprimés. Les coefficients effectifs des étudiants existants
+        ne changent pas; les futurs étudiants de la promotion en héritent.
+        
+        Returns:
+            Nombre de coefficients d'étudiant supprimés
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT OR IGNORE INTO coefficients_promotion (promotion, matiere, coefficient)
+            SELECT e.promotion, c.matiere, MIN(c.coefficient)
+            FROM coefficients c JOIN etudiants e ON e.id = c.etudiant_id
+            GROUP BY e.promotion, c.matiere
+            HAVING MIN(c.coefficient) = MAX(c.coefficient)
+               AND COUNT(*) = (SELECT COUNT(*) FROM etudiants p WHERE p.promotion = e.promotion)
+        ''')
+        cursor.execute('''
+            DELETE FROM coefficients
+            WHERE coefficient = (
+                SELECT cp.coefficient
+                FROM etudiants e JOIN coefficients_promotion cp ON cp.promotion = e.promotion
+                WHERE e.id = coefficients.etudiant_id AND cp.matiere = coefficients.matiere
+            )
+        ''')
+        self._valider()
+        self.vider_cache()
+        return cursor.rowcount
+    
+    @_lecture
     def obtenir_coefficients(self, etudiant_id):
-        """Récupère les coefficients d'un étudiant"""
+        """Récupère les coefficients propres à un étudiant (sans ceux de sa
+        promotion, voir obtenir_coefficients_promotion)"""
         cursor = self.conn.cursor()
         cursor.execute(
             "SELECT matiere, coefficient FROM coefficients WHERE etudiant_id = ?",
@@ -250,6 +1509,7 @@ class Database:
         
         return {row['matiere']: row['coefficient'] for row in rows}
     
+    @_lecture
     def obtenir_promotions(self):
         """Récupère la liste des promotions"""
         cursor = self.conn.cursor()
@@ -258,6 +1518,7 @@ class Database:
         
         return [row['promotion'] for row in rows]
     
+    @_lecture
     def obtenir_matieres(self):
         """Récupère la liste des matières"""
         cursor = self.conn.cursor()
@@ -266,71 +1527,711 @@ class Database:
         
         return [row['matiere'] for row in rows]
     
-    def nombre_total_etudiants(self):
-        """Retourne le nombre total d'étudiants"""
+    @_lecture
+    def nombre_total_etudiants(self, promotion=None):
+        """Retourne le nombre total d'étudiants (éventuellement d'une promotion)"""
         cursor = self.conn.cursor()
-        cursor.execute("SELECT COUNT(*) as count FROM etudiants")
+        if promotion:
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM etudiants WHERE promotion = ?",
+                (PROMOTIONS.normaliser(promotion),)
+            )
+        else:
+            cursor.execute("SELECT COUNT(*) as count FROM etudiants")
         return cursor.fetchone()['count']
     
-    def _row_to_etudiant(self, row):
-        """Convertit une ligne SQL en objet Etudiant"""
-        etudiant = Etudiant(
-            row['id'],
-            row['nom'],
-            row['prenom'],
-            row['promotion'],
-            row['email'] or "",
-            row['photo_path'] or ""
+    @_lecture
+    def obtenir_page_etudiants(self, taille=50, apres=None, promotion=None, prefetch=True):
+        """Récupère une page d'étudiants triés par nom, prénom
+        
+        Pagination par clé (keyset): la page suivante reprend après le
+        dernier étudiant lu grâce à l'index (nom, prenom, id), quel que soit
+        le numéro de page.
+        
+        Args:
+            taille: Nombre d'étudiants par page
+            apres: Curseur retourné par l'appel précédent (None pour la 1re page)
+            promotion: Limite la liste à une promotion
+            prefetch: Voir obtenir_tous_etudiants
+        
+        Returns:
+            Tuple (etudiants, curseur_suivant), curseur_suivant valant None
+            sur la dernière page
+        """
+        conditions = []
+        params = []
+        
+        if promotion:
+            conditions.append("promotion = ?")
+            params.append(PROMOTIONS.normaliser(promotion))
+        if apres is not None:
+            conditions.append("(nom, prenom, id) > (?, ?, ?)")
+            params.extend(apres)
+        
+        etudiants = self._charger_etudiants(
+            " AND ".join(conditions) or None,
+            params,
+            order_by="nom, prenom, id",
+            limite=taille,
+            prefetch=prefetch
         )
         
-        # Charger les notes
-        etudiant.notes = self.obtenir_notes_etudiant(row['id'])
+        if len(etudiants) < taille:
+            return etudiants, None
         
-        # Charger les coefficients
-        etudiant.coefficients = self.obtenir_coefficients(row['id'])
+        dernier = etudiants[-1]
+        return etudiants, (dernier.nom, dernier.prenom, dernier.id)
+    
+    def iterer_pages_etudiants(self, taille=500, promotion=None):
+        """Parcourt tous les étudiants page par page (voir obtenir_page_etudiants)
         
-        return etudiant
+        Yields:
+            Listes d'au plus `taille` étudiants
+        """
+        apres = None
+        while True:
+            etudiants, apres = self.obtenir_page_etudiants(taille, apres, promotion)
+            if etudiants:
+                yield etudiants
+            if apres is None:
+                return
+    
+    def _charger_etudiants(self, where=None, params=(), order_by=None, limite=None,
+                           prefetch=True):
+        """Charge des étudiants avec leurs notes et coefficients en 3 requêtes
+        
+        La même clause WHERE (sur la table etudiants) filtre les étudiants,
+        leurs notes et leurs coefficients : le nombre de requêtes ne dépend
+        pas du nombre d'étudiants chargés.
+        
+        Sans prefetch, une seule requête: les notes et coefficients de chaque
+        étudiant ne seront lus qu'au premier accès (voir precharger), et sa
+        moyenne générale est lue dans notes_agg.
+        """
+        cursor = self.conn.cursor()
+        filtre = f"WHERE {where}" if where else ""
+        tri = f"ORDER BY {order_by}" if order_by else ""
+        if limite is not None:
+            filtre = f"{filtre} {tri} LIMIT {int(limite)}"
+            tri = ""
+        
+        if not prefetch:
+            cursor.execute(f'''
+                SELECT *, (
+                    SELECT AVG(a.somme / a.nombre) FROM notes_agg a
+                    WHERE a.etudiant_id = etudiants.id
+                ) AS moyenne
+                FROM etudiants {filtre} {tri}
+            ''', params)
+            return [
+                Etudiant(
+                    row['id'],
+                    row['nom'],
+                    row['prenom'],
+                    row['promotion'],
+                    row['email'] or "",
+                    row['photo_path'] or "",
+                    chargeur=self._charger_details,
+                    moyenne=row['moyenne'] or 0
+                )
+                for row in cursor.fetchall()
+            ]
+        
+        # Les étudiants
+        cursor.execute(f"SELECT * FROM etudiants {filtre} {tri}", params)
+        etudiants = {}
+        for row in cursor.fetchall():
+            etudiants[row['id']] = Etudiant(
+                row['id'],
+                row['nom'],
+                row['prenom'],
+                row['promotion'],
+                row['email'] or "",
+                row['photo_path'] or ""
+            )
+        
+        if not etudiants:
+            return []
+        
+        # Sans filtre, les lignes orphelines (étudiant supprimé) sont ignorées
+        filtre_ids = f"WHERE etudiant_id IN (SELECT id FROM etudiants {filtre})" if filtre else ""
+        self._remplir_details(etudiants, filtre_ids, params)
+        
+        return list(etudiants.values())
     
-    def exporter_vers_json(self, fichier="data/backup.json"):
-        """Exporte toute la base vers JSON (backup)"""
-        etudiants = self.obtenir_tous_etudiants()
-        data = [e.to_dict() for e in etudiants]
+    def _remplir_details(self, etudiants, filtre_ids, params):
+        """Remplit les notes et coefficients d'étudiants en 2 requêtes
+        
+        Args:
+            etudiants: Dictionnaire {id: Etudiant} à remplir (déjà chargés)
+            filtre_ids: Clause WHERE sur etudiant_id des tables notes et coefficients
+            params: Paramètres de cette clause
+        """
+        # Tuples bruts pour les requêtes volumineuses (pas de sqlite3.Row)
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
         
+        # Toutes les notes (avec leur id), regroupées par étudiant en une seule passe
+        cursor.execute(f'''
+            SELECT etudiant_id, matiere, note, id FROM notes
+            {filtre_ids}
+            ORDER BY etudiant_id, matiere, date_ajout, id
+        ''', params)
+        for etudiant_id, matiere, note, note_id in cursor:
+            etudiant = etudiants.get(etudiant_id)
+            if etudiant is not None:
+                etudiant.charger_note(matiere, note, note_id)
+        
+        # Tous les coefficients
+        cursor.execute(f'''
+            SELECT etudiant_id, matiere, coefficient FROM coefficients
+            {filtre_ids}
+            ORDER BY etudiant_id, matiere
+        ''', params)
+        for etudiant_id, matiere, coefficient in cursor:
+            etudiant = etudiants.get(etudiant_id)
+            if etudiant is not None:
+                etudiant.coefficients[MATIERES.normaliser(matiere)] = coefficient
+        
+        # Coefficients des promotions: un dictionnaire partagé par promotion
+        cursor.execute(
+            "SELECT promotion, matiere, coefficient FROM coefficients_promotion ORDER BY promotion, matiere"
+        )
+        promotions = {}
+        for promotion, matiere, coefficient in cursor:
+            promotions.setdefault(promotion, {})[MATIERES.normaliser(matiere)] = coefficient
+        if promotions:
+            for etudiant in etudiants.values():
+                etudiant.coefficients_promotion = promotions.get(etudiant.promotion, {})
+    
+    def _charger_details(self, etudiant):
+        """Chargeur différé des étudiants obtenus sans prefetch"""
+        with self.lecture():
+            self._remplir_details(
+                {etudiant.id: etudiant}, "WHERE etudiant_id = ?", (etudiant.id,)
+            )
+    
+    @_lecture
+    def precharger(self, etudiants, taille_lot=500):
+        """Charge d'un coup les notes et coefficients d'étudiants obtenus sans
+        prefetch, en 2 requêtes par lot au lieu de 2 par étudiant
+        
+        Args:
+            etudiants: Étudiants à compléter (ceux déjà chargés sont ignorés)
+            taille_lot: Nombre d'étudiants par requête
+        """
+        a_charger = [e for e in etudiants if not e.details_charges]
+        for debut in range(0, len(a_charger), taille_lot):
+            lot = {}
+            for etudiant in a_charger[debut:debut + taille_lot]:
+                etudiant.chargeur = None
+                lot[etudiant.id] = etudiant
+            
+            marqueurs = ", ".join("?" * len(lot))
+            self._remplir_details(lot, f"WHERE etudiant_id IN ({marqueurs})", list(lot))
+    
+    @_lecture
+    def exporter_vers_json(self, fichier="data/backup.json", compact=False):
+        """Exporte toute la base vers JSON (backup)
+        
+        Les étudiants sont lus directement depuis les curseurs et écrits un
+        par un: la mémoire utilisée ne dépend pas de la taille de la base.
+        
+        Args:
+            fichier: Chemin du fichier JSON à écrire
+            compact: Si True, écrit un JSON sans indentation (plus léger)
+        """
         with open(fichier, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.write("[")
+            premier = True
+            
+            for item in self._iterer_enregistrements():
+                if compact:
+                    texte = json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+                else:
+                    texte = json.dumps(item, indent=4, ensure_ascii=False)
+                    texte = "\n    " + texte.replace("\n", "\n    ")
+                
+                f.write(texte if premier else "," + texte)
+                premier = False
+            
+            f.write("]" if premier or compact else "\n]")
         
         return True
     
-    def importer_depuis_json(self, fichier):
-        """Importe des données depuis JSON"""
-        with open(fichier, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        for item in data:
-            etudiant_id = self.ajouter_etudiant(
-                item['nom'],
-                item['prenom'],
-                item['promotion'],
-                item.get('email', ''),
-                item.get('photo_path', '')
+    def _iterer_enregistrements(self):
+        """Parcourt les étudiants sous forme de dictionnaires (format to_dict)
+        
+        Étudiants, notes et coefficients sont lus par trois curseurs triés
+        dans le même ordre et fusionnés au fil de l'eau.
+        """
+        ordre = "e.nom, e.prenom, e.id"
+        
+        etudiants = self.conn.cursor()
+        etudiants.row_factory = None
+        etudiants.execute(f'''
+            SELECT e.id, e.nom, e.prenom, e.promotion, e.email, e.photo_path
+            FROM etudiants e ORDER BY {ordre}
+        ''')
+        
+        notes = self.conn.cursor()
+        notes.row_factory = None
+        notes.execute(f'''
+            SELECT n.etudiant_id, n.matiere, n.note
+            FROM notes n JOIN etudiants e ON e.id = n.etudiant_id
+            ORDER BY {ordre}, n.matiere, n.date_ajout, n.id
+        ''')
+        
+        # Coefficients effectifs (comme Etudiant.coefficients_effectifs): ceux
+        # de la promotion, remplacés par ceux de l'étudiant, puis les autres
+        # coefficients de l'étudiant
+        coefficients = self.conn.cursor()
+        coefficients.row_factory = None
+        coefficients.execute('''
+            SELECT etudiant_id, matiere, coefficient FROM (
+                SELECT e.id AS etudiant_id, cp.matiere, COALESCE(c.coefficient, cp.coefficient) AS coefficient,
+                       e.nom, e.prenom, 0 AS rang
+                FROM etudiants e
+                JOIN coefficients_promotion cp ON cp.promotion = e.promotion
+                LEFT JOIN coefficients c ON c.etudiant_id = e.id AND c.matiere = cp.matiere
+                UNION ALL
+                SELECT c.etudiant_id, c.matiere, c.coefficient, e.nom, e.prenom, 1 AS rang
+                FROM coefficients c JOIN etudiants e ON e.id = c.etudiant_id
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM coefficients_promotion cp
+                    WHERE cp.promotion = e.promotion AND cp.matiere = c.matiere
+                )
+            ) e
+            ORDER BY e.nom, e.prenom, e.etudiant_id, e.rang, e.matiere
+        ''')
+        
+        # Coefficients de promotion (table de petite taille), pour que
+        # l'import les restaure au lieu d'en faire des coefficients d'étudiant
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute("SELECT promotion, matiere, coefficient FROM coefficients_promotion")
+        coefficients_promotion = {}
+        for promotion, matiere, coef in cursor:
+            coefficients_promotion.setdefault(promotion, {})[matiere] = coef
+        
+        note = notes.fetchone()
+        coefficient = coefficients.fetchone()
+        
+        for id_, nom, prenom, promotion, email, photo_path in etudiants:
+            item = {
+                "id": id_,
+                "nom": nom.strip().upper(),
+                "prenom": prenom.strip().capitalize(),
+                "promotion": PROMOTIONS.normaliser(promotion),
+                "email": (email or "").strip().lower(),
+                "photo_path": photo_path or "",
+                "notes": {},
+                "coefficients": {},
+                "coefficients_promotion": dict(coefficients_promotion.get(promotion, {}))
+            }
+            
+            while note is not None and note[0] == id_:
+                item["notes"].setdefault(note[1], []).append(note[2])
+                note = notes.fetchone()
+            
+            while coefficient is not None and coefficient[0] == id_:
+                item["coefficients"][coefficient[1]] = coefficient[2]
+                coefficient = coefficients.fetchone()
+            
+            yield item
+    
+    @_ecriture
+    def importer_depuis_json(self, fichier, taille_lot=500, progression=None):
+        """Importe des données depuis JSON
+        
+        Le fichier est lu au fil de l'eau (il n'est jamais chargé en entier)
+        et tout l'import se fait dans une seule transaction: au moindre
+        enregistrement invalide, rien n'est importé.
+        
+        Les coefficients de promotion exportés (clé coefficients_promotion)
+        sont restaurés, sans remplacer ceux déjà définis dans la base; les
+        coefficients d'étudiant qui leur sont égaux ne sont pas gardés. Les
+        autres coefficients du fichier restent des coefficients d'étudiant: les
+        regrouper en coefficients de promotion (dont hériteraient les futurs
+        étudiants) se demande explicitement avec factoriser_coefficients().
+        
+        Args:
+            fichier: Chemin du fichier JSON (liste d'étudiants)
+            taille_lot: Nombre d'étudiants insérés entre deux envois groupés
+                des notes et coefficients
+            progression: Fonction optionnelle appelée avec le nombre
+                d'étudiants importés après chaque lot
+        
+        Raises:
+            ValueError: Si un enregistrement est invalide (l'import est annulé)
+        """
+        cursor = self.conn.cursor()
+        notes_lot = []
+        coefficients_lot = []
+        coefficients_promotion = {}  # {(promotion, matiere): coefficient} du fichier
+        premier_id = None
+        nombre = 0
+        
+        def envoyer_lot():
+            cursor.executemany(
+                "INSERT INTO notes (etudiant_id, matiere, note) VALUES (?, ?, ?)",
+                notes_lot
             )
+            cursor.executemany('''
+                INSERT OR REPLACE INTO coefficients (etudiant_id, matiere, coefficient)
+                VALUES (?, ?, ?)
+            ''', coefficients_lot)
+            notes_lot.clear()
+            coefficients_lot.clear()
+            if progression:
+                progression(nombre)
+        
+        with self.transaction(), open(fichier, 'r', encoding='utf-8') as f:
+            for index, item in enumerate(_iterer_tableau_json(f)):
+                try:
+                    cursor.execute('''
+                        INSERT INTO etudiants (nom, prenom, promotion, email, photo_path)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (
+                        item['nom'].upper(),
+                        item['prenom'].capitalize(),
+                        PROMOTIONS.normaliser(item['promotion']),
+                        item.get('email', '').lower(),
+                        item.get('photo_path', '')
+                    ))
+                    etudiant_id = cursor.lastrowid
+                    if premier_id is None:
+                        premier_id = etudiant_id
+                    
+                    # Notes
+                    for matiere, notes in item.get('notes', {}).items():
+                        for note in notes:
+                            try:
+                                verifier_note(note)
+                            except ValueError:
+                                raise ValueError(f"note invalide en {matiere}: {note!r}") from None
+                            notes_lot.append((etudiant_id, MATIERES.normaliser(matiere), float(note)))
+                    
+                    # Coefficients
+                    for matiere, coef in item.get('coefficients', {}).items():
+                        if not isinstance(coef, (int, float)) or coef <= 0:
+                            raise ValueError(f"coefficient invalide en {matiere}: {coef!r}")
+                        coefficients_lot.append((etudiant_id, MATIERES.normaliser(matiere), float(coef)))
+                    
+                    # Coefficients de la promotion (mêmes pour tous ses étudiants)
+                    promotion = PROMOTIONS.normaliser(item['promotion'])
+                    for matiere, coef in item.get('coefficients_promotion', {}).items():
+                        if not isinstance(coef, (int, float)) or coef <= 0:
+                            raise ValueError(f"coefficient de promotion invalide en {matiere}: {coef!r}")
+                        cle = (promotion, MATIERES.normaliser(matiere))
+                        if coefficients_promotion.setdefault(cle, float(coef)) != coef:
+                            raise ValueError(f"coefficient de promotion incohérent en {matiere}: {coef!r}")
+                except (KeyError, TypeError, AttributeError, ValueError, sqlite3.Error) as e:
+                    raise ValueError(f"Enregistrement {index} invalide: {e}") from e
+                
+                nombre += 1
+                if nombre % taille_lot == 0:
+                    envoyer_lot()
+            
+            envoyer_lot()
             
-            # Ajouter les notes
-            for matiere, notes in item.get('notes', {}).items():
-                for note in notes:
-                    self.ajouter_note(etudiant_id, matiere, note)
+            if coefficients_promotion:
+                lignes = [(p, m, c) for (p, m), c in coefficients_promotion.items()]
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO coefficients_promotion (promotion, matiere, coefficient)
+                    VALUES (?, ?, ?)
+                ''', lignes)
+                # Coefficients des étudiants importés égaux à celui de leur
+                # promotion (dans le fichier et dans la base): hérités
+                cursor.executemany('''
+                    DELETE FROM coefficients
+                    WHERE etudiant_id >= :premier AND matiere = :matiere AND coefficient = :coef
+                      AND etudiant_id IN (SELECT id FROM etudiants WHERE promotion = :promotion)
+                      AND :coef = (
+                          SELECT coefficient FROM coefficients_promotion
+                          WHERE promotion = :promotion AND matiere = :matiere
+                      )
+                ''', [
+                    {"premier": premier_id, "promotion": p, "matiere": m, "coef": c}
+                    for p, m, c in lignes
+                ])
+        
+        self.vider_cache()
+        return True
+    
+    def sauvegarder(self, fichier, pages_par_etape=256, progression=None, verifier=True):
+        """Sauvegarde binaire de la base avec l'API backup de SQLite
+        
+        La copie se fait par étapes de `pages_par_etape` pages, depuis une
+        connexion dédiée. En mode WAL, elle garde un instantané de la base:
+        ni les lectures ni les écritures ne sont bloquées, et la sauvegarde
+        reflète la base telle qu'elle était au début de la copie. Sans WAL,
+        un instantané bloquerait les écritures pendant toute la copie: le
+        verrou n'est pris que le temps de chaque étape, et une écriture faite
+        entre deux étapes fait recommencer la copie. Selon
+        l'extension, la sauvegarde est compressée au fil de l'eau: .gz (gzip)
+        ou .xz (lzma); sinon c'est une base SQLite directement utilisable.
+        Le fichier n'est remplacé qu'une fois la sauvegarde terminée.
+        
+        Pour échanger des données avec un autre outil, voir exporter_vers_json.
+        
+        Args:
+            fichier: Chemin du fichier de sauvegarde
+            pages_par_etape: Nombre de pages copiées à chaque étape
+            progression: Fonction optionnelle appelée avec (pages copiées,
+                pages totales) après chaque étape
+            verifier: Vérifie l'intégrité de la copie avant de l'écrire
+        
+        Raises:
+            ValueError: Si la copie est corrompue
+        """
+        ouvrir_compresse = _COMPRESSIONS.get(os.path.splitext(fichier)[1].lower())
+        dossier = os.path.dirname(os.path.abspath(fichier))
+        copie = _fichier_temporaire(dossier)
+        compresse = None
+        
+        try:
+            source = self._ouvrir_connexion()
+            destination = sqlite3.connect(copie)
+            try:
+                # En WAL, une transaction de lecture ouverte évite que
+                # chaque écriture faite pendant la copie la fasse recommencer
+                wal = source.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                if wal:
+                    source.execute("BEGIN")
+                    source.execute("SELECT COUNT(*) FROM sqlite_master")
+                source.backup(
+                    destination, pages=pages_par_etape, progress=_suivi_pages(progression)
+                )
+                if wal:
+                    source.rollback()
+                if verifier:
+                    _verifier_integrite(destination)
+            finally:
+                destination.close()
+                source.close()
             
-            # Ajouter les coefficients
-            for matiere, coef in item.get('coefficients', {}).items():
-                self.set_coefficient(etudiant_id, matiere, coef)
+            if ouvrir_compresse is None:
+                os.replace(copie, fichier)
+            else:
+                compresse = _fichier_temporaire(dossier)
+                with open(copie, 'rb') as entree, ouvrir_compresse(compresse, 'wb') as sortie:
+                    shutil.copyfileobj(entree, sortie, 1024 * 1024)
+                os.replace(compresse, fichier)
+        finally:
+            for temporaire in (copie, compresse):
+                if temporaire and os.path.exists(temporaire):
+                    os.remove(temporaire)
+        
+        return True
+    
+    def restaurer(self, fichier, pages_par_etape=256, progression=None, verifier=True):
+        """Remplace le contenu de la base par une sauvegarde (voir sauvegarder)
+        
+        Les sauvegardes gzip et lzma sont reconnues à leur signature et
+        décompressées au fil de l'eau dans un fichier temporaire. Les
+        écritures des autres threads attendent la fin de la restauration.
+        Les compteurs de version_donnees sont avancés, et le cache vidé.
+        
+        Args:
+            fichier: Chemin de la sauvegarde
+            pages_par_etape: Nombre de pages copiées à chaque étape
+            progression: Fonction optionnelle appelée avec (pages copiées,
+                pages totales) après chaque étape
+            verifier: Vérifie l'intégrité de la sauvegarde avant de l'appliquer
+        
+        Raises:
+            ValueError: Si la sauvegarde est corrompue (la base n'est pas modifiée)
+        """
+        with open(fichier, 'rb') as f:
+            entete = f.read(6)
+        ouvrir_compresse = next(
+            (ouvrir for signature, ouvrir in _SIGNATURES.items() if entete.startswith(signature)),
+            None
+        )
+        
+        copie = None
+        try:
+            if ouvrir_compresse is not None:
+                copie = _fichier_temporaire(os.path.dirname(os.path.abspath(self.db_path)))
+                with ouvrir_compresse(fichier, 'rb') as entree, open(copie, 'wb') as sortie:
+                    shutil.copyfileobj(entree, sortie, 1024 * 1024)
+            
+            source = sqlite3.connect(copie or fichier)
+            try:
+                if verifier:
+                    _verifier_integrite(source)
+                
+                with self._acces_ecriture():
+                    versions = self.version_donnees()
+                    source.backup(
+                        self._connexion_ecriture,
+                        pages=pages_par_etape,
+                        progress=_suivi_pages(progression)
+                    )
+                    
+                    # Sauvegarde d'une version antérieure: tables et index manquants
+                    self.creer_tables()
+                    
+                    # Les jetons pris avant la restauration ne doivent plus correspondre
+                    cursor = self.conn.cursor()
+                    for table, compteur in zip(self.TABLES_SUIVIES, versions):
+                        cursor.execute(
+                            "UPDATE modifications SET compteur = MAX(compteur, ?) + 1 WHERE nom_table = ?",
+                            (compteur, table)
+                        )
+                    self.conn.commit()
+                    self.vider_cache()
+            finally:
+                source.close()
+        finally:
+            if copie and os.path.exists(copie):
+                os.remove(copie)
         
         return True
     
     def fermer(self):
-        """Ferme la connexion à la base de données"""
-        self.conn.close()
+        """Ferme toutes les connexions à la base de données"""
+        for connexion in self._connexions_lecture:
+            connexion.close()
+        self._connexions_lecture.clear()
+        self._connexions_libres = queue.LifoQueue()
+        self._connexion_ecriture.close()
     
     def __del__(self):
-        """Ferme automatiquement la connexion"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        """Ferme automatiquement les connexions"""
+        if hasattr(self, '_connexion_ecriture'):
+            self.fermer()
+
+
+def texte_date(valeur):
+    """Convertit une date (date, datetime ou texte ISO) au format de
+    notes.date_ajout: 'AAAA-MM-JJ HH:MM:SS', en UTC comme CURRENT_TIMESTAMP
+    
+    Le résultat est toujours à ce format, que SQLite sait lire et que les
+    filtres par période comparent comme du texte. Une date seule désigne
+    minuit; une date avec fuseau horaire est convertie en UTC, une date
+    sans fuseau est considérée comme déjà en UTC.
+    
+    Raises:
+        ValueError: Si le texte n'est pas une date ISO
+    """
+    if isinstance(valeur, datetime):
+        instant = valeur
+    elif isinstance(valeur, date):
+        instant = datetime(valeur.year, valeur.month, valeur.day)
+    else:
+        try:
+            instant = datetime.fromisoformat(str(valeur).strip())
+        except ValueError:
+            raise ValueError(f"Date invalide: {valeur!r}") from None
+    
+    if instant.tzinfo is not None:
+        instant = instant.astimezone(timezone.utc).replace(tzinfo=None)
+    return instant.isoformat(" ", "seconds")
+
+
+def _texte_mois(valeur):
+    """Mois 'AAAA-MM' d'une date (voir texte_date) ou d'un texte 'AAAA-MM'"""
+    if isinstance(valeur, str) and len(valeur) == 7:
+        return texte_date(valeur + "-01")[:7]
+    return texte_date(valeur)[:7]
+
+
+def _filtre_dates(colonne, debut, fin):
+    """Conditions SQL debut <= colonne < fin (bornes optionnelles)
+    
+    Une date seule (sans heure) désigne minuit: fin=date(2024, 2, 1) inclut
+    tout le 31 janvier.
+    
+    Returns:
+        Tuple (liste de conditions, liste de paramètres)
+    """
+    conditions, params = [], []
+    if debut is not None:
+        conditions.append(f"{colonne} >= ?")
+        params.append(texte_date(debut))
+    if fin is not None:
+        conditions.append(f"{colonne} < ?")
+        params.append(texte_date(fin))
+    return conditions, params
+
+
+# Compression des sauvegardes, selon l'extension (écriture) ou la signature
+# (lecture). Niveaux choisis pour la vitesse: gzip 9 ou xz 6 sont 5 à 7 fois
+# plus lents pour quelques pourcents de gain.
+_COMPRESSIONS = {
+    ".gz": partial(gzip.open, compresslevel=6),
+    ".xz": partial(lzma.open, preset=1)
+}
+_SIGNATURES = {b"\x1f\x8b": gzip.open, b"\xfd7zXZ\x00": lzma.open}
+
+
+def _fichier_temporaire(dossier):
+    """Crée un fichier temporaire vide dans `dossier` et retourne son chemin"""
+    descripteur, chemin = tempfile.mkstemp(suffix=".tmp", dir=dossier)
+    os.close(descripteur)
+    return chemin
+
+
+def _suivi_pages(progression):
+    """Adapte une fonction progression(copiees, totales) à Connection.backup"""
+    if progression is None:
+        return None
+    return lambda statut, restantes, totales: progression(totales - restantes, totales)
+
+
+def _verifier_integrite(conn):
+    """Lève ValueError si la base ouverte par `conn` est corrompue"""
+    try:
+        resultat = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"Sauvegarde invalide: {e}") from e
+    if resultat != "ok":
+        raise ValueError(f"Sauvegarde corrompue: {resultat}")
+
+
+def _iterer_tableau_json(f, taille_bloc=65536):
+    """Parcourt un tableau JSON élément par élément sans le charger en entier
+    
+    Yields:
+        Chaque élément du tableau de premier niveau
+    """
+    decodeur = json.JSONDecoder()
+    tampon = ""
+    pos = 0
+    debut = True
+    
+    while True:
+        # Avancer jusqu'au prochain élément (espaces et virgules ignorés)
+        while True:
+            while pos < len(tampon) and tampon[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(tampon):
+                break
+            tampon, pos = f.read(taille_bloc), 0
+            if not tampon:
+                raise ValueError("Fichier JSON incomplet")
+        
+        if debut:
+            if tampon[pos] != "[":
+                raise ValueError("Le fichier JSON doit contenir une liste d'étudiants")
+            debut = False
+            pos += 1
+            continue
+        
+        if tampon[pos] == "]":
+            return
+        
+        # Décoder l'élément, en lisant la suite du fichier s'il est coupé
+        while True:
+            try:
+                element, pos = decodeur.raw_decode(tampon, pos)
+                break
+            except json.JSONDecodeError:
+                bloc = f.read(taille_bloc)
+                if not bloc:
+                    raise
+                tampon, pos = tampon[pos:] + bloc, 0
+        
+        yield element
@@ -0,0 +1,144 @@
+"""Façade asyncio pour Database
+
+Chaque appel est exécuté dans un thread dédié qui possède sa propre
+connexion SQLite: la boucle asyncio n'est jamais bloquée par la base.
+
+Exemple:
+    async with AsyncDatabase("data/etudiants.db", lecteurs=2) as db:
+        etudiant_id = await db.ajouter_etudiant("Dupont", "Jean", "L1")
+        etudiants = await db.obtenir_etudiants_par_promotion("L1")
+"""
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+
+from services.database import Database
+
+
+class AsyncDatabase:
+    """Expose les méthodes publiques de Database sous forme de coroutines
+    
+    - Les écritures passent par un unique thread (une seule connexion).
+    - Avec lecteurs > 0, la base passe en mode WAL et les lectures sont
+      réparties sur autant de threads lecteurs, en parallèle des écritures.
+    - Au plus `taille_file` appels sont en attente à la fois: au-delà, les
+      appelants attendent (contre-pression).
+    - Annuler la tâche appelante annule l'appel s'il n'a pas encore démarré.
+    """
+    
+    # Méthodes envoyées aux threads lecteurs
+    PREFIXES_LECTURE = ("obtenir_", "rechercher_", "recherche_", "nombre_", "verifier_")
+    
+    # Méthodes qui n'ont pas de sens hors du thread de la base: utiliser executer()
+    NON_SUPPORTEES = ("transaction", "iterer_pages_etudiants")
+    
+    def __init__(self, db_path="data/etudiants.db", taille_file=64, lecteurs=0):
+        """Démarre le thread d'écriture et les éventuels threads lecteurs"""
+        self.db_path = db_path
+        self._limite = asyncio.Semaphore(taille_file)
+        self._file_ecriture = queue.Queue()
+        self._file_lecture = queue.Queue()
+        self._threads = []
+        
+        self._demarrer(self._file_ecriture, wal=lecteurs > 0)
+        for _ in range(lecteurs):
+            # Chaque thread a sa propre Database: le cache d'un lecteur ne
+            # verrait pas les écritures du thread d'écriture
+            self._demarrer(self._file_lecture, wal=False, taille_cache=0)
+    
+    def _demarrer(self, file, **options):
+        """Lance un thread de travail et attend que sa connexion soit ouverte
+        
+        Les options sont transmises au constructeur de Database.
+        """
+        pret = threading.Event()
+        erreurs = []
+        
+        thread = threading.Thread(
+            target=self._boucle,
+            args=(file, options, pret, erreurs),
+            name=f"AsyncDatabase-{len(self._threads)}",
+            daemon=True
+        )
+        thread.start()
+        pret.wait()
+        
+        if erreurs:
+            raise erreurs[0]
+        self._threads.append((thread, file))
+    
+    def _boucle(self, file, options, pret, erreurs):
+        """Boucle d'un thread de travail: exécute les appels de sa file"""
+        try:
+            db = Database(self.db_path, **options)
+        except Exception as e:
+            erreurs.append(e)
+            pret.set()
+            return
+        pret.set()
+        
+        while True:
+            tache = file.get()
+            if tache is None:
+                break
+            
+            futur, fonction, args, kwargs = tache
+            if not futur.set_running_or_notify_cancel():
+                continue  # Annulé avant d'avoir démarré
+            
+            try:
+                futur.set_result(fonction(db, *args, **kwargs))
+            except BaseException as e:
+                futur.set_exception(e)
+        
+        db.fermer()
+    
+    async def executer(self, fonction, *args, lecture=False, **kwargs):
+        """Exécute fonction(db, *args, **kwargs) dans un thread de la base
+        
+        Permet de regrouper plusieurs opérations, par exemple une transaction:
+            def saisir(db, notes):
+                with db.transaction():
+                    for etudiant_id, note in notes:
+                        db.ajouter_note(etudiant_id, "Physique", note)
+            
+            await adb.executer(saisir, notes)
+        """
+        lecteurs_disponibles = len(self._threads) > 1
+        file = self._file_lecture if lecture and lecteurs_disponibles else self._file_ecriture
+        
+        async with self._limite:
+            futur = concurrent.futures.Future()
+            file.put((futur, fonction, args, kwargs))
+            return await asyncio.wrap_future(futur)
+    
+    def __getattr__(self, nom):
+        """Transforme une méthode publique de Database en coroutine"""
+        methode = getattr(Database, nom, None)
+        if nom.startswith("_") or nom in self.NON_SUPPORTEES or not callable(methode):
+            raise AttributeError(f"'AsyncDatabase' n'a pas d'attribut '{nom}'")
+        
+        lecture = nom.startswith(self.PREFIXES_LECTURE)
+        
+        async def appel(*args, **kwargs):
+            return await self.executer(methode, *args, lecture=lecture, **kwargs)
+        
+        appel.__name__ = nom
+        appel.__doc__ = methode.__doc__
+        return appel
+    
+    async def fermer(self):
+        """Termine les appels en cours puis ferme toutes les connexions"""
+        threads, self._threads = self._threads, []
+        for thread, file in threads:
+            file.put(None)
+        
+        await asyncio.to_thread(lambda: [thread.join() for thread, _ in threads])
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.fermer()
@@ -1,16 +1,24 @@
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-from collections import defaultdict
 import numpy as np
 
+from services.histogramme import Histogramme
+from services.statistiques import (
+    repartition_mentions, moyennes_par_promotion, liste_moyennes, meilleurs_etudiants
+)
+
 # Configuration de matplotlib pour un rendu moderne
 plt.style.use('default')
 plt.rcParams['font.family'] = 'sans-serif'
 plt.rcParams['font.size'] = 10
 
 class Graphiques:
-    """Gestionnaire de création de graphiques pour l'application"""
+    """Gestionnaire de création de graphiques pour l'application
+    
+    Les graphiques de cohorte acceptent une liste d'étudiants ou un
+    TableauEtudiants (calculs vectorisés, voir services.tableau_etudiants).
+    """
     
     # Palette de couleurs moderne
     COLORS = {
@@ -26,16 +34,7 @@ class Graphiques:
     @staticmethod
     def graphique_mentions(etudiants, parent_widget=None):
         """Crée un graphique en camembert des mentions"""
-        mentions = {
-            "Très Bien": 0,
-            "Bien": 0,
-            "Assez Bien": 0,
-            "Passable": 0,
-            "Insuffisant": 0
-        }
-        
-        for e in etudiants:
-            mentions[e.get_mention()] += 1
+        mentions = repartition_mentions(etudiants)
         
         # Filtrer les mentions à 0
         mentions_filtered = {k: v for k, v in mentions.items() if v > 0}
@@ -75,16 +74,13 @@ class Graphiques:
     @staticmethod
     def graphique_moyennes_par_promotion(etudiants, parent_widget=None):
         """Crée un histogramme des moyennes par promotion"""
-        promos = defaultdict(list)
-        
-        for e in etudiants:
-            promos[e.promotion].append(e.moyenne_generale())
+        promos = moyennes_par_promotion(etudiants)
         
         if not promos:
             return None
         
         promotions = sorted(promos.keys())
-        moyennes = [sum(promos[p])/len(promos[p]) for p in promotions]
+        moyennes = [promos[p] for p in promotions]
         
         fig, ax = plt.subplots(figsize=(9, 6))
         
@@ -273,17 +269,21 @@ class Graphiques:
     @staticmethod
     def graphique_distribution_moyennes(etudiants, parent_widget=None):
         """Crée un histogramme de distribution des moyennes générales"""
-        if not etudiants:
+        if not len(etudiants):
             return None
         
-        moyennes = [e.moyenne_generale() for e in etudiants]
+        # Effectifs par point de moyenne, comptés sans trier les moyennes
+        histogramme = Histogramme.depuis_valeurs(liste_moyennes(etudiants), divisions=1)
+        bornes, effectifs = histogramme.regrouper(1)
         
         fig, ax = plt.subplots(figsize=(9, 6))
         
         # Histogramme
-        n, bins, patches = ax.hist(
-            moyennes,
-            bins=20,
+        patches = ax.bar(
+            bornes,
+            effectifs,
+            width=1,
+            align='edge',
             color=Graphiques.COLORS['primary'],
             alpha=0.7,
             edgecolor='black',
@@ -291,8 +291,8 @@ class Graphiques:
         )
         
         # Colorer selon les tranches de notes
-        for i, patch in enumerate(patches):
-            bin_center = (bins[i] + bins[i+1]) / 2
+        for borne, patch in zip(bornes, patches):
+            bin_center = borne + 0.5
             if bin_center >= 14:
                 patch.set_facecolor(Graphiques.COLORS['success'])
             elif bin_center >= 10:
@@ -301,7 +301,7 @@ class Graphiques:
                 patch.set_facecolor(Graphiques.COLORS['danger'])
         
         # Ligne de moyenne
-        moyenne_globale = sum(moyennes) / len(moyennes)
+        moyenne_globale = histogramme.moyenne()
         ax.axvline(
             x=moyenne_globale,
             color=Graphiques.COLORS['warning'],
@@ -373,26 +373,23 @@ class Graphiques:
         return fig
     
     @staticmethod
-    def graphique_top_etudiants(etudiants, n=10, parent_widget=None):
-        """Crée un graphique des top N étudiants"""
-        if not etudiants:
+    def graphique_top_etudiants(etudiants, n=10, parent_widget=None, ponderee=False):
+        """Crée un graphique des top N étudiants (ponderee: classés sur la
+        moyenne pondérée par les coefficients)"""
+        if not len(etudiants):
             return None
         
-        # Trier par moyenne décroissante
-        etudiants_tries = sorted(
-            etudiants,
-            key=lambda e: e.moyenne_generale(),
-            reverse=True
-        )[:n]
+        # Les n premiers par moyenne décroissante (sans trier toute la cohorte)
+        meilleurs = meilleurs_etudiants(etudiants, n, ponderee=ponderee)
         
-        noms = [f"{e.prenom} {e.nom[0]}." for e in etudiants_tries]
-        moyennes = [e.moyenne_generale() for e in etudiants_tries]
+        noms = [f"{e['prenom']} {e['nom'][0]}." for e in meilleurs]
+        moyennes = [e['moyenne'] for e in meilleurs]
         
         fig, ax = plt.subplots(figsize=(10, 6))
         
         bars = ax.barh(noms, moyennes, color=Graphiques.COLORS['success'], alpha=0.8, edgecolor='black')
         
-        ax.set_xlabel('Moyenne Générale', fontsize=12, fontweight='bold')
+        ax.set_xlabel('Moyenne Pondérée' if ponderee else 'Moyenne Générale', fontsize=12, fontweight='bold')
         ax.set_title(f'Top {n} des Meilleurs Étudiants', fontsize=14, fontweight='bold', pad=20)
         ax.set_xlim(0, 20)
         ax.grid(axis='x', alpha=0.3, linestyle='--')
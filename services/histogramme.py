@@ -0,0 +1,216 @@
+"""Histogrammes de comptage des notes (bornées entre 0 et 20)
+
+Les notes sont comptées par pas de 1/divisions de point (quart de point par
+défaut): l'histogramme a une taille fixe (81 cases), quel que soit le
+nombre de notes. Médiane, quantiles, min, max et effectifs par tranche s'en
+déduisent en O(cases) au lieu d'un tri, et les histogrammes s'additionnent:
+ceux de chaque promotion donnent celui de l'école, ceux de chaque matière
+celui d'une promotion.
+
+Les résultats sont exacts tant que toutes les valeurs tombent sur la grille
+(voir `exact`). Sinon une valeur est comptée dans la case de sa borne
+inférieure: médiane et quantiles sont arrondis au pas inférieur, mais les
+effectifs par tranche (compter_tranches) restent exacts pour des bornes sur
+la grille, comme les seuils des mentions.
+
+Exemple:
+    from services import statistiques
+    from services.histogramme import Histogramme
+    
+    h = Histogramme.depuis_valeurs([12, 13.5, 8.25, 15])
+    h.mediane()  # 12.75
+    h.quantile(0.9)
+    statistiques.resume_histogramme(h)  # même format que resume_notes
+    ecole = sum(histogrammes_promotions.values(), Histogramme())
+"""
+
+import math
+
+import numpy as np
+
+NOTE_MAX = 20
+
+
+class Histogramme:
+    """Effectifs de valeurs entre 0 et NOTE_MAX, par pas de 1/divisions
+    
+    Attributs (à lire, pas à modifier):
+        divisions: nombre de cases par point (puissance de 2: les bornes des
+            cases sont alors exactes en flottant)
+        comptes: effectif de chaque case (case k: [k / divisions, (k + 1) / divisions[)
+        somme, somme_carres: Σx et Σx² des valeurs ajoutées
+        minimum, maximum: plus petite et plus grande valeur ajoutée
+        hors_grille: nombre de valeurs qui ne sont pas un multiple du pas
+    """
+    
+    def __init__(self, divisions=4):
+        if divisions < 1 or divisions & (divisions - 1):
+            raise ValueError("divisions doit être une puissance de 2 (1, 2, 4, 8...)")
+        self.divisions = divisions
+        self.comptes = np.zeros(NOTE_MAX * divisions + 1, dtype=np.int64)
+        self.somme = 0.0
+        self.somme_carres = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.hors_grille = 0
+    
+    @classmethod
+    def depuis_valeurs(cls, valeurs, divisions=4):
+        """Histogramme d'une séquence de valeurs"""
+        histogramme = cls(divisions)
+        histogramme.ajouter(valeurs)
+        return histogramme
+    
+    @classmethod
+    def par_groupes(cls, valeurs, codes, nombre_groupes, divisions=4):
+        """Un histogramme par groupe (par exemple par code de matière), en un
+        seul comptage
+        
+        Returns:
+            Liste des histogrammes, indexée par code de groupe
+        """
+        valeurs = _verifier(valeurs)
+        codes = np.asarray(codes, dtype=np.int64)
+        histogrammes = [cls(divisions) for _ in range(nombre_groupes)]
+        taille = len(histogrammes[0].comptes) if histogrammes else 0
+        
+        index = _index(valeurs, divisions)
+        comptes = np.bincount(codes * taille + index, minlength=nombre_groupes * taille)
+        sommes = np.bincount(codes, weights=valeurs, minlength=nombre_groupes)
+        sommes_carres = np.bincount(codes, weights=valeurs * valeurs, minlength=nombre_groupes)
+        hors_grille = np.bincount(codes[index != valeurs * divisions], minlength=nombre_groupes)
+        minimums = np.full(nombre_groupes, math.inf)
+        maximums = np.full(nombre_groupes, -math.inf)
+        np.minimum.at(minimums, codes, valeurs)
+        np.maximum.at(maximums, codes, valeurs)
+        
+        for code, histogramme in enumerate(histogrammes):
+            histogramme.comptes = comptes[code * taille:(code + 1) * taille]
+            histogramme.somme = float(sommes[code])
+            histogramme.somme_carres = float(sommes_carres[code])
+            histogramme.minimum = float(minimums[code])
+            histogramme.maximum = float(maximums[code])
+            histogramme.hors_grille = int(hors_grille[code])
+        return histogrammes
+    
+    def ajouter(self, valeurs):
+        """Compte des valeurs supplémentaires
+        
+        Raises:
+            ValueError: Si une valeur n'est pas un nombre entre 0 et NOTE_MAX
+        """
+        valeurs = _verifier(valeurs)
+        if not len(valeurs):
+            return
+        
+        index = _index(valeurs, self.divisions)
+        self.comptes = self.comptes + np.bincount(index, minlength=len(self.comptes))
+        self.somme += float(valeurs.sum())
+        self.somme_carres += float(np.dot(valeurs, valeurs))
+        self.minimum = min(self.minimum, float(valeurs.min()))
+        self.maximum = max(self.maximum, float(valeurs.max()))
+        self.hors_grille += int(np.count_nonzero(index != valeurs * self.divisions))
+    
+    def __add__(self, autre):
+        """Fusion de deux histogrammes (même résolution)"""
+        if not isinstance(autre, Histogramme):
+            return NotImplemented
+        if autre.divisions != self.divisions:
+            raise ValueError("Histogrammes de résolutions différentes")
+        
+        fusion = Histogramme(self.divisions)
+        fusion.comptes = self.comptes + autre.comptes
+        fusion.somme = self.somme + autre.somme
+        fusion.somme_carres = self.somme_carres + autre.somme_carres
+        fusion.minimum = min(self.minimum, autre.minimum)
+        fusion.maximum = max(self.maximum, autre.maximum)
+        fusion.hors_grille = self.hors_grille + autre.hors_grille
+        return fusion
+    
+    def __len__(self):
+        return int(self.comptes.sum())
+    
+    @property
+    def exact(self):
+        """Toutes les valeurs sont sur la grille: médiane et quantiles exacts"""
+        return not self.hors_grille
+    
+    def valeurs_cases(self):
+        """Borne inférieure de chaque case"""
+        return np.arange(len(self.comptes)) / self.divisions
+    
+    def _valeur_rang(self, rang):
+        """Valeur de rang donné (0 pour la plus petite) dans l'ordre croissant"""
+        case = int(np.searchsorted(np.cumsum(self.comptes), rang, side="right"))
+        return case / self.divisions
+    
+    def mediane(self):
+        """Médiane (comme statistics.median), None si l'histogramme est vide"""
+        nombre = len(self)
+        if not nombre:
+            return None
+        return (self._valeur_rang((nombre - 1) // 2) + self._valeur_rang(nombre // 2)) / 2
+    
+    def quantile(self, q):
+        """Quantile d'ordre q (entre 0 et 1), par interpolation linéaire entre
+        les deux valeurs encadrantes (méthode par défaut de np.quantile)
+        
+        Returns:
+            Le quantile, None si l'histogramme est vide
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q doit être entre 0 et 1")
+        nombre = len(self)
+        if not nombre:
+            return None
+        
+        position = (nombre - 1) * q
+        rang = math.floor(position)
+        bas = self._valeur_rang(rang)
+        if rang + 1 >= nombre:
+            return bas
+        return bas + (position - rang) * (self._valeur_rang(rang + 1) - bas)
+    
+    def compter_tranches(self, bornes):
+        """Effectifs des tranches délimitées par des bornes croissantes
+        
+        Returns:
+            Tableau de len(bornes) + 1 effectifs: valeurs < bornes[0], puis
+            bornes[i] <= valeur < bornes[i + 1], ..., puis valeurs >= bornes[-1]
+        """
+        bornes = np.asarray(bornes, dtype=np.float64) * self.divisions
+        if np.any(bornes != np.floor(bornes)):
+            raise ValueError("Les bornes doivent être des multiples du pas")
+        cumul = np.concatenate(([0], np.cumsum(self.comptes)))
+        coupes = cumul[np.clip(bornes.astype(np.int64), 0, len(self.comptes))]
+        return np.diff(np.concatenate(([0], coupes, [cumul[-1]])))
+    
+    def regrouper(self, largeur=1):
+        """Effectifs par intervalles de `largeur` points, pour un graphique
+        
+        La dernière case (valeurs égales à NOTE_MAX) est rattachée au dernier
+        intervalle, fermé à droite.
+        
+        Returns:
+            Tuple (bornes inférieures des intervalles, effectifs)
+        """
+        bornes = np.arange(0, NOTE_MAX, largeur)
+        return bornes, self.compter_tranches(bornes[1:])
+    
+    def moyenne(self):
+        """Moyenne des valeurs, None si l'histogramme est vide"""
+        nombre = len(self)
+        return self.somme / nombre if nombre else None
+
+
+def _verifier(valeurs):
+    """Valeurs en float64, toutes entre 0 et NOTE_MAX"""
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    if len(valeurs) and not (valeurs.min() >= 0 and valeurs.max() <= NOTE_MAX):
+        raise ValueError(f"Les valeurs doivent être des nombres entre 0 et {NOTE_MAX}")
+    return valeurs
+
+
+def _index(valeurs, divisions):
+    """Case de chaque valeur (divisions est une puissance de 2: le produit est exact)"""
+    return np.floor(valeurs * divisions).astype(np.int64)
@@ -31,7 +31,7 @@ def generer_rapport_etudiant(etudiant):
     # Détails par matière
     for matiere, notes in sorted(etudiant.notes.items()):
         rapport["notes_par_matiere"][matiere] = {
-            "notes": notes,
+            "notes": notes.tolist(),
             "nombre_notes": len(notes),
             "moyenne": round(etudiant.moyenne_matiere(matiere), 2),
             "meilleure_note": max(notes),
@@ -1,16 +1,132 @@
-from statistics import median, stdev
+"""Statistiques sur une liste d'étudiants
+
+Chaque fonction qui prend `etudiants` accepte aussi un TableauEtudiants
+(services.tableau_etudiants): le calcul est alors vectorisé avec NumPy, et
+les résultats ont le même format.
+"""
+
+import heapq
+import math
+from array import array
+from fractions import Fraction
+from operator import itemgetter
+
+import numpy as np
+
+from models.etudiant import mention_pour
+from services.histogramme import Histogramme
+from services.tableau_etudiants import MENTIONS, SEUILS_MENTIONS, TableauEtudiants, statistiques_groupes
+
+# Nombre de valeurs lues à la fois par resume_notes (512 Ko de float64)
+TAILLE_BLOC = 65_536
+
+# Rangs des ex aequo dans classement_etudiants
+METHODES_RANGS = ("ordinal", "competition", "dense")
 
 def moyenne(liste):
     """Calcule la moyenne d'une liste de nombres"""
     return sum(liste) / len(liste) if liste else 0
 
-def moyenne_generale(etudiant):
-    """Calcule la moyenne générale d'un étudiant"""
-    if not etudiant.notes:
+def resume_notes(valeurs, triees=False):
+    """Nombre, moyenne, médiane, max, min et écart-type (d'échantillon) en
+    un seul parcours des valeurs
+    
+    Les valeurs sont lues par blocs qui tiennent en cache; chaque bloc ajoute
+    sa somme, son min, son max et les sommes des écarts x - c et (x - c)² à
+    la première valeur c. Ce décalage évite la perte de précision de
+    Σx² - (Σx)²/n (comme l'algorithme de Welford) tout en gardant des sommes
+    exactes pour des notes au quart de point: l'écart-type est alors
+    identique à celui de statistics.stdev et de services.statistiques_sql.
+    La médiane est ensuite obtenue par sélection (np.partition, linéaire)
+    et non par un tri.
+    
+    Args:
+        valeurs: Séquence de nombres (liste, array('d'), tableau NumPy)
+        triees: Les valeurs sont déjà triées (croissantes): la médiane est
+            lue directement, sans sélection
+    
+    Returns:
+        Dictionnaire {nombre_notes, moyenne, mediane, max, min, ecart_type}
+        (ecart_type vaut 0 pour une seule valeur), None si valeurs est vide
+    """
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    nombre = len(valeurs)
+    if not nombre:
+        return None
+    
+    decalage = valeurs[0]
+    somme = ecarts = ecarts_carres = 0.0
+    mini, maxi = math.inf, -math.inf
+    for debut in range(0, nombre, TAILLE_BLOC):
+        bloc = valeurs[debut:debut + TAILLE_BLOC]
+        ecart = bloc - decalage
+        somme += float(bloc.sum())
+        ecarts += float(ecart.sum())
+        ecarts_carres += float(np.dot(ecart, ecart))
+        mini = min(mini, float(bloc.min()))
+        maxi = max(maxi, float(bloc.max()))
+    
+    # Médiane: (bas + haut) / 2 comme statistics.median, bas == haut si n est impair
+    bas, haut = (nombre - 1) // 2, nombre // 2
+    if not triees:
+        valeurs = np.partition(valeurs, (bas, haut))
+    
+    return {
+        "nombre_notes": nombre,
+        "moyenne": somme / nombre,
+        "mediane": float(valeurs[bas] + valeurs[haut]) / 2,
+        "max": maxi,
+        "min": mini,
+        "ecart_type": ecart_type_moments(nombre, ecarts, ecarts_carres)
+    }
+
+def ecart_type_moments(nombre, somme, somme_carres):
+    """Écart-type d'échantillon à partir de n, Σx et Σx²
+    
+    Calcul exact en fractions puis racine correctement arrondie, comme
+    statistics.stdev: le résultat est identique dès que Σx et Σx² sont
+    exacts (notes au quart de point, demi-point...). Les x peuvent être
+    décalés d'une même constante, l'écart-type n'en dépend pas.
+    """
+    if nombre < 2:
         return 0
     
-    moyennes = [moyenne(notes) for notes in etudiant.notes.values()]
-    return moyenne(moyennes)
+    somme = Fraction(somme)
+    variance = (Fraction(somme_carres) - somme * somme / nombre) / (nombre - 1)
+    if variance <= 0:
+        return 0.0
+    
+    n, m = variance.numerator, variance.denominator
+    q = (n.bit_length() - m.bit_length() - 109) // 2
+    if q >= 0:
+        racine = math.isqrt(n // (m << 2 * q))
+        racine |= racine * racine * (m << 2 * q) != n
+        return float(racine << q)
+    racine = math.isqrt((n << -2 * q) // m)
+    racine |= racine * racine * m != n << -2 * q
+    return racine / (1 << -q)
+
+def resume_histogramme(histogramme):
+    """Statistiques d'un Histogramme, au format de resume_notes
+    
+    La médiane est lue dans les effectifs cumulés (O(cases), quel que soit le
+    nombre de notes): elle n'est exacte que si histogramme.exact.
+    """
+    nombre = len(histogramme)
+    if not nombre:
+        return None
+    return {
+        "nombre_notes": nombre,
+        "moyenne": histogramme.somme / nombre,
+        "mediane": histogramme.mediane(),
+        "max": histogramme.maximum,
+        "min": histogramme.minimum,
+        "ecart_type": ecart_type_moments(nombre, histogramme.somme, histogramme.somme_carres)
+    }
+
+def moyenne_generale(etudiant):
+    """Calcule la moyenne générale d'un étudiant"""
+    return etudiant.moyenne_generale()
 
 def stats_par_matiere(etudiants):
     """Calcule les statistiques par matière pour tous les étudiants
@@ -18,26 +134,30 @@ def stats_par_matiere(etudiants):
     Returns:
         Dictionnaire imbriqué avec statistiques détaillées par matière
     """
+    if isinstance(etudiants, TableauEtudiants):
+        return _stats_matieres_tableau(etudiants, avec_notes=True)
+    
     stats = {}
     
-    # Collecte des notes par matière
+    # Collecte des notes par matière (copies directes des array('d'))
     for e in etudiants:
         for matiere, notes in e.notes.items():
-            stats.setdefault(matiere, []).extend(notes)
+            stats.setdefault(matiere, array('d')).extend(notes)
     
-    # Calcul des statistiques
+    # Calcul des statistiques: sur l'histogramme des notes si elles sont
+    # toutes au quart de point (la liste triée s'en déduit sans tri),
+    # sinon après un tri, qui sert aussi à la médiane
     resultats = {}
     for matiere, notes in stats.items():
         if notes:
-            resultats[matiere] = {
-                "nombre_notes": len(notes),
-                "moyenne": moyenne(notes),
-                "mediane": median(notes),
-                "max": max(notes),
-                "min": min(notes),
-                "ecart_type": stdev(notes) if len(notes) > 1 else 0,
-                "notes": sorted(notes, reverse=True)
-            }
+            histogramme = Histogramme.depuis_valeurs(np.frombuffer(notes))
+            if histogramme.exact:
+                resultats[matiere] = resume_histogramme(histogramme)
+                resultats[matiere]["notes"] = _notes_decroissantes(histogramme)
+            else:
+                triees = np.sort(np.frombuffer(notes))
+                resultats[matiere] = resume_notes(triees, triees=True)
+                resultats[matiere]["notes"] = triees[::-1].tolist()
     
     return resultats
 
@@ -47,6 +167,9 @@ def stats_promotion(etudiants, promotion):
     Returns:
         Dictionnaire avec statistiques par matière et globales
     """
+    if isinstance(etudiants, TableauEtudiants):
+        return _stats_promotion_tableau(etudiants, promotion)
+    
     etudiants_promo = [e for e in etudiants if e.promotion == promotion]
     
     if not etudiants_promo:
@@ -59,7 +182,7 @@ def stats_promotion(etudiants, promotion):
     for e in etudiants_promo:
         moyennes_generales.append(e.moyenne_generale())
         for matiere, notes in e.notes.items():
-            stats.setdefault(matiere, []).extend(notes)
+            stats.setdefault(matiere, array('d')).extend(notes)
     
     # Calcul des statistiques
     resultats = {
@@ -71,72 +194,117 @@ def stats_promotion(etudiants, promotion):
     
     for matiere, notes in stats.items():
         if notes:
-            resultats["matieres"][matiere] = {
-                "nombre_notes": len(notes),
-                "moyenne": moyenne(notes),
-                "mediane": median(notes),
-                "max": max(notes),
-                "min": min(notes),
-                "ecart_type": stdev(notes) if len(notes) > 1 else 0
-            }
+            resultats["matieres"][matiere] = resume_notes(notes)
     
     # Statistiques globales de la promotion
     if moyennes_generales:
+        resume = resume_notes(moyennes_generales)
         resultats["global"] = {
-            "moyenne_generale": moyenne(moyennes_generales),
-            "mediane": median(moyennes_generales),
-            "meilleure_moyenne": max(moyennes_generales),
-            "moins_bonne_moyenne": min(moyennes_generales),
-            "ecart_type": stdev(moyennes_generales) if len(moyennes_generales) > 1 else 0
+            "moyenne_generale": resume["moyenne"],
+            "mediane": resume["mediane"],
+            "meilleure_moyenne": resume["max"],
+            "moins_bonne_moyenne": resume["min"],
+            "ecart_type": resume["ecart_type"]
         }
     
     return resultats
 
-def classement_etudiants(etudiants, par_promotion=False):
+def classement_etudiants(etudiants, par_promotion=False, rangs="ordinal", ponderee=False):
     """Classe les étudiants par moyenne générale
     
+    Args:
+        par_promotion: Un classement par promotion
+        rangs: Rangs des ex aequo (voir METHODES_RANGS): "ordinal" (1, 2,
+            3, 4: position dans le classement), "competition" (1, 2, 2, 4)
+            ou "dense" (1, 2, 2, 3)
+        ponderee: Classer sur la moyenne pondérée par les coefficients
+            (moyenne et mention du résultat sont alors celles-ci)
+    
     Returns:
-        Liste de tuples (rang, etudiant, moyenne, mention)
+        Liste de dictionnaires (rang, id, nom, prénom, promotion, moyenne,
+        mention, nombre de matières), du premier au dernier; avec
+        par_promotion, dictionnaire {promotion: liste}
     """
+    _verifier_rangs(rangs)
+    if isinstance(etudiants, TableauEtudiants):
+        if par_promotion:
+            codes = etudiants.promotion_codes
+            return {
+                etudiants.promotions[code]: _classement_tableau(
+                    etudiants.filtrer(codes == code), rangs=rangs, ponderee=ponderee
+                )
+                for code in np.unique(codes).tolist()
+            }
+        return _classement_tableau(etudiants, rangs=rangs, ponderee=ponderee)
+    
     if par_promotion:
-        classements = {}
-        promotions = set(e.promotion for e in etudiants)
-        
-        for promo in promotions:
-            etudiants_promo = [e for e in etudiants if e.promotion == promo]
-            classements[promo] = _classement_helper(etudiants_promo)
-        
-        return classements
+        promotions = {}
+        for e in etudiants:
+            promotions.setdefault(e.promotion, []).append(e)
+        return {
+            promo: _classement_helper(etudiants_promo, rangs=rangs, ponderee=ponderee)
+            for promo, etudiants_promo in promotions.items()
+        }
     else:
-        return _classement_helper(etudiants)
+        return _classement_helper(etudiants, rangs=rangs, ponderee=ponderee)
 
-def _classement_helper(etudiants):
-    """Fonction helper pour le classement"""
+def _classement_helper(etudiants, n=None, rangs="ordinal", ponderee=False):
+    """Fonction helper pour le classement
+    
+    Chaque moyenne n'est calculée qu'une fois. Pour les n premiers seulement,
+    un tas (heapq.nlargest, O(N log n)) remplace le tri complet; à égalité,
+    l'ordre de la liste est conservé dans les deux cas.
+    """
     if not etudiants:
         return []
     
+    if ponderee:
+        paires = [(e.moyenne_generale_ponderee(), e) for e in etudiants]
+    else:
+        paires = [(e.moyenne_generale(), e) for e in etudiants]
+    
     # Trier par moyenne décroissante
-    etudiants_tries = sorted(
-        etudiants,
-        key=lambda e: e.moyenne_generale(),
-        reverse=True
-    )
+    if n is None or n >= len(paires):
+        paires.sort(key=itemgetter(0), reverse=True)
+    else:
+        paires = heapq.nlargest(n, paires, key=itemgetter(0))
     
     classement = []
-    for rang, e in enumerate(etudiants_tries, 1):
+    for rang, (moy, e) in zip(_rangs([moy for moy, _ in paires], rangs), paires):
         classement.append({
             "rang": rang,
             "id": e.id,
             "nom": e.nom,
             "prenom": e.prenom,
             "promotion": e.promotion,
-            "moyenne": e.moyenne_generale(),
-            "mention": e.get_mention(),
+            "moyenne": moy,
+            "mention": mention_pour(moy),
             "nombre_matieres": e.nombre_matieres()
         })
     
     return classement
 
+def _verifier_rangs(rangs):
+    if rangs not in METHODES_RANGS:
+        raise ValueError(f"rangs doit valoir {', '.join(METHODES_RANGS)}: {rangs!r}")
+
+def _rangs(moyennes, methode):
+    """Rangs d'une suite de moyennes déjà classées (décroissantes)
+    
+    Returns:
+        Liste des rangs (1 pour le premier), les ex aequo étant les moyennes égales
+    """
+    nombre = len(moyennes)
+    if methode == "ordinal" or not nombre:
+        return list(range(1, nombre + 1))
+    
+    moyennes = np.asarray(moyennes, dtype=np.float64)
+    nouveau = np.concatenate(([True], moyennes[1:] != moyennes[:-1]))
+    if methode == "dense":
+        return np.cumsum(nouveau).tolist()
+    # "competition": position du premier ex aequo
+    return (np.maximum.accumulate(np.where(nouveau, np.arange(nombre), 0)) + 1).tolist()
+
 def repartition_mentions(etudiants):
     """Calcule la répartition des mentions
     
@@ -151,10 +319,10 @@ def repartition_mentions(etudiants):
         "Insuffisant": 0
     }
     
-    for e in etudiants:
-        mention = e.get_mention()
-        mentions[mention] += 1
-    
+    # Les seuils des mentions sont sur la grille: effectifs exacts
+    histogramme = Histogramme.depuis_valeurs(liste_moyennes(etudiants))
+    nombres = histogramme.compter_tranches(SEUILS_MENTIONS)[::-1]
+    mentions.update(zip(MENTIONS, nombres.tolist()))
     return mentions
 
 def taux_reussite(etudiants, seuil=10):
@@ -163,23 +331,33 @@ def taux_reussite(etudiants, seuil=10):
     Returns:
         Tuple (nombre_reussis, nombre_total, taux_pourcentage)
     """
-    if not etudiants:
+    if not len(etudiants):
         return (0, 0, 0)
     
-    reussis = sum(1 for e in etudiants if e.moyenne_generale() >= seuil)
+    if isinstance(etudiants, TableauEtudiants):
+        reussis = int((etudiants.moyennes_generales() >= seuil).sum())
+    else:
+        reussis = sum(1 for e in etudiants if e.moyenne_generale() >= seuil)
     total = len(etudiants)
     taux = (reussis / total) * 100 if total > 0 else 0
     
     return (reussis, total, taux)
 
-def meilleurs_etudiants(etudiants, n=10):
-    """Retourne les n meilleurs étudiants
+def meilleurs_etudiants(etudiants, n=10, rangs="ordinal", ponderee=False):
+    """Retourne les n meilleurs étudiants, sans trier toute la cohorte
+    
+    Args:
+        rangs, ponderee: Voir classement_etudiants
     
     Returns:
-        Liste des n meilleurs étudiants triés par moyenne
+        Liste des n meilleurs étudiants triés par moyenne (les n premiers
+        de classement_etudiants)
     """
-    classement = classement_etudiants(etudiants)
-    return classement[:n]
+    _verifier_rangs(rangs)
+    if isinstance(etudiants, TableauEtudiants):
+        return _classement_tableau(etudiants, n, rangs=rangs, ponderee=ponderee)
+    
+    return _classement_helper(etudiants, max(n, 0), rangs=rangs, ponderee=ponderee)
 
 def etudiants_en_difficulte(etudiants, seuil=10):
     """Retourne les étudiants ayant une moyenne < seuil
@@ -187,6 +365,21 @@ def etudiants_en_difficulte(etudiants, seuil=10):
     Returns:
         Liste des étudiants en difficulté
     """
+    if isinstance(etudiants, TableauEtudiants):
+        moyennes = etudiants.moyennes_generales()
+        return [
+            {
+                "id": id_,
+                "nom": nom,
+                "prenom": prenom,
+                "promotion": etudiants.promotions[code],
+                "moyenne": moyenne
+            }
+            for id_, nom, prenom, code, moyenne in zip(
+                *_colonnes(etudiants, np.flatnonzero(moyennes < seuil)), moyennes[moyennes < seuil].tolist()
+            )
+        ]
+    
     return [
         {
             "id": e.id,
@@ -204,7 +397,10 @@ def analyse_matiere(etudiants, matiere):
     Returns:
         Dictionnaire avec statistiques et liste des étudiants
     """
-    notes_collectees = []
+    if isinstance(etudiants, TableauEtudiants):
+        return _analyse_matiere_tableau(etudiants, matiere)
+    
+    notes_collectees = array('d')
     etudiants_matiere = []
     
     for e in etudiants:
@@ -217,7 +413,7 @@ def analyse_matiere(etudiants, matiere):
                 "prenom": e.prenom,
                 "moyenne_matiere": moy_mat,
                 "nombre_notes": len(e.notes[matiere]),
-                "notes": e.notes[matiere]
+                "notes": e.notes[matiere].tolist()
             })
     
     if not notes_collectees:
@@ -231,11 +427,234 @@ def analyse_matiere(etudiants, matiere):
         "nombre_etudiants": len(etudiants_matiere),
         "nombre_notes_total": len(notes_collectees),
         "statistiques": {
-            "moyenne": moyenne(notes_collectees),
-            "mediane": median(notes_collectees),
-            "max": max(notes_collectees),
-            "min": min(notes_collectees),
-            "ecart_type": stdev(notes_collectees) if len(notes_collectees) > 1 else 0
+            cle: valeur for cle, valeur in resume_notes(notes_collectees).items() if cle != "nombre_notes"
         },
         "etudiants": etudiants_matiere
     }
+
+def moyennes_par_promotion(etudiants):
+    """Moyenne des moyennes générales de chaque promotion
+    
+    Returns:
+        Dictionnaire {promotion: moyenne}
+    """
+    if isinstance(etudiants, TableauEtudiants):
+        codes = etudiants.promotion_codes
+        nombres = np.bincount(codes, minlength=len(etudiants.promotions))
+        sommes = np.bincount(codes, weights=etudiants.moyennes_generales(), minlength=len(etudiants.promotions))
+        return {
+            promotion: sommes[code] / nombres[code]
+            for code, promotion in enumerate(etudiants.promotions) if nombres[code]
+        }
+    
+    promos = {}
+    for e in etudiants:
+        promos.setdefault(e.promotion, []).append(e.moyenne_generale())
+    return {promotion: moyenne(moyennes) for promotion, moyennes in promos.items()}
+
+def histogrammes_notes(etudiants, par_promotion=False, divisions=4):
+    """Histogramme des notes de chaque matière (voir services.histogramme)
+    
+    Les histogrammes s'additionnent: sum(h.values(), Histogramme()) donne
+    celui de toutes les matières.
+    
+    Returns:
+        Dictionnaire {matiere: Histogramme}, ou {promotion: {matiere:
+        Histogramme}} avec par_promotion
+    """
+    if isinstance(etudiants, TableauEtudiants):
+        matieres = etudiants.matieres
+        if not par_promotion:
+            histogrammes = Histogramme.par_groupes(etudiants.notes, etudiants.matiere_codes, len(matieres), divisions)
+            return {matiere: h for matiere, h in zip(matieres, histogrammes) if len(h)}
+        
+        # Un seul comptage, groupé par (promotion, matière)
+        codes = etudiants.promotion_codes[etudiants.etudiant_index].astype(np.int64) * len(matieres)
+        histogrammes = Histogramme.par_groupes(
+            etudiants.notes, codes + etudiants.matiere_codes, len(etudiants.promotions) * len(matieres), divisions
+        )
+        groupes = {}
+        for code, h in enumerate(histogrammes):
+            if len(h):
+                promotion, matiere = divmod(code, len(matieres))
+                groupes.setdefault(etudiants.promotions[promotion], {})[matieres[matiere]] = h
+        return groupes
+    
+    groupes = {}
+    for e in etudiants:
+        matieres = groupes.setdefault(e.promotion, {}) if par_promotion else groupes
+        for matiere, notes in e.notes.items():
+            if notes:
+                matieres.setdefault(matiere, Histogramme(divisions)).ajouter(notes)
+    return groupes
+
+def quantiles_notes(etudiants, quantiles=(0.25, 0.5, 0.75), matiere=None):
+    """Quantiles des notes (d'une matière ou de toutes), lus dans leur
+    histogramme: O(cases) une fois les notes comptées
+    
+    Exacts pour des notes au quart de point; sinon calculés sur les notes
+    elles-mêmes (np.quantile).
+    
+    Returns:
+        Dictionnaire {q: quantile}, vide s'il n'y a aucune note
+    """
+    histogrammes = histogrammes_notes(etudiants)
+    if matiere is not None:
+        histogrammes = {matiere: histogrammes[matiere]} if matiere in histogrammes else {}
+    histogramme = sum(histogrammes.values(), Histogramme())
+    if not len(histogramme):
+        return {}
+    if histogramme.exact:
+        return {q: histogramme.quantile(q) for q in quantiles}
+    
+    if isinstance(etudiants, TableauEtudiants):
+        notes = etudiants.notes
+        if matiere is not None:
+            notes = notes[etudiants.matiere_codes == etudiants.matieres.index(matiere)]
+    else:
+        notes = array('d')
+        for e in etudiants:
+            for nom, valeurs in e.notes.items():
+                if matiere is None or nom == matiere:
+                    notes.extend(valeurs)
+    return dict(zip(quantiles, np.quantile(np.asarray(notes, dtype=np.float64), quantiles).tolist()))
+
+def liste_moyennes(etudiants):
+    """Moyenne générale de chaque étudiant, dans l'ordre (liste ou tableau NumPy)"""
+    if isinstance(etudiants, TableauEtudiants):
+        return etudiants.moyennes_generales()
+    return [e.moyenne_generale() for e in etudiants]
+
+# Versions vectorisées, sur un TableauEtudiants
+
+def _colonnes(tableau, index):
+    """(ids, noms, prénoms, codes de promotion) des étudiants d'index donnés, en listes"""
+    return (
+        tableau.ids[index].tolist(), tableau.noms[index].tolist(),
+        tableau.prenoms[index].tolist(), tableau.promotion_codes[index].tolist()
+    )
+
+def _resume(stats, code):
+    """Statistiques d'un groupe, au format des fonctions ci-dessus"""
+    nombre = int(stats["nombre"][code])
+    return {
+        "nombre_notes": nombre,
+        "moyenne": float(stats["moyenne"][code]),
+        "mediane": float(stats["mediane"][code]),
+        "max": float(stats["max"][code]),
+        "min": float(stats["min"][code]),
+        "ecart_type": float(stats["ecart_type"][code]) if nombre > 1 else 0
+    }
+
+def _notes_decroissantes(histogramme):
+    """Notes d'un histogramme exact, de la plus haute à la plus basse"""
+    return np.repeat(histogramme.valeurs_cases(), histogramme.comptes)[::-1].tolist()
+
+def _stats_matieres_tableau(tableau, avec_notes):
+    histogrammes = Histogramme.par_groupes(tableau.notes, tableau.matiere_codes, len(tableau.matieres))
+    if all(histogramme.exact for histogramme in histogrammes):
+        resultats = {}
+        for matiere, histogramme in zip(tableau.matieres, histogrammes):
+            if len(histogramme):
+                resultats[matiere] = resume_histogramme(histogramme)
+                if avec_notes:
+                    resultats[matiere]["notes"] = _notes_decroissantes(histogramme)
+        return resultats
+    
+    # Notes hors de la grille: tri groupé
+    stats, triees, debuts = statistiques_groupes(tableau.notes, tableau.matiere_codes, len(tableau.matieres))
+    resultats = {}
+    for code, matiere in enumerate(tableau.matieres):
+        if stats["nombre"][code]:
+            resultats[matiere] = _resume(stats, code)
+            if avec_notes:
+                resultats[matiere]["notes"] = triees[debuts[code]:debuts[code + 1]][::-1].tolist()
+    return resultats
+
+def _stats_promotion_tableau(tableau, promotion):
+    if promotion not in tableau.promotions:
+        return {}
+    tableau = tableau.filtrer(tableau.promotion_codes == tableau.promotions.index(promotion))
+    if not len(tableau):
+        return {}
+    
+    moyennes = tableau.moyennes_generales()
+    stats, _, _ = statistiques_groupes(moyennes, np.zeros(len(moyennes), dtype=np.int64), 1)
+    resume = _resume(stats, 0)
+    return {
+        "promotion": promotion,
+        "nombre_etudiants": len(tableau),
+        "matieres": _stats_matieres_tableau(tableau, avec_notes=False),
+        "global": {
+            "moyenne_generale": resume["moyenne"],
+            "mediane": resume["mediane"],
+            "meilleure_moyenne": resume["max"],
+            "moins_bonne_moyenne": resume["min"],
+            "ecart_type": resume["ecart_type"]
+        }
+    }
+
+def _classement_tableau(tableau, n=None, rangs="ordinal", ponderee=False):
+    ordre = tableau.ordre_classement(n, ponderee=ponderee)
+    moyennes = (tableau.moyennes_ponderees() if ponderee else tableau.moyennes_generales())[ordre]
+    mentions = np.array(MENTIONS, dtype=object)[
+        len(SEUILS_MENTIONS) - np.searchsorted(SEUILS_MENTIONS, moyennes, side="right")
+    ].tolist()
+    nombres = tableau.nombre_matieres()[ordre].tolist()
+    moyennes = moyennes.tolist()
+    return [
+        {
+            "rang": rang,
+            "id": id_,
+            "nom": nom,
+            "prenom": prenom,
+            "promotion": tableau.promotions[code],
+            "moyenne": moyenne,
+            "mention": mention,
+            "nombre_matieres": nombre
+        }
+        for rang, id_, nom, prenom, code, moyenne, mention, nombre in zip(
+            _rangs(moyennes, rangs), *_colonnes(tableau, ordre), moyennes, mentions, nombres
+        )
+    ]
+
+def _analyse_matiere_tableau(tableau, matiere):
+    if matiere not in tableau.matieres:
+        return None
+    code = tableau.matieres.index(matiere)
+    masque = tableau.matiere_codes == code
+    if not masque.any():
+        return None
+    
+    notes = tableau.notes[masque]
+    stats, _, _ = statistiques_groupes(notes, np.zeros(len(notes), dtype=np.int64), 1)
+    
+    # Notes de la matière groupées par étudiant (dans l'ordre du tableau)
+    nombres = tableau.nombres_notes()[:, code]
+    presents = np.flatnonzero(nombres)
+    debuts = np.concatenate(([0], np.cumsum(nombres[presents])))
+    moyennes = tableau.moyennes_matieres()[presents, code]
+    rang = np.argsort(-moyennes, kind="stable")
+    
+    etudiants_matiere = [
+        {
+            "id": id_,
+            "nom": nom,
+            "prenom": prenom,
+            "moyenne_matiere": moyenne,
+            "nombre_notes": int(nombres[i]),
+            "notes": notes[debuts[j]:debuts[j + 1]].tolist()
+        }
+        for i, j, id_, nom, prenom, _, moyenne in zip(
+            presents[rang].tolist(), rang.tolist(), *_colonnes(tableau, presents[rang]),
+            moyennes[rang].tolist()
+        )
+    ]
+    
+    return {
+        "matiere": matiere,
+        "nombre_etudiants": len(etudiants_matiere),
+        "nombre_notes_total": len(notes),
+        "statistiques": {cle: valeur for cle, valeur in _resume(stats, 0).items() if cle != "nombre_notes"},
+        "etudiants": etudiants_matiere
+    }
@@ -0,0 +1,213 @@
+"""Statistiques calculées directement en SQL
+
+Mêmes fonctions et mêmes dictionnaires que services.statistiques, mais à
+partir d'une instance de Database au lieu d'une liste d'étudiants: les
+agrégats (GROUP BY, médianes lues dans l'index) sont calculés par SQLite et aucun
+objet Etudiant n'est construit.
+
+Toutes les fonctions acceptent aussi `debut` et `fin` pour ne compter que
+les notes ajoutées dans cet intervalle (debut inclus, fin exclue; date,
+datetime ou texte ISO).
+
+Exemple:
+    from services import statistiques_sql
+    
+    mentions = statistiques_sql.repartition_mentions(db)
+    l1 = statistiques_sql.stats_par_matiere(db, promotion="L1")
+    s1 = statistiques_sql.stats_par_matiere(db, debut="2024-09-01", fin="2025-02-01")
+"""
+
+from models.categories import PROMOTIONS
+from models.etudiant import mention_pour
+from services.database import texte_date
+from services.statistiques import ecart_type_moments
+
+
+def _notes_valides(promotion, debut=None, fin=None):
+    """CTE des notes des étudiants existants (éventuellement d'une promotion
+    et d'une période)"""
+    conditions = []
+    if promotion:
+        conditions.append("e.promotion = :promotion")
+    if debut is not None:
+        conditions.append("n.date_ajout >= :debut")
+    if fin is not None:
+        conditions.append("n.date_ajout < :fin")
+    filtre = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f'''
+        notes_valides AS (
+            SELECT n.etudiant_id, n.matiere, n.note, n.date_ajout, n.id
+            FROM notes n JOIN etudiants e ON e.id = n.etudiant_id
+            {filtre}
+        )
+    '''
+
+
+def _params(promotion, debut=None, fin=None, **autres):
+    return {
+        "promotion": PROMOTIONS.normaliser(promotion) if promotion else None,
+        "debut": texte_date(debut) if debut is not None else None,
+        "fin": texte_date(fin) if fin is not None else None,
+        **autres
+    }
+
+
+def _statistiques_matieres(cursor, promotion, matiere=None, debut=None, fin=None):
+    """Nombre, moyenne, médiane, max, min et écart-type par matière
+    
+    Returns:
+        Dictionnaire {matiere: {...}} au format de services.statistiques
+    """
+    filtre = "WHERE matiere = :matiere" if matiere else ""
+    
+    cursor.execute(f'''
+        WITH {_notes_valides(promotion, debut, fin)}
+        SELECT matiere, COUNT(*), SUM(note), SUM(note * note), MAX(note), MIN(note)
+        FROM notes_valides {filtre}
+        GROUP BY matiere
+    ''', _params(promotion, debut, fin, matiere=matiere))
+    groupes = cursor.fetchall()
+    
+    resultats = {}
+    for nom, nombre, somme, somme_carres, note_max, note_min in groupes:
+        # Médiane: une ou deux notes lues au milieu de l'index (matiere, note)
+        cursor.execute(f'''
+            WITH {_notes_valides(promotion, debut, fin)}
+            SELECT note FROM notes_valides WHERE matiere = :matiere
+            ORDER BY note LIMIT :limite OFFSET :decalage
+        ''', _params(
+            promotion, debut, fin,
+            matiere=nom, limite=2 - nombre % 2, decalage=(nombre - 1) // 2
+        ))
+        milieu = [note for (note,) in cursor.fetchall()]
+        
+        resultats[nom] = {
+            "nombre_notes": nombre,
+            "moyenne": somme / nombre,
+            "mediane": milieu[0] if nombre % 2 else (milieu[0] + milieu[1]) / 2,
+            "max": note_max,
+            "min": note_min,
+            "ecart_type": ecart_type_moments(nombre, somme, somme_carres)
+        }
+    
+    return resultats
+
+
+def _curseur(db):
+    cursor = db.conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+
+def stats_par_matiere(db, promotion=None, debut=None, fin=None):
+    """Calcule les statistiques par matière pour tous les étudiants
+    
+    Returns:
+        Dictionnaire imbriqué avec statistiques détaillées par matière
+    """
+    with db.lecture():
+        cursor = _curseur(db)
+        resultats = _statistiques_matieres(cursor, promotion, debut=debut, fin=fin)
+        
+        # Liste triée des notes, comme la version Python
+        for stats in resultats.values():
+            stats["notes"] = []
+        cursor.execute(f'''
+            WITH {_notes_valides(promotion, debut, fin)}
+            SELECT matiere, note FROM notes_valides ORDER BY matiere DESC, note DESC
+        ''', _params(promotion, debut, fin))
+        for matiere, note in cursor:
+            resultats[matiere]["notes"].append(note)
+    
+    return resultats
+
+
+def repartition_mentions(db, promotion=None, debut=None, fin=None):
+    """Calcule la répartition des mentions
+    
+    Returns:
+        Dictionnaire avec le nombre d'étudiants par mention
+    """
+    mentions = {
+        "Très Bien": 0,
+        "Bien": 0,
+        "Assez Bien": 0,
+        "Passable": 0,
+        "Insuffisant": 0
+    }
+    
+    for moyenne in db.obtenir_moyennes(promotion, debut, fin).values():
+        mentions[mention_pour(moyenne)] += 1
+    
+    return mentions
+
+
+def taux_reussite(db, seuil=10, promotion=None, debut=None, fin=None):
+    """Calcule le taux de réussite (moyenne >= seuil)
+    
+    Returns:
+        Tuple (nombre_reussis, nombre_total, taux_pourcentage)
+    """
+    return db.obtenir_taux_reussite(seuil, promotion, debut, fin)
+
+
+def analyse_matiere(db, matiere, promotion=None, debut=None, fin=None):
+    """Analyse détaillée d'une matière spécifique
+    
+    Returns:
+        Dictionnaire avec statistiques et liste des étudiants
+    """
+    with db.lecture():
+        cursor = _curseur(db)
+        stats = _statistiques_matieres(cursor, promotion, matiere, debut, fin).get(matiere)
+        
+        if stats is None:
+            return None
+        
+        # Moyennes par étudiant depuis notes_agg (ou, sur une période, depuis
+        # les notes de la période), triées en SQL
+        agregats = "notes_agg" if debut is None and fin is None else '''(
+            SELECT etudiant_id, matiere, COUNT(*) AS nombre, SUM(note) AS somme
+            FROM notes_valides GROUP BY etudiant_id, matiere
+        )'''
+        filtre = "AND e.promotion = :promotion" if promotion else ""
+        cursor.execute(f'''
+            WITH {_notes_valides(promotion, debut, fin)}
+            SELECT e.id, e.nom, e.prenom, a.somme / a.nombre, a.nombre
+            FROM {agregats} a JOIN etudiants e ON e.id = a.etudiant_id
+            WHERE a.matiere = :matiere {filtre}
+            ORDER BY a.somme / a.nombre DESC, e.nom, e.prenom, e.id
+        ''', _params(promotion, debut, fin, matiere=matiere))
+        
+        etudiants_matiere = []
+        par_id = {}
+        for id_, nom, prenom, moy_mat, nombre in cursor.fetchall():
+            ligne = {
+                "id": id_,
+                "nom": nom,
+                "prenom": prenom,
+                "moyenne_matiere": moy_mat,
+                "nombre_notes": nombre,
+                "notes": []
+            }
+            etudiants_matiere.append(ligne)
+            par_id[id_] = ligne
+        
+        cursor.execute(f'''
+            WITH {_notes_valides(promotion, debut, fin)}
+            SELECT etudiant_id, note FROM notes_valides
+            WHERE matiere = :matiere
+            ORDER BY etudiant_id, date_ajout, id
+        ''', _params(promotion, debut, fin, matiere=matiere))
+        for etudiant_id, note in cursor:
+            par_id[etudiant_id]["notes"].append(note)
+    
+    del stats["nombre_notes"]
+    
+    return {
+        "matiere": matiere,
+        "nombre_etudiants": len(etudiants_matiere),
+        "nombre_notes_total": sum(ligne["nombre_notes"] for ligne in etudiants_matiere),
+        "statistiques": stats,
+        "etudiants": etudiants_matiere
+    }
@@ -0,0 +1,336 @@
+"""Tableau en colonnes des étudiants et de leurs notes (NumPy)
+
+Pour les analyses sur toute une cohorte: au lieu d'une liste d'objets
+Etudiant, un TableauEtudiants garde chaque information dans un tableau
+NumPy (id, codes de promotion, notes à plat en float64 avec le décalage
+de chaque étudiant, codes de matière, coefficients effectifs). Moyennes,
+écarts-types, mentions et rangs sont calculés pour tous les étudiants à la
+fois, sans boucle Python.
+
+Les fonctions de services.statistiques et services.graphiques qui prennent
+une liste d'étudiants acceptent aussi un TableauEtudiants.
+
+Exemple:
+    from models.categories import PROMOTIONS
+    from services import statistiques
+    from services.tableau_etudiants import TableauEtudiants
+    
+    tableau = TableauEtudiants.depuis_base(db)
+    classement = statistiques.classement_etudiants(tableau)
+    l1 = tableau.filtrer(tableau.promotion_codes == PROMOTIONS.code("L1"))
+"""
+
+from itertools import chain
+
+import numpy as np
+
+from models.categories import MATIERES, PROMOTIONS
+from services.database import texte_date
+
+# Dans l'ordre de services.statistiques.repartition_mentions
+MENTIONS = ("Très Bien", "Bien", "Assez Bien", "Passable", "Insuffisant")
+# Moyenne minimale de chaque mention, de Passable à Très Bien
+SEUILS_MENTIONS = np.array([10, 12, 14, 16])
+
+
+class TableauEtudiants:
+    """Étudiants et notes d'une cohorte, en colonnes
+    
+    Attributs (à lire, pas à modifier):
+        ids, noms, prenoms: une case par étudiant (noms et prénoms en object)
+        promotion_codes: code de la promotion de chaque étudiant
+        promotions, matieres: libellés indexés par code (registres de
+            models.categories: les codes sont les mêmes d'un tableau à l'autre)
+        notes: toutes les notes (float64, comme les objets Etudiant), groupées par étudiant
+        matiere_codes: index de la matière de chaque note dans matieres
+        debuts: les notes de l'étudiant i sont notes[debuts[i]:debuts[i + 1]]
+        coefficients: matrice (étudiants x matières) des coefficients effectifs
+    """
+    
+    def __init__(self, ids, noms, prenoms, promotion_codes, promotions,
+                 notes, matiere_codes, debuts, matieres, coefficients=None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.noms = np.asarray(noms, dtype=object)
+        self.prenoms = np.asarray(prenoms, dtype=object)
+        self.promotion_codes = np.asarray(promotion_codes, dtype=np.int16)
+        self.promotions = tuple(promotions)
+        self.notes = np.asarray(notes, dtype=np.float64)
+        self.matiere_codes = np.asarray(matiere_codes, dtype=np.int16)
+        self.debuts = np.asarray(debuts, dtype=np.int64)
+        self.matieres = tuple(matieres)
+        if coefficients is None:
+            coefficients = np.ones((len(self.ids), len(self.matieres)), dtype=np.float64)
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+        
+        # Calculs gardés en cache (le tableau ne change pas)
+        self._sommes = None
+        self._moyennes = None
+    
+    @classmethod
+    def depuis_base(cls, db, promotion=None, debut=None, fin=None):
+        """Construit le tableau directement depuis la base, sans objet Etudiant
+        
+        Args:
+            db: Instance de Database
+            promotion: Ne garder que cette promotion
+            debut, fin: Ne garder que les notes de cette période (debut
+                inclus, fin exclue)
+        """
+        filtre_etudiants = "WHERE promotion = :promotion" if promotion else ""
+        # Sans promotion, pas de jointure: les notes orphelines sont écartées ensuite
+        conditions = ["TRUE"]
+        if promotion:
+            conditions.append("n.etudiant_id IN (SELECT id FROM etudiants WHERE promotion = :promotion)")
+        if debut is not None:
+            conditions.append("n.date_ajout >= :debut")
+        if fin is not None:
+            conditions.append("n.date_ajout < :fin")
+        params = {
+            "promotion": PROMOTIONS.normaliser(promotion) if promotion else None,
+            "debut": texte_date(debut) if debut is not None else None,
+            "fin": texte_date(fin) if fin is not None else None,
+        }
+        
+        with db.lecture():
+            cursor = db.conn.cursor()
+            cursor.row_factory = None
+            
+            # Étudiants, dans l'ordre de obtenir_tous_etudiants
+            cursor.execute(f'''
+                SELECT id, nom, prenom, promotion FROM etudiants {filtre_etudiants}
+                ORDER BY nom, prenom
+            ''', params)
+            lignes = cursor.fetchall()
+            ids, noms, prenoms, promos = zip(*lignes) if lignes else ((), (), (), ())
+            
+            cursor.execute("SELECT DISTINCT matiere FROM notes")
+            codes_matieres = [MATIERES.code(m) for (m,) in cursor]
+            
+            # Notes sous forme numérique: (id étudiant, code matière, note),
+            # lues directement dans un tableau sans liste intermédiaire
+            codes = " ".join(f"WHEN :matiere{code} THEN {code}" for code in codes_matieres)
+            params.update((f"matiere{code}", MATIERES.nom(code)) for code in codes_matieres)
+            cursor.execute(f'''
+                SELECT n.etudiant_id, {f"CASE n.matiere {codes} END" if codes_matieres else 0}, n.note
+                FROM notes n WHERE {" AND ".join(conditions)}
+                ORDER BY n.etudiant_id, n.matiere, n.date_ajout, n.id
+            ''', params)
+            brut = np.fromiter(chain.from_iterable(cursor), dtype=np.float64).reshape(-1, 3)
+            
+            cursor.execute("SELECT promotion, matiere, coefficient FROM coefficients_promotion")
+            coefs_promotion = cursor.fetchall()
+            cursor.execute("SELECT etudiant_id, matiere, coefficient FROM coefficients")
+            coefs_etudiants = cursor.fetchall()
+        
+        ids = np.array(ids, dtype=np.int64)
+        promotion_codes = np.array([PROMOTIONS.code(p) for p in promos], dtype=np.int16)
+        coefs_promotion = [(PROMOTIONS.code(p), MATIERES.code(m), c) for p, m, c in coefs_promotion]
+        coefs_etudiants = [(e, MATIERES.code(m), c) for e, m, c in coefs_etudiants]
+        matieres, promotions = MATIERES.noms(), PROMOTIONS.noms()
+        
+        # Position de chaque note: ses étudiants sont triés par nom, pas par id
+        if not len(ids):
+            brut = brut[:0]
+        tri_ids = np.argsort(ids)
+        etudiant_ids = brut[:, 0].astype(np.int64)
+        positions = tri_ids[np.minimum(np.searchsorted(ids, etudiant_ids, sorter=tri_ids), len(ids) - 1)]
+        connus = ids[positions] == etudiant_ids
+        if not connus.all():
+            brut, positions = brut[connus], positions[connus]
+        ordre = np.argsort(positions, kind="stable")
+        debuts = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(positions, minlength=len(ids)), out=debuts[1:])
+        
+        # Coefficients effectifs: 1, puis ceux de la promotion, puis ceux de l'étudiant
+        coefficients = np.ones((len(ids), len(matieres)), dtype=np.float64)
+        for promo, matiere, coef in coefs_promotion:
+            coefficients[promotion_codes == promo, matiere] = coef
+        index_ids = dict(zip(ids.tolist(), range(len(ids))))
+        for etudiant_id, matiere, coef in coefs_etudiants:
+            if etudiant_id in index_ids:
+                coefficients[index_ids[etudiant_id], matiere] = coef
+        
+        return cls(
+            ids, noms, prenoms, promotion_codes, promotions,
+            brut[ordre, 2], brut[ordre, 1], debuts, matieres, coefficients
+        )
+    
+    @classmethod
+    def depuis_etudiants(cls, etudiants):
+        """Construit le tableau à partir d'objets Etudiant (dans leur ordre)"""
+        promotion_codes = [PROMOTIONS.code(e.promotion) for e in etudiants]
+        for e in etudiants:
+            MATIERES.charger(e.notes)
+        matieres, promotions = MATIERES.noms(), PROMOTIONS.noms()
+        
+        blocs, codes, tailles = [], [], []
+        coefficients = np.ones((len(etudiants), len(matieres)), dtype=np.float64)
+        for i, e in enumerate(etudiants):
+            taille = 0
+            for matiere in sorted(e.notes):
+                notes = e.notes[matiere]
+                code = MATIERES.code(matiere)
+                blocs.append(np.frombuffer(notes, dtype=np.float64) if len(notes) else ())
+                codes.append(np.full(len(notes), code, dtype=np.int16))
+                coefficients[i, code] = e.coefficient(matiere)
+                taille += len(notes)
+            tailles.append(taille)
+        
+        debuts = np.zeros(len(etudiants) + 1, dtype=np.int64)
+        np.cumsum(tailles, out=debuts[1:])
+        return cls(
+            [e.id for e in etudiants], [e.nom for e in etudiants], [e.prenom for e in etudiants],
+            promotion_codes, promotions,
+            np.concatenate(blocs) if blocs else [],
+            np.concatenate(codes) if codes else [],
+            debuts, matieres, coefficients
+        )
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    @property
+    def etudiant_index(self):
+        """Index de l'étudiant de chaque note"""
+        return np.repeat(np.arange(len(self.ids)), np.diff(self.debuts))
+    
+    def filtrer(self, masque):
+        """Nouveau tableau limité aux étudiants sélectionnés (masque booléen)"""
+        masque = np.asarray(masque, dtype=bool)
+        masque_notes = masque[self.etudiant_index]
+        debuts = np.zeros(masque.sum() + 1, dtype=np.int64)
+        np.cumsum(np.diff(self.debuts)[masque], out=debuts[1:])
+        return TableauEtudiants(
+            self.ids[masque], self.noms[masque], self.prenoms[masque],
+            self.promotion_codes[masque], self.promotions,
+            self.notes[masque_notes], self.matiere_codes[masque_notes], debuts,
+            self.matieres, self.coefficients[masque]
+        )
+    
+    def _sommes_matieres(self):
+        """(sommes, nombres) des notes par étudiant et matière, en matrices"""
+        if self._sommes is None:
+            forme = (len(self.ids), len(self.matieres))
+            cles = self.etudiant_index * forme[1] + self.matiere_codes
+            taille = forme[0] * forme[1]
+            sommes = np.bincount(cles, weights=self.notes, minlength=taille).reshape(forme)
+            nombres = np.bincount(cles, minlength=taille).reshape(forme)
+            self._sommes = (sommes, nombres)
+        return self._sommes
+    
+    def moyennes_matieres(self):
+        """Matrice (étudiants x matières) des moyennes, NaN sans note"""
+        sommes, nombres = self._sommes_matieres()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(nombres > 0, sommes / nombres, np.nan)
+    
+    def nombres_notes(self):
+        """Matrice (étudiants x matières) du nombre de notes"""
+        return self._sommes_matieres()[1]
+    
+    def nombre_matieres(self):
+        """Nombre de matières notées de chaque étudiant"""
+        return (self.nombres_notes() > 0).sum(axis=1)
+    
+    def _sommer_matieres(self, valeurs):
+        """Somme par étudiant de valeurs (étudiants x matières), NaN ignorés
+        
+        Les matières sont ajoutées une à une dans l'ordre alphabétique, comme
+        Etudiant (chargé depuis la base) le fait: les moyennes sont identiques
+        au bit près, et les égalités départagées de la même façon.
+        """
+        total = np.zeros(len(self.ids))
+        for code in sorted(range(len(self.matieres)), key=self.matieres.__getitem__):
+            colonne = valeurs[:, code]
+            total += np.where(np.isnan(colonne), 0, colonne)
+        return total
+    
+    def moyennes_generales(self):
+        """Moyenne des moyennes par matière de chaque étudiant (0 sans note),
+        comme Etudiant.moyenne_generale"""
+        if self._moyennes is None:
+            nombre = self.nombre_matieres()
+            total = self._sommer_matieres(self.moyennes_matieres())
+            self._moyennes = np.divide(total, nombre, out=np.zeros(len(self.ids)), where=nombre > 0)
+        return self._moyennes
+    
+    def moyennes_ponderees(self):
+        """Moyenne pondérée par les coefficients effectifs de chaque étudiant,
+        comme Etudiant.moyenne_generale_ponderee"""
+        moyennes = self.moyennes_matieres()
+        coefficients = np.where(np.isnan(moyennes), np.nan, self.coefficients)
+        total = self._sommer_matieres(moyennes * coefficients)
+        poids = self._sommer_matieres(coefficients)
+        return np.divide(total, poids, out=np.zeros(len(self.ids)), where=poids > 0)
+    
+    def mention_codes(self):
+        """Index dans MENTIONS de la mention de chaque étudiant"""
+        return len(SEUILS_MENTIONS) - np.searchsorted(
+            SEUILS_MENTIONS, self.moyennes_generales(), side="right"
+        )
+    
+    def mentions(self):
+        """Mention de chaque étudiant (libellés)"""
+        return np.array(MENTIONS, dtype=object)[self.mention_codes()]
+    
+    def ordre_classement(self, n=None, ponderee=False):
+        """Index des étudiants par moyenne générale décroissante (à égalité,
+        l'ordre du tableau est conservé, comme avec sorted)
+        
+        Args:
+            n: Ne renvoyer que les n premiers: seuls les étudiants au moins
+                aussi bons que le n-ième (trouvé par np.partition) sont triés
+            ponderee: Classer sur moyennes_ponderees()
+        """
+        moyennes = self.moyennes_ponderees() if ponderee else self.moyennes_generales()
+        if n is None or n >= len(moyennes):
+            return np.argsort(-moyennes, kind="stable")
+        if n <= 0:
+            return np.zeros(0, dtype=np.int64)
+        
+        seuil = np.partition(moyennes, len(moyennes) - n)[len(moyennes) - n]
+        candidats = np.flatnonzero(moyennes >= seuil)
+        return candidats[np.argsort(-moyennes[candidats], kind="stable")[:n]]
+    
+    def rangs(self):
+        """Rang de chaque étudiant dans le classement (1 pour le premier)"""
+        rangs = np.empty(len(self.ids), dtype=np.int64)
+        rangs[self.ordre_classement()] = np.arange(1, len(self.ids) + 1)
+        return rangs
+
+
+def statistiques_groupes(valeurs, codes, nombre_groupes):
+    """Nombre, moyenne, médiane, min, max et écart-type (d'échantillon) de
+    valeurs réparties en groupes, en une passe de tri
+    
+    Returns:
+        (dictionnaire de tableaux indexés par code de groupe, valeurs triées
+        par groupe puis valeur, début de chaque groupe dans ces valeurs)
+    """
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    codes = np.asarray(codes, dtype=np.int64)
+    triees = valeurs[np.lexsort((valeurs, codes))]
+    nombres = np.bincount(codes, minlength=nombre_groupes)
+    debuts = np.zeros(nombre_groupes + 1, dtype=np.int64)
+    np.cumsum(nombres, out=debuts[1:])
+    
+    presents = nombres > 0
+    moyennes = np.divide(
+        np.bincount(codes, weights=valeurs, minlength=nombre_groupes), nombres,
+        out=np.zeros(nombre_groupes), where=presents
+    )
+    ecarts = np.bincount(codes, weights=(valeurs - moyennes[codes]) ** 2, minlength=nombre_groupes)
+    variances = np.divide(ecarts, nombres - 1, out=np.zeros(nombre_groupes), where=nombres > 1)
+    
+    bas = np.where(presents, debuts[:-1] + (nombres - 1) // 2, 0)
+    haut = np.where(presents, debuts[:-1] + nombres // 2, 0)
+    vide = np.zeros(nombre_groupes)
+    stats = {
+        "nombre": nombres,
+        "moyenne": moyennes,
+        "mediane": np.where(presents, (triees[bas] + triees[haut]) / 2, 0) if len(triees) else vide,
+        "min": np.where(presents, triees[np.where(presents, debuts[:-1], 0)], 0) if len(triees) else vide,
+        "max": np.where(presents, triees[np.maximum(debuts[1:] - 1, 0)], 0) if len(triees) else vide,
+        "ecart_type": np.sqrt(variances),
+    }
+    return stats, triees, debuts